@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Make the packages importable when run as a script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from control.estimation.logistic_batched import LogisticBatched  # noqa: E402
+from control.estimation.logistic_newton import LogisticNewton  # noqa: E402
+from benchmark.data import simulate  # noqa: E402
+
+
+def main():
+    s_max_itr = 100
+    s_tolerance = 1e-8
+    for s_num_models, s_n, s_k in [(100, 200, 5), (1000, 200, 5),
+                                   (1000, 1000, 10)]:
+        data = [simulate(s_n, s_k, s_seed=s_seed)
+                for s_seed in range(s_num_models)]
+        m_y = np.stack([v_y for v_y, _ in data])
+        m_x = np.stack([m_x for _, m_x in data])
+        print(f"M={s_num_models}, n={s_n}, k={s_k}")
+        s_start = time.perf_counter()
+        for v_y, m_x_model in data:
+            LogisticNewton(v_y, m_x_model, s_max_itr, s_tolerance).estimate()
+        s_time = time.perf_counter() - s_start
+        print(f"  {'newton per model':<22} time={s_time:.3f}s")
+        s_start = time.perf_counter()
+        output = LogisticBatched(m_y, m_x, s_max_itr, s_tolerance).estimate()
+        s_time = time.perf_counter() - s_start
+        print(f"  {'newton batched':<22} time={s_time:.3f}s, "
+              f"converged={np.sum(output[6])}/{s_num_models}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import numpy as np
+
+
+def simulate(s_n, s_k, s_seed=0, s_density=1.0):
+    """
+    Simulate a design matrix with intercept column and binary dependent
+    variable from a logistic regression model.
+
+    Args:
+        s_n (int): Number of observations.
+        s_k (int): Number of independent variables.
+        s_seed (int, optional): Random seed. Defaults to 0.
+        s_density (float, optional): Fraction of non-zero values of the
+                                     independent variables. Below 1, the
+                                     design matrix is a scipy.sparse CSR
+                                     matrix. Defaults to 1.0.
+
+    Returns:
+        tuple: Dependent variable vector and design matrix.
+    """
+    rng = np.random.default_rng(s_seed)
+    if s_density < 1.0:
+        from scipy import sparse
+        m_features = sparse.random(s_n, s_k, density=s_density,
+                                   format="csr", random_state=rng,
+                                   data_rvs=rng.standard_normal)
+        m_x = sparse.hstack([np.ones((s_n, 1)), m_features], format="csr")
+    else:
+        m_x = np.empty((s_n, s_k + 1))
+        m_x[:, 0] = 1.0
+        m_x[:, 1:] = rng.standard_normal((s_n, s_k))
+    v_beta = rng.normal(0.0, 0.5, s_k + 1)
+    v_y = (rng.uniform(size=s_n) < 1 / (1 + np.exp(-m_x @ v_beta))) * 1.0
+    return v_y, m_x
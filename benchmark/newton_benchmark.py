@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Make the packages importable when run as a script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from control.estimation.logistic_mle import LogisticMLE  # noqa: E402
+from control.estimation.logistic_map import LogisticMAP  # noqa: E402
+from control.estimation.logistic_newton import LogisticNewton  # noqa: E402
+from benchmark.data import simulate  # noqa: E402
+
+
+def run(strategy):
+    s_start = time.perf_counter()
+    output = strategy.estimate()
+    s_time = time.perf_counter() - s_start
+    s_num_itr = output[3] + 1 if output else None
+    s_ll = output[2] if output else None
+    return s_num_itr, s_time, s_ll
+
+
+def main():
+    s_max_itr = 100000
+    s_tolerance = 1e-8
+    for s_n, s_k in [(1000, 5), (10000, 20), (100000, 50)]:
+        v_y, m_x = simulate(s_n, s_k)
+        v_mu = np.zeros(s_k + 1)
+        m_sigma = np.eye(s_k + 1) * 100
+        s_alpha = 1.0 / s_n
+        strategies = {
+            "gradient ascent MLE": LogisticMLE(
+                v_y, m_x, s_max_itr, s_tolerance, s_alpha),
+            "newton MLE": LogisticNewton(
+                v_y, m_x, s_max_itr, s_tolerance),
+            "gradient ascent MAP": LogisticMAP(
+                v_y, m_x, v_mu, m_sigma, s_max_itr, s_tolerance, s_alpha),
+            "newton MAP": LogisticNewton(
+                v_y, m_x, s_max_itr, s_tolerance, v_mu, m_sigma),
+        }
+        print(f"n={s_n}, k={s_k}")
+        for name, strategy in strategies.items():
+            s_num_itr, s_time, s_ll = run(strategy)
+            print(f"  {name:<22} iterations={s_num_itr}, "
+                  f"time={s_time:.3f}s, log-likelihood={s_ll}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+import numpy as np
+
+# Make the packages importable when run as a script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from control.estimation.logistic_map import LogisticMAP  # noqa: E402
+from benchmark.data import simulate  # noqa: E402
+
+
+def main():
+    s_max_itr = 100000
+    s_tolerance = 1e-6
+    v_scales = np.logspace(-2, 2, 20)
+    for s_n, s_k in [(10000, 20), (100000, 50)]:
+        v_y, m_x = simulate(s_n, s_k)
+        v_mu = np.zeros(s_k + 1)
+        m_sigma = np.eye(s_k + 1)
+        s_alpha = 1.0 / s_n
+        strategy = LogisticMAP(v_y, m_x, v_mu, m_sigma, s_max_itr,
+                               s_tolerance, s_alpha)
+        s_start = time.perf_counter()
+        path = strategy.estimate_path(v_scales)
+        s_path_time = time.perf_counter() - s_start
+
+        s_start = time.perf_counter()
+        s_independent_itr = 0
+        for s_scale in v_scales:
+            output = LogisticMAP(v_y, m_x, v_mu, s_scale * m_sigma,
+                                 s_max_itr, s_tolerance, s_alpha).estimate()
+            s_independent_itr += output[3] + 1
+        s_independent_time = time.perf_counter() - s_start
+        print(f"n={s_n}, k={s_k}, {len(v_scales)} prior scales")
+        print(f"  warm-started path   iterations={np.sum(path[2] + 1)}, "
+              f"time={s_path_time:.3f}s")
+        print(f"  independent fits    iterations={s_independent_itr}, "
+              f"time={s_independent_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
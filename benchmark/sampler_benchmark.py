@@ -0,0 +1,51 @@
+import os
+import sys
+import numpy as np
+
+# Make the packages importable when run as a script from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from control.instrumentation.iteration_recorder import \
+    IterationRecorder  # noqa: E402
+from control.mcmc.mala import MALA  # noqa: E402
+from control.mcmc.metropolis import Metropolis  # noqa: E402
+from benchmark.data import simulate  # noqa: E402
+
+
+def main():
+    s_num_itr = 6000
+    s_num_burn_in = 2000
+    s_num_chains = 4
+    for s_n, s_k in [(10000, 5), (10000, 20)]:
+        v_y, m_x = simulate(s_n, s_k)
+        v_zero = np.zeros(m_x.shape[1])
+        m_prior_sigma = 100 * np.eye(m_x.shape[1])
+        m_proposal_sigma = 1e-4 * np.eye(m_x.shape[1])
+        samplers = {
+            "random-walk Metropolis": lambda recorder: Metropolis(
+                v_y, m_x, v_zero, v_zero, m_prior_sigma, m_proposal_sigma,
+                s_num_itr, s_num_burn_in, n_chains=s_num_chains, seed=0,
+                recorder=recorder),
+            "adaptive Metropolis": lambda recorder: Metropolis(
+                v_y, m_x, v_zero, v_zero, m_prior_sigma, m_proposal_sigma,
+                s_num_itr, s_num_burn_in, n_chains=s_num_chains, seed=0,
+                b_adaptive=True, recorder=recorder),
+            "MALA": lambda recorder: MALA(
+                v_y, m_x, v_zero, v_zero, m_prior_sigma, 0.01, s_num_itr,
+                s_num_burn_in, n_chains=s_num_chains, seed=0,
+                recorder=recorder),
+        }
+        print(f"n={s_n}, k={s_k}, {s_num_chains} chains, "
+              f"{s_num_itr} iterations")
+        for name, sampler in samplers.items():
+            recorder = IterationRecorder()
+            sampler(recorder).optimize()
+            summary = recorder.summary()
+            print(f"  {name:24s}"
+                  f"acceptance={np.mean(summary['acceptance_rate']):.2f}, "
+                  f"min ESS={np.min(summary['effective_sample_size']):.0f}, "
+                  f"min ESS/s={np.min(summary['ess_per_second']):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Benchmark suite for the link function, likelihood kernels, estimators and
+samplers on synthetic data of several sizes and sparsity levels. Results are
+written as JSON, so that runs of different commits can be compared:
+
+    python -m benchmark.suite --output before.json
+    python -m benchmark.suite --output after.json
+    python -m benchmark.suite --compare before.json after.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+# Make the packages importable when run as a script from any directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scipy  # noqa: E402
+from control.estimation.logistic_map import LogisticMAP  # noqa: E402
+from control.estimation.logistic_mle import LogisticMLE  # noqa: E402
+from control.estimation.logistic_newton import LogisticNewton  # noqa: E402
+from control.estimation.logistic_sgd import LogisticSGD  # noqa: E402
+from control.instrumentation.iteration_recorder import \
+    IterationRecorder  # noqa: E402
+from control.likelihood.logistic_log_likelihood import \
+    LogisticLogLikelihood  # noqa: E402
+from control.likelihood.logistic_objective import \
+    LogisticObjective  # noqa: E402
+from control.link_function.sigmoid import Sigmoid  # noqa: E402
+from control.mcmc.mala import MALA  # noqa: E402
+from control.mcmc.metropolis import Metropolis  # noqa: E402
+from benchmark.data import simulate  # noqa: E402
+
+# Problem sizes (n, k, density of the independent variables)
+SIZES = [(1000, 5, 1.0), (10000, 20, 1.0), (100000, 50, 1.0),
+         (100000, 50, 0.05)]
+QUICK_SIZES = [(1000, 5, 1.0), (10000, 20, 1.0), (10000, 20, 0.05)]
+# Metrics compared by --compare, lower is better for all of them
+COMPARED_METRICS = ["time_per_call", "time_to_convergence",
+                    "time_per_iteration", "time_per_step",
+                    "peak_memory_bytes"]
+
+
+def measure(function, s_repeat):
+    """
+    Time function over s_repeat calls and measure its peak memory in one
+    more call under tracemalloc, which is not timed since tracing slows
+    allocations down.
+
+    Args:
+        function (callable): Function without arguments.
+        s_repeat (int): Number of timed calls.
+
+    Returns:
+        list: Fastest time in seconds, peak traced memory in bytes and the
+              result of the last timed call.
+    """
+    s_best = np.inf
+    for _ in range(s_repeat):
+        s_start = time.perf_counter()
+        result = function()
+        s_best = min(s_best, time.perf_counter() - s_start)
+    tracemalloc.start()
+    try:
+        function()
+        s_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return [s_best, s_peak, result]
+
+
+def benchmark_kernels(v_y, m_x, s_repeat):
+    """
+    Time one evaluation of the sigmoid function and of the log-likelihood
+    kernels at a random coefficient vector.
+
+    Returns:
+        list: Result dictionary of every kernel.
+    """
+    s_k = m_x.shape[1]
+    v_beta = np.random.default_rng(1).normal(0.0, 0.1, s_k)
+    m_beta = np.random.default_rng(2).normal(0.0, 0.1, (8, s_k))
+    objective = LogisticObjective(v_y, m_x)
+    kernels = {
+        "Sigmoid": lambda: Sigmoid(
+            m_x, v_beta).calculate_predicted_propability(),
+        "LogisticLogLikelihood": lambda: LogisticLogLikelihood(
+            v_y, m_x, v_beta).calculate_log_likelihood(),
+        "LogisticObjective.evaluate": lambda: objective.evaluate(v_beta),
+        "LogisticObjective.evaluate_batch(8)": lambda:
+            objective.evaluate_batch(m_beta),
+    }
+    results = []
+    for name, kernel in kernels.items():
+        s_time, s_peak, _ = measure(kernel, max(s_repeat, 5))
+        results.append({"group": "kernel", "name": name,
+                        "time_per_call": s_time,
+                        "peak_memory_bytes": s_peak})
+    return results
+
+
+def benchmark_estimators(v_y, m_x, s_repeat, s_max_itr):
+    """
+    Time every estimation strategy from zero coefficients to convergence.
+
+    Returns:
+        list: Result dictionary of every strategy.
+    """
+    s_n, s_k = m_x.shape
+    v_mu = np.zeros(s_k)
+    m_sigma = 100 * np.eye(s_k)
+    s_alpha = 1.0 / s_n
+    s_tolerance = 1e-6
+    strategies = {
+        "LogisticMLE": lambda: LogisticMLE(
+            v_y, m_x, s_max_itr, s_tolerance, s_alpha),
+        "LogisticMAP": lambda: LogisticMAP(
+            v_y, m_x, v_mu, m_sigma, s_max_itr, s_tolerance, s_alpha),
+        "LogisticNewton": lambda: LogisticNewton(
+            v_y, m_x, s_max_itr, s_tolerance),
+        "LogisticNewton MAP": lambda: LogisticNewton(
+            v_y, m_x, s_max_itr, s_tolerance, v_mu, m_sigma),
+        "LogisticSGD": lambda: LogisticSGD(
+            v_y, m_x, 100, 1e-5, 0.01, seed=0),
+    }
+    results = []
+    for name, strategy in strategies.items():
+        s_time, s_peak, output = measure(
+            lambda: strategy().estimate(), s_repeat)
+        b_converged = len(output) > 0
+        s_num_itr = output[3] + 1 if b_converged else None
+        results.append({
+            "group": "estimator", "name": name,
+            "converged": b_converged,
+            "num_itr": s_num_itr,
+            "time_to_convergence": s_time if b_converged else None,
+            "time_per_iteration": s_time / s_num_itr if b_converged
+            else None,
+            "log_likelihood": float(output[2]) if b_converged else None,
+            "peak_memory_bytes": s_peak})
+    return results
+
+
+def benchmark_samplers(v_y, m_x, s_num_itr, s_num_burn_in):
+    """
+    Run every sampler from zero coefficients with 4 chains and measure the
+    effective samples per second of the samples after burn-in. The
+    random-walk proposal covariance is 2.38^2 / (k n) I, which matches the
+    scale of the posterior of standardized variables.
+
+    Returns:
+        list: Result dictionary of every sampler.
+    """
+    s_n, s_k = m_x.shape
+    v_zero = np.zeros(s_k)
+    m_prior_sigma = 100 * np.eye(s_k)
+    m_proposal_sigma = 2.38 ** 2 / (s_k * s_n) * np.eye(s_k)
+    s_step_size = 1.0 / np.sqrt(s_n)
+    samplers = {
+        "Metropolis": lambda recorder: Metropolis(
+            v_y, m_x, v_zero, v_zero, m_prior_sigma, m_proposal_sigma,
+            s_num_itr, s_num_burn_in, n_chains=4, seed=0, recorder=recorder),
+        "Metropolis adaptive": lambda recorder: Metropolis(
+            v_y, m_x, v_zero, v_zero, m_prior_sigma, m_proposal_sigma,
+            s_num_itr, s_num_burn_in, n_chains=4, seed=0, b_adaptive=True,
+            recorder=recorder),
+        "MALA": lambda recorder: MALA(
+            v_y, m_x, v_zero, v_zero, m_prior_sigma, s_step_size, s_num_itr,
+            s_num_burn_in, n_chains=4, seed=0, recorder=recorder),
+    }
+    results = []
+    for name, sampler in samplers.items():
+        recorder = IterationRecorder(s_capacity=s_num_itr)
+        sampler(recorder).optimize()
+        summary = recorder.summary()
+        tracemalloc.start()
+        try:
+            sampler(None).optimize()
+            s_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        results.append({
+            "group": "sampler", "name": name,
+            "num_itr": s_num_itr,
+            "time_per_step": float(summary["time_per_step"]),
+            "acceptance_rate": float(np.mean(summary["acceptance_rate"])),
+            "min_effective_sample_size": float(np.min(
+                summary["effective_sample_size"])),
+            "min_ess_per_second": float(np.min(summary["ess_per_second"])),
+            "max_r_hat": float(np.max(summary["r_hat"])),
+            "peak_memory_bytes": s_peak})
+    return results
+
+
+def run(sizes, s_repeat, s_max_itr, s_num_itr, s_num_burn_in):
+    """
+    Run all benchmarks for every problem size.
+
+    Returns:
+        dict: Metadata of the run and list of results.
+    """
+    results = []
+    for s_n, s_k, s_density in sizes:
+        v_y, m_x = simulate(s_n, s_k, s_density=s_density)
+        size = {"n": s_n, "k": s_k, "density": s_density}
+        print(f"n={s_n}, k={s_k}, density={s_density}", file=sys.stderr)
+        for result in benchmark_kernels(v_y, m_x, s_repeat) + \
+                benchmark_estimators(v_y, m_x, s_repeat, s_max_itr) + \
+                benchmark_samplers(v_y, m_x, s_num_itr, s_num_burn_in):
+            results.append({**size, **result})
+    return {"metadata": metadata(), "results": results}
+
+
+def metadata():
+    """
+    Returns:
+        dict: Commit, library versions and machine of the run.
+    """
+    try:
+        s_commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        s_commit = None
+    return {"commit": s_commit,
+            "timestamp": datetime.datetime.now(
+                datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count()}
+
+
+def compare(before, after):
+    """
+    Print the ratio after / before of every compared metric of the results
+    present in both runs.
+
+    Args:
+        before (dict): Results of the baseline run.
+        after (dict): Results of the new run.
+    """
+    def key(result):
+        return (result["group"], result["name"], result["n"], result["k"],
+                result["density"])
+
+    baseline = {key(result): result for result in before["results"]}
+    print(f"{before['metadata']['commit']} -> "
+          f"{after['metadata']['commit']}")
+    for result in after["results"]:
+        previous = baseline.get(key(result))
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if result.get(metric) and previous.get(metric):
+                print(f"{result['group']:<9} {result['name']:<36} "
+                      f"n={result['n']:<7} k={result['k']:<4} "
+                      f"density={result['density']:<5} {metric:<20} "
+                      f"{result[metric] / previous[metric]:.3f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="smaller problem sizes and shorter chains")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed repetitions of every estimator")
+    parser.add_argument("--output", help="JSON file, standard output if "
+                        "not given")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two JSON files instead of running")
+    args = parser.parse_args()
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            compare(json.load(before), json.load(after))
+        return
+    if args.quick:
+        report = run(QUICK_SIZES, args.repeat, 10000, 2000, 500)
+    else:
+        report = run(SIZES, args.repeat, 20000, 5000, 1000)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
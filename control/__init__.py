@@ -0,0 +1,57 @@
+"""
+Estimation strategies, likelihoods and samplers for logistic regression.
+
+The public classes and modules are loaded on first access, so that importing
+the package (e.g. only for a ScoringModel in a batch-scoring job) does not
+import SciPy or modules that are never used:
+
+    import control
+    strategy = control.LogisticNewton(v_y, m_x, 100, 1e-8)
+"""
+import importlib
+
+# Public name -> (module, attribute), the module itself if attribute is None
+_EXPORTS = {
+    "EstimationStrategy": ("control.estimation.estimation_strategy",
+                           "EstimationStrategy"),
+    "LogisticBatched": ("control.estimation.logistic_batched",
+                        "LogisticBatched"),
+    "LogisticMAP": ("control.estimation.logistic_map", "LogisticMAP"),
+    "LogisticMLE": ("control.estimation.logistic_mle", "LogisticMLE"),
+    "LogisticNewton": ("control.estimation.logistic_newton",
+                       "LogisticNewton"),
+    "LogisticSGD": ("control.estimation.logistic_sgd", "LogisticSGD"),
+    "IterationRecorder": ("control.instrumentation.iteration_recorder",
+                          "IterationRecorder"),
+    "ChunkedLogisticObjective": (
+        "control.likelihood.chunked_logistic_objective",
+        "ChunkedLogisticObjective"),
+    "LogisticObjective": ("control.likelihood.logistic_objective",
+                          "LogisticObjective"),
+    "MVNPrior": ("control.likelihood.mvn_prior", "MVNPrior"),
+    "Sigmoid": ("control.link_function.sigmoid", "Sigmoid"),
+    "MALA": ("control.mcmc.mala", "MALA"),
+    "Metropolis": ("control.mcmc.metropolis", "Metropolis"),
+    "diagnostics": ("control.mcmc.diagnostics", None),
+    "KFoldCrossValidation": ("control.validation.cross_validation",
+                             "KFoldCrossValidation"),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _EXPORTS[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    # Cache the value, so that __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
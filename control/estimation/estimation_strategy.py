@@ -10,3 +10,12 @@ class EstimationStrategy(ABC):
     @abstractmethod
     def estimate():
         pass
+
+    def last_iterate(self):
+        """
+        Returns:
+            np.array: Coefficients of the last iteration of the most recent
+                      estimate, also if it did not converge. None if the
+                      strategy does not keep them or has not been run.
+        """
+        return None
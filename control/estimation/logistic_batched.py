@@ -0,0 +1,370 @@
+import numpy as np
+from control.estimation.estimation_strategy import EstimationStrategy
+from control.estimation.logistic_newton import calculate_standard_errors
+from control.likelihood.mvn_prior import MVNPrior
+
+
+# Opimization class
+class LogisticBatched(EstimationStrategy):
+    def __init__(self, v_y, m_x, s_max_itr, s_tolerance, s_alpha=None,
+                 method="newton", segments=None, v_mu=None, m_sigma=None,
+                 b_line_search=True, s_max_halving=30, recorder=None):
+        """
+        Fit M independent logistic regression models with the same features
+        at once. The linear predictors, gradients and Hessian matrices of all
+        models are calculated with batched matrix products and the Newton
+        systems are solved with one batched solve per iteration, instead of
+        one Python loop per model. A model is frozen as soon as it has
+        converged, and the remaining iterations only touch the models still
+        active. If the mean vector v_mu and covariance matrix m_sigma of a
+        multivariate normal prior are specified, Maximum A Posteriori
+        estimates are obtained instead, with the same prior for every model.
+
+        Args:
+            v_y (np.array): Dependent variable, either stacked per model
+                            (M x n) or one vector (n) with segments.
+            m_x (np.array): Dense design matrix, either stacked per model
+                            (M x n x k) or one matrix (n x k) with segments.
+            s_max_itr (int): Maximum number of iteration for numerical
+                             method.
+            s_tolerance (float): Tolerance for log-likelihood change of each
+                                 model.
+            s_alpha (float, optional): Change rate for gradient ascent, only
+                                       used with method "gradient". Defaults
+                                       to None.
+            method (str, optional): "newton" for Newton-Raphson or "gradient"
+                                    for gradient ascent. Defaults to
+                                    "newton".
+            segments (np.array, optional): Segment id of every row of v_y and
+                                           m_x. One model is fitted per
+                                           distinct id, in sorted order of
+                                           the ids. The segments are
+                                           bucketed by size class (powers of
+                                           two), and the rows of the
+                                           segments of a bucket are gathered
+                                           once into a padded array, the
+                                           padding rows having zero weight,
+                                           so that padding at most doubles
+                                           the memory of the data. Defaults
+                                           to None.
+            v_mu (np.array, optional): Mean vector for prior MVN
+                                       distribution. Defaults to None.
+            m_sigma (np.array, optional): Covariance matrix for prior MVN
+                                          distribution. Defaults to None.
+            b_line_search (bool, optional): True=backtrack the Newton step of
+                                            each model until its
+                                            log-likelihood increases
+                                            sufficiently. Defaults to True.
+            s_max_halving (int, optional): Maximum number of step halvings
+                                           in the line search. Defaults to
+                                           30.
+            recorder (IterationRecorder, optional): Recorder for the summed
+                                                    objective of all models
+                                                    and the number of active
+                                                    models at every
+                                                    iteration. Defaults to
+                                                    None.
+        """
+        if method not in ("newton", "gradient"):
+            raise ValueError(
+                f"method must be 'newton' or 'gradient', got {method!r}.")
+        if method == "gradient" and s_alpha is None:
+            raise ValueError("s_alpha is required for gradient ascent.")
+        self.__s_max_itr = s_max_itr
+        self.__s_tolerance = s_tolerance
+        self.__s_alpha = s_alpha
+        self.__method = method
+        self.__b_line_search = b_line_search
+        self.__s_max_halving = s_max_halving
+        self.__recorder = recorder
+        if segments is None:
+            m_x = np.asarray(m_x, dtype=float)
+            self.__s_num_models, self.__s_num_rows, self.__s_k = m_x.shape
+            # One bucket of all models, all rows are observations, so no
+            # weights or row indices are needed
+            self.__buckets = [(m_x, np.asarray(v_y, dtype=float), None,
+                               np.arange(self.__s_num_models), None)]
+            self.__v_segment_ids = None
+        else:
+            self.__group_segments(v_y, m_x, segments)
+        # Prior distribution, only needed for MAP estimation
+        self.__prior = None if m_sigma is None else MVNPrior(v_mu, m_sigma)
+
+    def estimate(self):
+        """
+        Fit all models, freezing every model once its log-likelihood change
+        is below s_tolerance.
+
+        Returns:
+            list: Estimates of the coefficients (M x k), predicted
+                  probabilities (M x n, or a vector in the original row order
+                  with segments), log-likelihood (plus the prior
+                  log-likelihood for MAP), number of iterations, Hessian
+                  matrices (M x k x k) and standard errors (M x k) of every
+                  model, and whether each model converged. The Hessian
+                  matrices and standard errors are None for gradient ascent.
+        """
+        recorder = self.__recorder
+        if recorder is not None:
+            recorder.start()
+        s_num_models = self.__s_num_models
+        m_beta = np.zeros((s_num_models, self.__s_k))
+        v_num_itr = np.full(s_num_models, self.__s_max_itr)
+        v_converged = np.zeros(s_num_models, dtype=bool)
+        # Data and state of the active models of every bucket, compacted
+        # only when models of the bucket freeze
+        states = []
+        for m_x, m_y, m_w, v_models, _ in self.__buckets:
+            v_ll, m_gradient, m_p = self.__evaluate(
+                m_x, m_y, m_w, m_beta[v_models])
+            states.append((m_x, m_y, m_w, v_models, v_ll, m_gradient, m_p))
+        for i in range(self.__s_max_itr):
+            s_num_active = sum(state[3].shape[0] for state in states)
+            if s_num_active == 0:
+                break
+            s_objective = 0.0
+            for s_bucket, state in enumerate(states):
+                if state[3].shape[0] > 0:
+                    states[s_bucket], v_ll_next = self.__iterate(
+                        state, m_beta, i, v_num_itr, v_converged)
+                    s_objective += np.sum(v_ll_next)
+            if recorder is not None:
+                recorder.record(i, objective=s_objective,
+                                num_active=s_num_active)
+        # Final quantities of every model at its estimates
+        v_ll = np.empty(s_num_models)
+        m_p = np.empty((s_num_models, self.__s_num_rows)) \
+            if self.__v_segment_ids is None else np.empty(self.__s_num_rows)
+        m_hessian = None
+        m_se = None
+        if self.__method == "newton":
+            m_hessian = np.empty((s_num_models, self.__s_k, self.__s_k))
+            m_se = np.empty((s_num_models, self.__s_k))
+        for m_x, m_y, m_w, v_models, m_rows in self.__buckets:
+            v_ll[v_models], _, m_p_bucket = self.__evaluate(
+                m_x, m_y, m_w, m_beta[v_models])
+            if m_rows is None:
+                m_p[v_models] = m_p_bucket
+            else:
+                # Predicted probabilities back in the original row order
+                m_valid = m_rows >= 0
+                m_p[m_rows[m_valid]] = m_p_bucket[m_valid]
+            if self.__method == "newton":
+                m_neg_hessian = self.__calculate_negative_hessian(
+                    m_x, m_w, m_p_bucket)
+                m_hessian[v_models] = -m_neg_hessian
+                m_se[v_models] = calculate_standard_errors(m_neg_hessian)
+        if recorder is not None:
+            recorder.set_summary("converged", v_converged)
+        return [m_beta, m_p, v_ll, v_num_itr, m_hessian, m_se, v_converged]
+
+    def segment_ids(self):
+        """
+        Returns:
+            np.array: Sorted distinct segment ids, the i-th model being fitted
+                      to the i-th segment, or None without segments.
+        """
+        return self.__v_segment_ids
+
+    def __group_segments(self, v_y, m_x, segments):
+        """Helper method. Buckets the segments by size class, the segments
+        of n rows with 2^(c-1) < n <= 2^c being in bucket c, and gathers the
+        rows of the segments of every bucket into a padded M_c x n_max x k
+        design matrix and M_c x n_max dependent variable, with weight 1 for
+        the rows of the segments and 0 for the padding.
+
+        Args:
+            v_y (np.array): dependent variable vector (n)
+            m_x (np.array): design matrix (n x k)
+            segments (np.array): segment id of every row (n)
+        """
+        m_x = np.asarray(m_x, dtype=float)
+        v_y = np.asarray(v_y, dtype=float)
+        segments = np.asarray(segments)
+        v_order = np.argsort(segments, kind="stable")
+        v_segment_ids, v_group, v_counts = np.unique(
+            segments[v_order], return_inverse=True, return_counts=True)
+        v_starts = np.concatenate([[0], np.cumsum(v_counts)[:-1]])
+        # Position of every sorted row within its segment
+        v_position = np.arange(v_order.shape[0]) - v_starts[v_group]
+        v_class = np.ceil(np.log2(v_counts)).astype(int)
+        self.__s_num_models = v_segment_ids.shape[0]
+        self.__s_num_rows, self.__s_k = m_x.shape
+        self.__v_segment_ids = v_segment_ids
+        self.__buckets = []
+        # Index of every model within its bucket
+        v_local = np.empty(self.__s_num_models, dtype=int)
+        for s_class in np.unique(v_class):
+            v_models = np.flatnonzero(v_class == s_class)
+            v_local[v_models] = np.arange(v_models.shape[0])
+            v_sorted = np.flatnonzero(v_class[v_group] == s_class)
+            v_bucket_group = v_local[v_group[v_sorted]]
+            v_bucket_position = v_position[v_sorted]
+            v_rows = v_order[v_sorted]
+            s_n_max = np.max(v_counts[v_models])
+            m_x_bucket = np.zeros((v_models.shape[0], s_n_max, self.__s_k))
+            m_y_bucket = np.zeros((v_models.shape[0], s_n_max))
+            m_rows = np.full((v_models.shape[0], s_n_max), -1)
+            m_x_bucket[v_bucket_group, v_bucket_position] = m_x[v_rows]
+            m_y_bucket[v_bucket_group, v_bucket_position] = v_y[v_rows]
+            m_rows[v_bucket_group, v_bucket_position] = v_rows
+            m_w_bucket = (m_rows >= 0).astype(float)
+            self.__buckets.append(
+                (m_x_bucket, m_y_bucket, m_w_bucket, v_models, m_rows))
+
+    def __iterate(self, state, m_beta, s_itr, v_num_itr, v_converged):
+        """Helper method. Performs one iteration for the active models of a
+        bucket, and removes the models that have converged from its data.
+
+        Args:
+            state (tuple): design matrices, dependent variables, weights (or
+                           None), model indices, objective values, gradients
+                           and predicted probabilities of the active models
+            m_beta (np.array): parameter vectors of all models, updated in
+                               place
+            s_itr (int): iteration number
+            v_num_itr (np.array): number of iterations of all models, updated
+                                  in place
+            v_converged (np.array): convergence of all models, updated in
+                                    place
+
+        Returns:
+            tuple: state of the next iteration and objective values of the
+                   models of state
+        """
+        m_x, m_y, m_w, v_models, v_ll_current, m_gradient, m_p = state
+        if self.__method == "newton":
+            m_neg_hessian = self.__calculate_negative_hessian(m_x, m_w, m_p)
+            m_step = self.__solve(m_neg_hessian, m_gradient)
+        else:
+            m_step = self.__s_alpha * m_gradient
+        m_beta_next, v_ll_next, m_gradient, m_p = \
+            self.__update_coefficients(m_x, m_y, m_w, m_beta[v_models],
+                                       m_step, m_gradient, v_ll_current)
+        m_beta[v_models] = m_beta_next
+        # Freeze the models that have converged
+        v_done = np.abs(v_ll_next - v_ll_current) < self.__s_tolerance
+        if not np.any(v_done):
+            return (m_x, m_y, m_w, v_models, v_ll_next, m_gradient,
+                    m_p), v_ll_next
+        v_converged[v_models[v_done]] = True
+        v_num_itr[v_models[v_done]] = s_itr
+        v_keep = ~v_done
+        return (m_x[v_keep], m_y[v_keep], None if m_w is None else
+                m_w[v_keep], v_models[v_keep], v_ll_next[v_keep],
+                m_gradient[v_keep], m_p[v_keep]), v_ll_next
+
+    def __evaluate(self, m_x, m_y, m_w, m_beta):
+        """Helper method. Calculates log-likelihood (plus the prior
+        log-likelihood for MAP), gradient and predicted probabilities of
+        several models in one pass.
+
+        Args:
+            m_x (np.array): design matrix of each model
+            m_y (np.array): dependent variable of each model
+            m_w (np.array): row weights of each model, or None
+            m_beta (np.array): parameter vector of each model
+
+        Returns:
+            tuple: objective vector, gradient matrix and predicted
+                   probabilities of each model
+        """
+        m_z = np.matmul(m_x, m_beta[:, :, np.newaxis])[:, :, 0]
+        m_softplus = np.logaddexp(0, m_z)
+        m_ll = m_y * m_z - m_softplus
+        m_p = np.exp(m_z - m_softplus)
+        m_residual = m_y - m_p
+        if m_w is not None:
+            m_ll *= m_w
+            m_residual *= m_w
+        v_ll = np.sum(m_ll, axis=1)
+        m_gradient = np.matmul(m_residual[:, np.newaxis], m_x)[:, 0]
+        if self.__prior is not None:
+            v_ll += self.__prior.evaluate_batch(m_beta)
+            m_gradient += self.__prior.gradient_batch(m_beta)
+        return v_ll, m_gradient, m_p
+
+    def __calculate_negative_hessian(self, m_x, m_w, m_p):
+        """Helper method. Calculates the negative Hessian matrix X^T W X of
+        several models, plus the prior precision matrix for MAP.
+
+        Args:
+            m_x (np.array): design matrix of each model
+            m_w (np.array): row weights of each model, or None
+            m_p (np.array): predicted probabilities of each model
+
+        Returns:
+            np.array: negative Hessian matrix of each model (M x k x k)
+        """
+        m_weight = m_p * (1 - m_p)
+        if m_w is not None:
+            m_weight *= m_w
+        m_neg_hessian = np.matmul(m_x.transpose(0, 2, 1),
+                                  m_x * m_weight[:, :, np.newaxis])
+        if self.__prior is not None:
+            m_neg_hessian += self.__prior.precision()
+        return m_neg_hessian
+
+    def __solve(self, m_a, m_b):
+        """Helper method. Solves the linear system of every model at once,
+        falling back to least squares for the models whose matrix is
+        singular (e.g. segments with fewer rows than parameters).
+
+        Args:
+            m_a (np.array): matrix of each model (M x k x k)
+            m_b (np.array): right hand side of each model (M x k, or
+                            M x k x r)
+
+        Returns:
+            np.array: solution of each model, with the shape of m_b
+        """
+        b_vector = m_b.ndim == 2
+        m_rhs = m_b[..., np.newaxis] if b_vector else m_b
+        try:
+            m_solution = np.linalg.solve(m_a, m_rhs)
+        except np.linalg.LinAlgError:
+            m_solution = np.stack([
+                np.linalg.lstsq(m_a_model, m_rhs_model, rcond=None)[0]
+                for m_a_model, m_rhs_model in zip(m_a, m_rhs)])
+        return m_solution[..., 0] if b_vector else m_solution
+
+    def __update_coefficients(self, m_x, m_y, m_w, m_beta, m_step,
+                              m_gradient, v_ll_current):
+        """Helper method. Updates the parameters of several models along
+        their steps. With Newton's method and line search, the steps of the
+        models that fail the Armijo condition are halved, and only those
+        models are evaluated again.
+
+        Args:
+            m_x (np.array): design matrix of each model
+            m_y (np.array): dependent variable of each model
+            m_w (np.array): row weights of each model, or None
+            m_beta (np.array): parameter vector of each model
+            m_step (np.array): step vector of each model
+            m_gradient (np.array): gradient vector of each model
+            v_ll_current (np.array): objective value of each model
+
+        Returns:
+            tuple: updated parameter vectors and their objective values,
+                   gradients and predicted probabilities
+        """
+        m_beta_next = m_beta + m_step
+        v_ll_next, m_gradient_next, m_p_next = self.__evaluate(
+            m_x, m_y, m_w, m_beta_next)
+        if self.__method != "newton" or not self.__b_line_search:
+            return m_beta_next, v_ll_next, m_gradient_next, m_p_next
+        v_slope = 1e-4 * np.einsum("mk,mk->m", m_gradient, m_step)
+        v_step_size = np.ones(m_beta.shape[0])
+        for _ in range(self.__s_max_halving):
+            v_fail = np.flatnonzero(
+                v_ll_next < v_ll_current + v_step_size * v_slope)
+            if v_fail.shape[0] == 0:
+                break
+            v_step_size[v_fail] *= 0.5
+            m_beta_next[v_fail] = m_beta[v_fail] + \
+                v_step_size[v_fail, np.newaxis] * m_step[v_fail]
+            v_ll_next[v_fail], m_gradient_next[v_fail], m_p_next[v_fail] = \
+                self.__evaluate(m_x[v_fail], m_y[v_fail],
+                                None if m_w is None else m_w[v_fail],
+                                m_beta_next[v_fail])
+        return m_beta_next, v_ll_next, m_gradient_next, m_p_next
@@ -1,14 +1,15 @@
 import numpy as np
 from control.estimation.estimation_strategy import EstimationStrategy
-from control.link_function.sigmoid import Sigmoid
-from control.likelihood.logistic_log_likelihood import LogisticLogLikelihood
-from control.likelihood.mvn_log_likelihood import MVNLogLikelihood
+from control.likelihood.chunked_logistic_objective import \
+    ChunkedLogisticObjective
+from control.likelihood.logistic_objective import LogisticObjective
+from control.likelihood.mvn_prior import MVNPrior
 
 
 # Opimization class
 class LogisticMAP(EstimationStrategy):
     def __init__(self, v_y, m_x, v_mu, m_sigma, s_max_itr, s_tolerance,
-                 s_alpha):
+                 s_alpha, chunks=None, v_beta_init=None, recorder=None):
         """
         Use gradient ascent method to obtain Maximum A Posteriori
         estimates for logistic regression coefficients. The prior
@@ -27,6 +28,21 @@ class LogisticMAP(EstimationStrategy):
                              method.
             s_tolerance (float): Tolerance for log-likelihood change.
             s_alpha (float): Change rate for gradient ascent.
+            chunks (callable, optional): Callable returning a fresh iterator
+                                         of (v_y, m_x) chunks. If given, the
+                                         data is streamed chunk by chunk
+                                         instead of using v_y and m_x, and no
+                                         predicted probabilities are
+                                         returned. Defaults to None.
+            v_beta_init (np.array, optional): Starting coefficients (warm
+                                              start). Defaults to None, which
+                                              starts from zeros.
+            recorder (IterationRecorder, optional): Recorder for the
+                                                    objective, gradient norm,
+                                                    step size and wall time of
+                                                    every iteration, and the
+                                                    time spent in each phase.
+                                                    Defaults to None.
         """
         self.__v_y = v_y
         self.__m_x = m_x
@@ -35,6 +51,10 @@ class LogisticMAP(EstimationStrategy):
         self.__s_max_itr = s_max_itr
         self.__s_tolerance = s_tolerance
         self.__s_alpha = s_alpha
+        self.__chunks = chunks
+        self.__v_beta_init = v_beta_init
+        self.__recorder = recorder
+        self.__v_beta_last = None
 
     def estimate(self):
         """
@@ -50,39 +70,117 @@ class LogisticMAP(EstimationStrategy):
                   log-likelihood.
         """
         output = []
-        v_beta = np.zeros(self.__m_x.shape[1])
-        v_p = Sigmoid(
-            self.__m_x, v_beta).calculate_predicted_propability()
-        s_ll_data_current = LogisticLogLikelihood(
-            self.__v_y, self.__m_x, v_beta).calculate_log_likelihood()
-        s_ll_prior_current = MVNLogLikelihood(
-            v_beta, self.__v_mu, self.__m_sigma).calculate_log_likelihood()
+        if self.__recorder is not None:
+            self.__recorder.start()
+        objective = self.__create_objective()
+        prior = MVNPrior(self.__v_mu, self.__m_sigma)
+        if self.__v_beta_init is None:
+            v_beta = np.zeros(objective.num_parameters())
+        else:
+            v_beta = np.array(self.__v_beta_init, dtype=float)
+        v_beta, s_total_ll, s_num_itr, b_converged = self.__ascend(
+            objective, prior, v_beta)
+        self.__v_beta_last = v_beta
+        if b_converged:
+            output.append(v_beta)
+            output.append(objective.predicted_probability())
+            output.append(s_total_ll)
+            output.append(s_num_itr)
+        if self.__recorder is not None:
+            self.__recorder.set_summary("converged", b_converged)
+        return output
+
+    def estimate_path(self, v_scales):
+        """
+        Obtain Maximum A Posteriori estimates for a sequence of prior
+        covariance matrices s * m_sigma, one for each scale s in v_scales.
+        Each fit is warm-started from the solution of the previous one, the
+        Cholesky factor of m_sigma is computed once and rescaled for every
+        fit, and the buffers of the log-likelihood kernel are shared by all
+        fits. Warm starts work best if v_scales is sorted in increasing
+        order, from the strongest to the weakest prior. A recorder records
+        the iterations of all fits one after another.
+
+        Args:
+            v_scales (np.array): Sequence of positive scales for m_sigma.
+
+        Returns:
+            list: Matrix of estimates (one row per scale), vector of
+                  log-posterior values, vector of number of iterations and
+                  boolean vector telling whether each fit converged.
+        """
+        if self.__recorder is not None:
+            self.__recorder.start()
+        objective = self.__create_objective()
+        base_prior = MVNPrior(self.__v_mu, self.__m_sigma)
+        s_k = objective.num_parameters()
+        m_beta_path = np.empty((len(v_scales), s_k))
+        v_log_posterior = np.empty(len(v_scales))
+        v_num_itr = np.empty(len(v_scales), dtype=int)
+        v_converged = np.empty(len(v_scales), dtype=bool)
+        if self.__v_beta_init is None:
+            v_beta = np.zeros(s_k)
+        else:
+            v_beta = np.array(self.__v_beta_init, dtype=float)
+        for j, s_scale in enumerate(v_scales):
+            v_beta, v_log_posterior[j], v_num_itr[j], v_converged[j] = \
+                self.__ascend(objective, base_prior.scale(s_scale), v_beta)
+            m_beta_path[j] = v_beta
+        return [m_beta_path, v_log_posterior, v_num_itr, v_converged]
+
+    def last_iterate(self):
+        """
+        Returns:
+            np.array: Coefficients of the last iteration of the most recent
+                      estimate, also if it did not converge. None before
+                      the first estimate.
+        """
+        return self.__v_beta_last
+
+    def __create_objective(self):
+        """Helper method. Creates the data log-likelihood kernel.
+
+        Returns:
+            LogisticObjective or ChunkedLogisticObjective: kernel
+        """
+        if self.__chunks is None:
+            return LogisticObjective(self.__v_y, self.__m_x, self.__recorder)
+        return ChunkedLogisticObjective(self.__chunks,
+                                        recorder=self.__recorder)
+
+    def __ascend(self, objective, prior, v_beta):
+        """Helper method. Runs gradient ascent from v_beta.
+
+        Args:
+            objective (LogisticObjective): data log-likelihood kernel
+            prior (MVNPrior): prior distribution
+            v_beta (np.array): starting model parameter vector
+
+        Returns:
+            tuple: model parameter vector, log-posterior, number of
+                   iterations and whether the tolerance was reached
+        """
+        s_ll_data_current = objective.evaluate(v_beta)
+        s_ll_prior_current = prior.evaluate(v_beta)
         s_total_ll_current = s_ll_data_current + s_ll_prior_current
 
         for i in range(self.__s_max_itr):
-            v_gradient = self.__calculate_gradient(v_p, v_beta)
+            v_gradient = objective.gradient() + prior.gradient(v_beta)
             v_beta = self.__update_coefficients(v_beta, v_gradient)
-            v_p = Sigmoid(self.__m_x, v_beta).calculate_predicted_propability()
-            s_ll_data_next = LogisticLogLikelihood(
-                self.__v_y, self.__m_x, v_beta).calculate_log_likelihood()
-            s_ll_prior_next = MVNLogLikelihood(
-                v_beta, self.__v_mu, self.__m_sigma).calculate_log_likelihood()
+            s_ll_data_next = objective.evaluate(v_beta)
+            s_ll_prior_next = prior.evaluate(v_beta)
             s_total_ll_next = s_ll_data_next + s_ll_prior_next
+            if self.__recorder is not None:
+                s_gradient_norm = np.linalg.norm(v_gradient)
+                self.__recorder.record(
+                    i, objective=s_total_ll_next,
+                    gradient_norm=s_gradient_norm,
+                    step_size=self.__s_alpha * s_gradient_norm)
             s_diff = np.abs(s_total_ll_next - s_total_ll_current)
             if s_diff < self.__s_tolerance:
-                output.append(v_beta)
-                output.append(v_p)
-                output.append(s_total_ll_current)
-                output.append(i)
-                break
+                return v_beta, s_total_ll_current, i, True
             s_total_ll_current = s_total_ll_next
-        return output
-
-    def __calculate_gradient(self, v_p, v_beta):
-        v_gradient_data = self.__m_x.T @ (self.__v_y - v_p)
-        v_gradient_prior = - np.linalg.inv(
-            self.__m_sigma) @ (v_beta - self.__v_mu)
-        return v_gradient_data + v_gradient_prior
+        return v_beta, s_total_ll_current, self.__s_max_itr, False
 
     def __update_coefficients(self, v_beta, v_gradient):
         return v_beta + self.__s_alpha * v_gradient
@@ -1,12 +1,14 @@
 import numpy as np
 from control.estimation.estimation_strategy import EstimationStrategy
-from control.link_function.sigmoid import Sigmoid
-from control.likelihood.logistic_log_likelihood import LogisticLogLikelihood
+from control.likelihood.chunked_logistic_objective import \
+    ChunkedLogisticObjective
+from control.likelihood.logistic_objective import LogisticObjective
 
 
 # Opimization class
 class LogisticMLE(EstimationStrategy):
-    def __init__(self, v_y, m_x, s_max_itr, s_tolerance, s_alpha):
+    def __init__(self, v_y, m_x, s_max_itr, s_tolerance, s_alpha,
+                 chunks=None, recorder=None):
         """
         Use gradient ascent method to obtain Maximum Likelihood Estimates for
         logistic regression coefficients.
@@ -20,12 +22,27 @@ class LogisticMLE(EstimationStrategy):
                             method.
             s_tolerance (float): Tolerance for log-likelihood change.
             s_alpha (float): Change rate for gradient ascent.
+            chunks (callable, optional): Callable returning a fresh iterator
+                                         of (v_y, m_x) chunks. If given, the
+                                         data is streamed chunk by chunk
+                                         instead of using v_y and m_x, and no
+                                         predicted probabilities are
+                                         returned. Defaults to None.
+            recorder (IterationRecorder, optional): Recorder for the
+                                                    objective, gradient norm,
+                                                    step size and wall time of
+                                                    every iteration, and the
+                                                    time spent in each phase.
+                                                    Defaults to None.
         """
         self.__v_y = v_y
         self.__m_x = m_x
         self.__s_max_itr = s_max_itr
         self.__s_tolerance = s_tolerance
         self.__s_alpha = s_alpha
+        self.__chunks = chunks
+        self.__recorder = recorder
+        self.__v_beta_last = None
 
     def estimate(self):
         """
@@ -38,36 +55,46 @@ class LogisticMLE(EstimationStrategy):
                 number of iterations.
         """
         output = []
-        v_beta = np.zeros(self.__m_x.shape[1])
-        v_p = Sigmoid(self.__m_x, v_beta).calculate_predicted_propability()
-        s_ll_current = LogisticLogLikelihood(
-            self.__v_y, self.__m_x, v_beta).calculate_log_likelihood()
+        recorder = self.__recorder
+        if recorder is not None:
+            recorder.start()
+        if self.__chunks is None:
+            objective = LogisticObjective(self.__v_y, self.__m_x, recorder)
+        else:
+            objective = ChunkedLogisticObjective(
+                self.__chunks, recorder=recorder)
+        v_beta = np.zeros(objective.num_parameters())
+        s_ll_current = objective.evaluate(v_beta)
         for i in range(self.__s_max_itr):
-            v_gradient = self.__calculate_gradient(v_p)
+            v_gradient = objective.gradient()
+            if recorder is not None:
+                s_gradient_norm = np.linalg.norm(v_gradient)
             v_beta = self.__update_coefficients(v_beta, v_gradient)
-            v_p = Sigmoid(
-                self.__m_x, v_beta).calculate_predicted_propability()
-            s_ll_next = LogisticLogLikelihood(
-                self.__v_y, self.__m_x, v_beta).calculate_log_likelihood()
+            s_ll_next = objective.evaluate(v_beta)
+            if recorder is not None:
+                recorder.record(i, objective=s_ll_next,
+                                gradient_norm=s_gradient_norm,
+                                step_size=self.__s_alpha * s_gradient_norm)
             if np.abs(s_ll_next - s_ll_current) < self.__s_tolerance:
                 output.append(v_beta)
-                output.append(v_p)
+                output.append(objective.predicted_probability())
                 output.append(s_ll_current)
                 output.append(i)
                 break
             s_ll_current = s_ll_next
+        self.__v_beta_last = v_beta
+        if recorder is not None:
+            recorder.set_summary("converged", len(output) > 0)
         return output
 
-    def __calculate_gradient(self, v_p):
-        """Helper method. Calculates gradient.
-
-        Args:
-            v_p (np.array): vector of predicted probability
-
+    def last_iterate(self):
+        """
         Returns:
-            np.array: gradient vector
+            np.array: Coefficients of the last iteration of the most recent
+                      estimate, also if it did not converge. None before
+                      the first estimate.
         """
-        return self.__m_x.T @ (self.__v_y - v_p)
+        return self.__v_beta_last
 
     def __update_coefficients(self, v_beta, v_gradient):
         """Helper method. Updates model parameters.
@@ -0,0 +1,297 @@
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from scipy.sparse.linalg import LinearOperator, cg
+from control.estimation.estimation_strategy import EstimationStrategy
+from control.instrumentation.iteration_recorder import timed_phase
+from control.likelihood.chunked_logistic_objective import \
+    ChunkedLogisticObjective
+from control.likelihood.logistic_objective import LogisticObjective
+from control.likelihood.mvn_prior import MVNPrior
+
+# Relative eigenvalue below which the scaled negative Hessian matrix is
+# treated as singular
+_RANK_TOLERANCE = 1e-10
+
+
+def calculate_standard_errors(m_neg_hessian):
+    """
+    Calculate the standard errors of the coefficients from the inverse of
+    the negative Hessian matrix, or of each matrix of a stack of them.
+
+    Args:
+        m_neg_hessian (np.array): Negative Hessian matrix (k x k), or one
+                                  per model (M x k x k).
+
+    Returns:
+        np.array: Standard error vector (k, or M x k), NaN for a matrix that
+                  is singular (rank-deficient design matrix, or fewer
+                  observations than parameters), in which case the
+                  coefficients are not identified.
+    """
+    m_a = m_neg_hessian.reshape((-1,) + m_neg_hessian.shape[-2:])
+    m_se = np.full(m_a.shape[:2], np.nan)
+    with np.errstate(invalid="ignore"):
+        m_scale = np.sqrt(np.diagonal(m_a, axis1=1, axis2=2))
+    v_index = np.flatnonzero(np.all(m_scale > 0, axis=1))
+    if v_index.shape[0] > 0:
+        # Rank check on the scale-free (correlation) form, since a
+        # factorization succeeds on rounding errors for exactly collinear
+        # columns
+        m_scale = m_scale[v_index]
+        m_eigenvalues = np.linalg.eigvalsh(
+            m_a[v_index] / (m_scale[:, :, np.newaxis]
+                            * m_scale[:, np.newaxis, :]))
+        v_index = v_index[
+            m_eigenvalues[:, 0] > _RANK_TOLERANCE * m_eigenvalues[:, -1]]
+    if v_index.shape[0] > 0:
+        m_cov = np.linalg.inv(m_a[v_index])
+        with np.errstate(invalid="ignore"):
+            m_se[v_index] = np.sqrt(np.diagonal(m_cov, axis1=1, axis2=2))
+    return m_se.reshape(m_neg_hessian.shape[:-1])
+
+
+# Opimization class
+class LogisticNewton(EstimationStrategy):
+    def __init__(self, v_y, m_x, s_max_itr, s_tolerance, v_mu=None,
+                 m_sigma=None, b_line_search=True, s_max_halving=30,
+                 chunks=None, b_conjugate_gradient=False, recorder=None):
+        """
+        Use Newton-Raphson method (iteratively reweighted least squares) to
+        obtain Maximum Likelihood Estimates for logistic regression
+        coefficients. If the mean vector v_mu and covariance matrix m_sigma
+        of a multivariate normal prior are specified, Maximum A Posteriori
+        estimates are obtained instead.
+
+        Args:
+            v_y (np.array): Vector containing observed values of dependent
+                            variable.
+            m_x (np.array): Design matrix containing observed values of
+                            independent variable.
+            s_max_itr (int): Maximum number of iteration for numerical
+                             method.
+            s_tolerance (float): Tolerance for log-likelihood change.
+            v_mu (np.array, optional): Mean vector for prior MVN
+                                       distribution. Defaults to None.
+            m_sigma (np.array, optional): Covariance matrix for prior MVN
+                                          distribution. Defaults to None.
+            b_line_search (bool, optional): True=backtrack the Newton step
+                                            until the log-likelihood
+                                            increases sufficiently.
+                                            Defaults to True.
+            s_max_halving (int, optional): Maximum number of step halvings
+                                           in the line search. Defaults to
+                                           30.
+            chunks (callable, optional): Callable returning a fresh iterator
+                                         of (v_y, m_x) chunks. If given, the
+                                         data is streamed chunk by chunk
+                                         instead of using v_y and m_x, and no
+                                         predicted probabilities are
+                                         returned. Defaults to None.
+            b_conjugate_gradient (bool, optional): True=solve the Newton
+                                         system with conjugate gradient using
+                                         Hessian-vector products, so the k x k
+                                         Hessian matrix is never formed and
+                                         no Hessian matrix or standard errors
+                                         are returned. Intended for wide
+                                         sparse design matrices; not
+                                         available with chunks. Defaults to
+                                         False.
+            recorder (IterationRecorder, optional): Recorder for the
+                                                    objective, gradient norm,
+                                                    step size and wall time of
+                                                    every iteration, and the
+                                                    time spent in each phase.
+                                                    Defaults to None.
+        """
+        if chunks is not None and b_conjugate_gradient:
+            raise ValueError(
+                "Conjugate gradient is not available with chunks.")
+        self.__s_max_itr = s_max_itr
+        self.__s_tolerance = s_tolerance
+        self.__b_line_search = b_line_search
+        self.__s_max_halving = s_max_halving
+        self.__b_conjugate_gradient = b_conjugate_gradient
+        self.__recorder = recorder
+        if chunks is None:
+            self.__objective = LogisticObjective(v_y, m_x, recorder)
+        else:
+            self.__objective = ChunkedLogisticObjective(
+                chunks, b_hessian=True, recorder=recorder)
+        # Prior distribution, only needed for MAP estimation
+        self.__prior = None if m_sigma is None else MVNPrior(v_mu, m_sigma)
+        self.__v_beta_last = None
+
+    def estimate(self):
+        """
+        Use Newton-Raphson method to obtain Maximum Likelihood Estimates (or
+        Maximum A Posteriori estimates if a prior is specified) for logistic
+        regression coefficients. Each step solves the Newton system with a
+        Cholesky factorization of the negative Hessian X^T W X (plus the
+        prior precision for MAP), or with conjugate gradient if requested.
+
+        Returns:
+            list: List of estimates for logistic regression coefficients,
+                  predictied probabilities, log-likelihood, number of
+                  iterations, Hessian matrix and standard errors of the
+                  coefficients (NaN if the design matrix is rank-deficient).
+        """
+        output = []
+        recorder = self.__recorder
+        if recorder is not None:
+            recorder.start()
+        v_beta = np.zeros(self.__objective.num_parameters())
+        s_ll_current = self.__calculate_objective(v_beta)
+        for i in range(self.__s_max_itr):
+            v_gradient = self.__calculate_gradient(v_beta)
+            with timed_phase(recorder, "solve"):
+                v_step = self.__calculate_step(v_gradient)
+            v_beta_previous = v_beta
+            v_beta, s_ll_next = self.__update_coefficients(
+                v_beta, v_step, v_gradient, s_ll_current)
+            if recorder is not None:
+                recorder.record(
+                    i, objective=s_ll_next,
+                    gradient_norm=np.linalg.norm(v_gradient),
+                    step_size=np.linalg.norm(v_beta - v_beta_previous))
+            if np.abs(s_ll_next - s_ll_current) < self.__s_tolerance:
+                output.append(v_beta)
+                output.append(self.__objective.predicted_probability())
+                output.append(s_ll_next)
+                output.append(i)
+                if self.__b_conjugate_gradient:
+                    output.append(None)
+                    output.append(None)
+                else:
+                    m_neg_hessian = self.__calculate_negative_hessian()
+                    output.append(-m_neg_hessian)
+                    output.append(calculate_standard_errors(m_neg_hessian))
+                break
+            s_ll_current = s_ll_next
+        self.__v_beta_last = v_beta
+        if recorder is not None:
+            recorder.set_summary("converged", len(output) > 0)
+        return output
+
+    def last_iterate(self):
+        """
+        Returns:
+            np.array: Coefficients of the last iteration of the most recent
+                      estimate, also if it did not converge. None before
+                      the first estimate.
+        """
+        return self.__v_beta_last
+
+    def __calculate_objective(self, v_beta):
+        """Helper method. Calculates log-likelihood, plus the prior
+        log-likelihood for MAP estimation. The data gradient and predicted
+        probabilities at v_beta are evaluated in the same pass.
+
+        Args:
+            v_beta (np.array): model parameter vector
+
+        Returns:
+            float: value of the objective function
+        """
+        s_ll = self.__objective.evaluate(v_beta)
+        if self.__prior is not None:
+            s_ll += self.__prior.evaluate(v_beta)
+        return s_ll
+
+    def __calculate_gradient(self, v_beta):
+        """Helper method. Calculates gradient at the last evaluated v_beta.
+
+        Args:
+            v_beta (np.array): model parameter vector
+
+        Returns:
+            np.array: gradient vector
+        """
+        v_gradient = self.__objective.gradient().copy()
+        if self.__prior is not None:
+            v_gradient += self.__prior.gradient(v_beta)
+        return v_gradient
+
+    def __calculate_step(self, v_gradient):
+        """Helper method. Solves the Newton system for the step vector.
+
+        Args:
+            v_gradient (np.array): gradient vector
+
+        Returns:
+            np.array: Newton step vector
+        """
+        if not self.__b_conjugate_gradient:
+            m_neg_hessian = self.__calculate_negative_hessian()
+            try:
+                return cho_solve(cho_factor(m_neg_hessian), v_gradient)
+            except np.linalg.LinAlgError:
+                # Singular for rank-deficient design matrices (e.g. dummy
+                # variables of every category plus the intercept, or a
+                # column of zeros), take the minimum norm step instead
+                return np.linalg.lstsq(m_neg_hessian, v_gradient,
+                                       rcond=None)[0]
+        s_k = v_gradient.shape[0]
+        operator = LinearOperator(
+            (s_k, s_k), matvec=self.__calculate_negative_hessian_product,
+            dtype=v_gradient.dtype)
+        v_step, _ = cg(operator, v_gradient)
+        return v_step
+
+    def __calculate_negative_hessian_product(self, v_vector):
+        """Helper method. Calculates the product of the negative Hessian
+        matrix with v_vector without forming the matrix.
+
+        Args:
+            v_vector (np.array): vector of size k
+
+        Returns:
+            np.array: vector of size k
+        """
+        v_vector = np.ravel(v_vector)
+        v_product = self.__objective.negative_hessian_product(v_vector)
+        if self.__prior is not None:
+            v_product = v_product + self.__prior.precision_product(v_vector)
+        return v_product
+
+    def __calculate_negative_hessian(self):
+        """Helper method. Calculates negative Hessian matrix X^T W X at the
+        last evaluated v_beta, plus the prior precision matrix for MAP
+        estimation.
+
+        Returns:
+            np.array: negative Hessian matrix
+        """
+        m_neg_hessian = self.__objective.negative_hessian()
+        if self.__prior is not None:
+            # Not in place, the objective may return its own buffer
+            m_neg_hessian = m_neg_hessian + self.__prior.precision()
+        return m_neg_hessian
+
+    def __update_coefficients(self, v_beta, v_step, v_gradient,
+                              s_ll_current):
+        """Helper method. Updates model parameters along the Newton step,
+        halving the step size until the Armijo condition holds if line search
+        is enabled.
+
+        Args:
+            v_beta (np.array): model parameter vector
+            v_step (np.array): Newton step vector
+            v_gradient (np.array): gradient vector
+            s_ll_current (float): objective value at v_beta
+
+        Returns:
+            tuple: updated model parameter vector and its objective value
+        """
+        s_slope = 1e-4 * (v_gradient @ v_step)
+        s_step_size = 1.0
+        v_beta_next = v_beta + v_step
+        s_ll_next = self.__calculate_objective(v_beta_next)
+        if not self.__b_line_search:
+            return v_beta_next, s_ll_next
+        for _ in range(self.__s_max_halving):
+            if s_ll_next >= s_ll_current + s_step_size * s_slope:
+                break
+            s_step_size *= 0.5
+            v_beta_next = v_beta + s_step_size * v_step
+            s_ll_next = self.__calculate_objective(v_beta_next)
+        return v_beta_next, s_ll_next
@@ -0,0 +1,224 @@
+import numpy as np
+from control.estimation.estimation_strategy import EstimationStrategy
+from control.likelihood.logistic_objective import LogisticObjective
+from control.likelihood.mvn_prior import MVNPrior
+
+
+# Opimization class
+class LogisticSGD(EstimationStrategy):
+    def __init__(self, v_y, m_x, s_max_itr, s_tolerance, s_alpha,
+                 s_batch_size=256, optimizer="adam", v_mu=None, m_sigma=None,
+                 s_momentum=0.9, s_beta_1=0.9, s_beta_2=0.999,
+                 s_epsilon=1e-8, s_decay=0.0, s_holdout=0.0, s_patience=3,
+                 seed=None, recorder=None):
+        """
+        Use mini-batch stochastic gradient ascent (SGD with momentum or Adam)
+        to obtain Maximum Likelihood Estimates for logistic regression
+        coefficients. If the mean vector v_mu and covariance matrix m_sigma
+        of a multivariate normal prior are specified, Maximum A Posteriori
+        estimates are obtained instead. Every update only touches one
+        mini-batch, and the gradient is scaled to the log-likelihood per
+        observation, so s_alpha does not depend on the number of
+        observations. The prior gradient is scaled by 1 / n accordingly.
+
+        Args:
+            v_y (np.array): Vector containing observed values of dependent
+                            variable.
+            m_x (np.array): Design matrix containing observed values of
+                            independent variable.
+            s_max_itr (int): Maximum number of epochs (passes over the data).
+            s_tolerance (float): Tolerance for the change of the mean
+                                 log-likelihood per observation between
+                                 epochs, which has to hold for s_patience
+                                 consecutive epochs.
+            s_alpha (float): Learning rate.
+            s_batch_size (int, optional): Number of observations per
+                                          mini-batch. Defaults to 256.
+            optimizer (str, optional): "sgd" for SGD with momentum or "adam".
+                                       Defaults to "adam".
+            v_mu (np.array, optional): Mean vector for prior MVN
+                                       distribution. Defaults to None.
+            m_sigma (np.array, optional): Covariance matrix for prior MVN
+                                          distribution. Defaults to None.
+            s_momentum (float, optional): Momentum for SGD. Defaults to 0.9.
+            s_beta_1 (float, optional): Decay rate of the first moment for
+                                        Adam. Defaults to 0.9.
+            s_beta_2 (float, optional): Decay rate of the second moment for
+                                        Adam. Defaults to 0.999.
+            s_epsilon (float, optional): Numerical stability constant for
+                                         Adam. Defaults to 1e-8.
+            s_decay (float, optional): Learning rate schedule, the learning
+                                       rate of epoch t is
+                                       s_alpha / (1 + s_decay * t). Defaults
+                                       to 0.0.
+            s_holdout (float, optional): Fraction of observations held out
+                                         from training. If positive,
+                                         convergence is checked on the
+                                         holdout log-likelihood, otherwise on
+                                         the running log-likelihood of the
+                                         mini-batches. Must be less than 1.
+                                         Defaults to 0.0.
+            s_patience (int, optional): Number of consecutive epochs the
+                                        change of the log-likelihood has to
+                                        stay below s_tolerance, so that a
+                                        single epoch whose mini-batch noise
+                                        happens to cancel does not stop
+                                        training. Defaults to 3.
+            seed (int, optional): Seed for shuffling. Defaults to None.
+            recorder (IterationRecorder, optional): Recorder for the
+                                                    convergence log-likelihood,
+                                                    last gradient norm, change
+                                                    of the coefficients and
+                                                    wall time of every epoch.
+                                                    Defaults to None.
+        """
+        if optimizer not in ("sgd", "adam"):
+            raise ValueError(
+                f"optimizer must be 'sgd' or 'adam', got {optimizer!r}.")
+        if not 0.0 <= s_holdout < 1.0:
+            raise ValueError(
+                f"s_holdout must be in [0, 1), got {s_holdout!r}.")
+        self.__v_y = np.asarray(v_y, dtype=float)
+        self.__m_x = m_x
+        self.__s_max_itr = s_max_itr
+        self.__s_tolerance = s_tolerance
+        self.__s_alpha = s_alpha
+        self.__s_batch_size = s_batch_size
+        self.__optimizer = optimizer
+        self.__s_momentum = s_momentum
+        self.__s_beta_1 = s_beta_1
+        self.__s_beta_2 = s_beta_2
+        self.__s_epsilon = s_epsilon
+        self.__s_decay = s_decay
+        self.__s_holdout = s_holdout
+        self.__s_patience = s_patience
+        self.__seed = seed
+        self.__recorder = recorder
+        # Prior distribution, only needed for MAP estimation
+        self.__prior = None if m_sigma is None else MVNPrior(v_mu, m_sigma)
+        self.__v_beta_last = None
+
+    def estimate(self):
+        """
+        Use mini-batch stochastic gradient ascent to obtain Maximum Likelihood
+        Estimates (or Maximum A Posteriori estimates if a prior is specified)
+        for logistic regression coefficients. The observations are visited in
+        a new random order every epoch; only the row indices are shuffled, the
+        design matrix is never copied as a whole.
+
+        Returns:
+            list: List of estimates for logistic regression coefficients,
+                  predictied probabilities, log-likelihood (plus the prior
+                  log-likelihood for MAP) over all observations and number
+                  of epochs.
+        """
+        output = []
+        recorder = self.__recorder
+        if recorder is not None:
+            recorder.start()
+        rng = np.random.default_rng(self.__seed)
+        s_n, s_k = self.__m_x.shape
+        v_index = rng.permutation(s_n)
+        s_num_holdout = int(s_n * self.__s_holdout)
+        v_holdout_index = np.sort(v_index[:s_num_holdout])
+        v_train_index = v_index[s_num_holdout:]
+        s_num_train = v_train_index.shape[0]
+        v_beta = np.zeros(s_k)
+        # Momentum for SGD, first and second moments for Adam
+        v_velocity = np.zeros(s_k)
+        v_moment_1 = np.zeros(s_k)
+        v_moment_2 = np.zeros(s_k)
+        s_step = 0
+        s_ll_current = None
+        # Number of consecutive epochs within the tolerance
+        s_num_within = 0
+        for i in range(self.__s_max_itr):
+            s_alpha = self.__s_alpha / (1 + self.__s_decay * i)
+            rng.shuffle(v_train_index)
+            v_beta_previous = v_beta
+            s_ll_running = 0.0
+            for s_start in range(0, s_num_train, self.__s_batch_size):
+                v_batch = v_train_index[
+                    s_start:s_start + self.__s_batch_size]
+                s_ll_batch, v_gradient = self.__calculate_batch(
+                    v_batch, v_beta, s_num_train)
+                s_ll_running += s_ll_batch
+                s_step += 1
+                if self.__optimizer == "sgd":
+                    v_velocity = self.__s_momentum * v_velocity + \
+                        s_alpha * v_gradient
+                    v_beta = v_beta + v_velocity
+                else:
+                    v_moment_1 = self.__s_beta_1 * v_moment_1 + (
+                        1 - self.__s_beta_1) * v_gradient
+                    v_moment_2 = self.__s_beta_2 * v_moment_2 + (
+                        1 - self.__s_beta_2) * v_gradient ** 2
+                    v_moment_1_hat = v_moment_1 / (
+                        1 - self.__s_beta_1 ** s_step)
+                    v_moment_2_hat = v_moment_2 / (
+                        1 - self.__s_beta_2 ** s_step)
+                    v_beta = v_beta + s_alpha * v_moment_1_hat / (
+                        np.sqrt(v_moment_2_hat) + self.__s_epsilon)
+            if s_num_holdout > 0:
+                s_ll_next = self.__calculate_batch(
+                    v_holdout_index, v_beta, s_num_train)[0] / s_num_holdout
+            else:
+                s_ll_next = s_ll_running / s_num_train
+            if recorder is not None:
+                recorder.record(
+                    i, objective=s_ll_next,
+                    gradient_norm=np.linalg.norm(v_gradient),
+                    step_size=np.linalg.norm(v_beta - v_beta_previous))
+            if s_ll_current is not None and np.abs(
+                    s_ll_next - s_ll_current) < self.__s_tolerance:
+                s_num_within += 1
+            else:
+                s_num_within = 0
+            if s_num_within >= self.__s_patience:
+                objective = LogisticObjective(self.__v_y, self.__m_x)
+                s_ll = objective.evaluate(v_beta)
+                if self.__prior is not None:
+                    s_ll += self.__prior.evaluate(v_beta)
+                output.append(v_beta)
+                output.append(objective.predicted_probability())
+                output.append(s_ll)
+                output.append(i)
+                break
+            s_ll_current = s_ll_next
+        self.__v_beta_last = v_beta
+        if recorder is not None:
+            recorder.set_summary("converged", len(output) > 0)
+        return output
+
+    def last_iterate(self):
+        """
+        Returns:
+            np.array: Coefficients of the last iteration of the most recent
+                      estimate, also if it did not converge. None before
+                      the first estimate.
+        """
+        return self.__v_beta_last
+
+    def __calculate_batch(self, v_batch, v_beta, s_num_train):
+        """Helper method. Calculates the log-likelihood of a mini-batch and
+        the gradient per observation, including the prior gradient scaled by
+        1 / s_num_train for MAP estimation.
+
+        Args:
+            v_batch (np.array): row indices of the mini-batch
+            v_beta (np.array): model parameter vector
+            s_num_train (int): number of training observations
+
+        Returns:
+            tuple: log-likelihood of the mini-batch and gradient vector
+        """
+        m_x = self.__m_x[v_batch]
+        v_y = self.__v_y[v_batch]
+        v_z = m_x @ v_beta
+        v_softplus = np.logaddexp(0, v_z)
+        s_ll = float(v_y @ v_z - np.sum(v_softplus))
+        v_p = np.exp(v_z - v_softplus)
+        v_gradient = m_x.T @ (v_y - v_p) / v_batch.shape[0]
+        if self.__prior is not None:
+            v_gradient += self.__prior.gradient(v_beta) / s_num_train
+        return s_ll, v_gradient
@@ -0,0 +1,148 @@
+import time
+import numpy as np
+from contextlib import nullcontext
+
+# Used in place of a phase timer when no recorder is attached
+_NO_TIMER = nullcontext()
+
+
+def timed_phase(recorder, name):
+    """
+    Time a block of code in the phase name of recorder, or do nothing if
+    recorder is None, used as "with timed_phase(recorder, 'gradient'): ...".
+
+    Args:
+        recorder (IterationRecorder): Recorder, or None.
+        name (str): Name of the phase.
+
+    Returns:
+        context manager: Phase timer, or a no-op context manager.
+    """
+    if recorder is None:
+        return _NO_TIMER
+    return recorder.phase(name)
+
+
+class IterationRecorder:
+    def __init__(self, s_every=1, s_capacity=1024) -> None:
+        """
+        Buffered per-iteration recorder for estimators and samplers. Values
+        are written into preallocated NumPy arrays (doubled in size when
+        full) rather than Python lists, and only every s_every-th iteration
+        is recorded, so it can stay enabled on long runs. The wall time since
+        start() is recorded with every row. Time spent in named phases (e.g.
+        sigmoid, likelihood, gradient) is accumulated separately for every
+        call, independently of s_every.
+
+        Args:
+            s_every (int, optional): Record every s_every-th iteration.
+                                     Defaults to 1.
+            s_capacity (int, optional): Initial number of rows of the
+                                        buffers. Defaults to 1024.
+        """
+        self.__s_every = s_every
+        self.__s_capacity = s_capacity
+        self.__s_size = 0
+        self.__buffers = {}
+        self.__phase_times = {}
+        self.__summary = {}
+        self.__s_start = time.perf_counter()
+
+    def start(self):
+        """
+        Clear all recorded values and restart the clock.
+        """
+        self.__s_size = 0
+        self.__buffers = {}
+        self.__phase_times = {}
+        self.__summary = {}
+        self.__s_start = time.perf_counter()
+
+    def record(self, s_itr, **values):
+        """
+        Record the values of iteration s_itr, if it is sampled.
+
+        Args:
+            s_itr (int): Iteration number.
+            **values (float): Named values of the iteration, e.g.
+                              objective=..., gradient_norm=...
+        """
+        if s_itr % self.__s_every != 0:
+            return
+        s_time = time.perf_counter() - self.__s_start
+        if self.__s_size == self.__s_capacity:
+            self.__s_capacity *= 2
+            for name, v_buffer in self.__buffers.items():
+                # New rows are NaN until recorded, like a new buffer
+                v_grown = np.full(self.__s_capacity, np.nan)
+                v_grown[:self.__s_size] = v_buffer[:self.__s_size]
+                self.__buffers[name] = v_grown
+        values["iteration"] = s_itr
+        values["time"] = s_time
+        for name, value in values.items():
+            if name not in self.__buffers:
+                self.__buffers[name] = np.full(self.__s_capacity, np.nan)
+            self.__buffers[name][self.__s_size] = value
+        self.__s_size += 1
+
+    def phase(self, name):
+        """
+        Time a block of code and add the time to the phase name, used as
+        "with recorder.phase('gradient'): ...".
+
+        Args:
+            name (str): Name of the phase.
+
+        Returns:
+            PhaseTimer: Context manager timing the block.
+        """
+        return PhaseTimer(self.__phase_times, name)
+
+    def set_summary(self, name, value):
+        """
+        Store a summary value of the whole run, e.g. an acceptance rate.
+
+        Args:
+            name (str): Name of the value.
+            value (object): Summary value.
+        """
+        self.__summary[name] = value
+
+    def trace(self):
+        """
+        Returns:
+            dict: Array of recorded values for every name, including
+                  "iteration" and "time" (seconds since start).
+        """
+        return {name: v_buffer[:self.__s_size].copy()
+                for name, v_buffer in self.__buffers.items()}
+
+    def phase_times(self):
+        """
+        Returns:
+            dict: Total seconds spent in every phase.
+        """
+        return dict(self.__phase_times)
+
+    def summary(self):
+        """
+        Returns:
+            dict: Summary values of the run.
+        """
+        return dict(self.__summary)
+
+
+class PhaseTimer:
+    def __init__(self, phase_times, name) -> None:
+        self.__phase_times = phase_times
+        self.__name = name
+        self.__s_start = None
+
+    def __enter__(self):
+        self.__s_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.__phase_times[self.__name] = self.__phase_times.get(
+            self.__name, 0.0) + time.perf_counter() - self.__s_start
+        return False
@@ -0,0 +1,138 @@
+import numpy as np
+from scipy import sparse
+from control.instrumentation.iteration_recorder import timed_phase
+from control.likelihood.log_likelihood import LogLikelihood
+from control.likelihood.logistic_objective import calculate_weighted_gram
+
+
+class ChunkedLogisticObjective(LogLikelihood):
+    def __init__(self, chunks, b_hessian=False, recorder=None) -> None:
+        """
+        Out-of-core counterpart of LogisticObjective. The log-likelihood,
+        gradient and (optionally) negative Hessian are accumulated chunk by
+        chunk, so memory is bounded by the chunk size rather than by the
+        number of observations. Every evaluation is one pass over the data.
+
+        A pandas CSV reader can be used as a chunk source with:
+            lambda: ((df[DV].values,
+                      np.column_stack([np.ones(len(df)), df[IV].values]))
+                     for df in pd.read_csv(path, chunksize=100000))
+
+        Args:
+            chunks (callable): Callable without arguments that returns a fresh
+                               iterator of (v_y, m_x) chunks on every call,
+                               where m_x is a block of rows of the design
+                               matrix, dense or scipy.sparse.
+            b_hessian (bool, optional): True=accumulate the negative Hessian
+                                        matrix in the same pass. Defaults to
+                                        False.
+            recorder (IterationRecorder, optional): Recorder that
+                                                    accumulates the time spent
+                                                    in the linear predictor,
+                                                    likelihood, sigmoid,
+                                                    gradient and Hessian
+                                                    phases. Defaults to None.
+        """
+        super().__init__()
+        self.__chunks = chunks
+        self.__b_hessian = b_hessian
+        self.__recorder = recorder
+        self.__s_k = None
+        self.__s_log_likelihood = None
+        self.__v_gradient = None
+        self.__m_neg_hessian = None
+
+    def evaluate(self, v_beta):
+        """
+        Calculate the log-likelihood and gradient at v_beta, and the negative
+        Hessian matrix if requested, in a single pass over the chunks.
+
+        Args:
+            v_beta (np.array): Vector containing parameters to estimate.
+
+        Returns:
+            float: Log-likelihood for the model.
+        """
+        s_k = v_beta.shape[0]
+        s_log_likelihood = 0.0
+        v_gradient = np.zeros(s_k)
+        m_neg_hessian = np.zeros((s_k, s_k)) if self.__b_hessian else None
+        for v_y, m_x in self.__iterate():
+            with timed_phase(self.__recorder, "linear_predictor"):
+                v_z = m_x @ v_beta
+            with timed_phase(self.__recorder, "likelihood"):
+                v_softplus = np.logaddexp(0, v_z)
+                s_log_likelihood += float(v_y @ v_z - np.sum(v_softplus))
+            with timed_phase(self.__recorder, "sigmoid"):
+                v_p = np.exp(v_z - v_softplus)
+            with timed_phase(self.__recorder, "gradient"):
+                v_gradient += m_x.T @ (v_y - v_p)
+            if self.__b_hessian:
+                with timed_phase(self.__recorder, "hessian"):
+                    v_w = v_p * (1 - v_p)
+                    m_neg_hessian += calculate_weighted_gram(m_x, v_w)
+        self.__s_log_likelihood = s_log_likelihood
+        self.__v_gradient = v_gradient
+        self.__m_neg_hessian = m_neg_hessian
+        return s_log_likelihood
+
+    def calculate_log_likelihood(self):
+        """
+        Returns:
+            float: Log-likelihood from the last evaluation.
+        """
+        return self.__s_log_likelihood
+
+    def predicted_probability(self):
+        """
+        Predicted probabilities are not kept, since they grow with the number
+        of observations.
+
+        Returns:
+            None
+        """
+        return None
+
+    def gradient(self):
+        """
+        Returns:
+            np.array: Gradient vector from the last evaluation.
+        """
+        return self.__v_gradient
+
+    def negative_hessian(self):
+        """
+        Returns:
+            np.array: Copy of the negative Hessian matrix X^T W X from the
+                      last evaluation.
+        """
+        if not self.__b_hessian:
+            raise ValueError(
+                "Negative Hessian is only accumulated with b_hessian=True.")
+        return self.__m_neg_hessian.copy()
+
+    def num_parameters(self):
+        """
+        Returns:
+            int: Number of columns of the design matrix, read from the first
+                 chunk.
+        """
+        if self.__s_k is None:
+            for _, m_x in self.__iterate():
+                self.__s_k = m_x.shape[1]
+                break
+        return self.__s_k
+
+    def __iterate(self):
+        """Helper method. Yields the chunks as float arrays.
+
+        Yields:
+            tuple: Dependent variable vector and design matrix of a chunk.
+        """
+        for v_y, m_x in self.__chunks():
+            v_y = np.asarray(v_y, dtype=float)
+            if not sparse.issparse(m_x):
+                m_x = np.asarray(m_x, dtype=float)
+                if m_x.ndim == 1:
+                    m_x = m_x[:, np.newaxis]
+            yield v_y, m_x
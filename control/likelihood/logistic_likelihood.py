@@ -1,6 +1,6 @@
 import numpy as np
-from likelihood import Likelihood
-from link_function.sigmoid import Sigmoid
+from control.likelihood.likelihood import Likelihood
+from control.link_function.sigmoid import Sigmoid
 
 
 class LogisticLikelihood(Likelihood):
@@ -1,6 +1,5 @@
 import numpy as np
-from log_likelihood import LogLikelihood
-from link_function.sigmoid import Sigmoid
+from control.likelihood.log_likelihood import LogLikelihood
 
 
 class LogisticLogLikelihood(LogLikelihood):
@@ -9,7 +8,6 @@ class LogisticLogLikelihood(LogLikelihood):
         self.__v_y = v_y
         self.__m_x = m_x
         self.__v_beta = v_beta
-        self.__link_function = Sigmoid(self.__m_x, self.__v_beta)
 
     def calculate_log_likelihood(self):
         """
@@ -28,13 +26,10 @@ class LogisticLogLikelihood(LogLikelihood):
         Returns:
             float: Log-likelihood for the model.
         """
-        # Calulate predictions
-        v_p = self.__link_function.calculate_predicted_propability()
-        # Create a vector of ones
-        v_one = np.ones(self.__m_x.shape[0])
-        # Calculate log-likelihood for each observation
-        v_log_likelihood = np.multiply(self.__v_y, np.log(v_p)) + np.multiply(
-            (v_one - self.__v_y), np.log(v_one - v_p))
-        # Sum log-likelihood for all observations
-        s_log_likelihood = np.sum(v_log_likelihood)
+        # Linear predictor
+        v_z = self.__m_x @ self.__v_beta
+        # y * log(p) + (1 - y) * log(1 - p) simplifies to
+        # y * z - log(1 + exp(z)), which is stable for large |z|
+        s_log_likelihood = np.asarray(self.__v_y) @ v_z - np.sum(
+            np.logaddexp(0, v_z))
         return s_log_likelihood
@@ -0,0 +1,251 @@
+import numpy as np
+from scipy import sparse
+from control.instrumentation.iteration_recorder import timed_phase
+from control.likelihood.log_likelihood import LogLikelihood
+
+# Rows of a float32 design matrix converted to float64 at a time
+_BLOCK_ROWS = 8192
+
+
+def calculate_weighted_gram(m_x, v_w):
+    """
+    Calculate X^T W X, where W is the diagonal matrix of the weights v_w,
+    for a dense or scipy.sparse design matrix without densifying it.
+
+    Args:
+        m_x (np.array or scipy.sparse matrix): Design matrix.
+        v_w (np.array): Vector of weights for each observation.
+
+    Returns:
+        np.array: Dense k x k matrix.
+    """
+    if sparse.issparse(m_x):
+        return np.asarray((m_x.T @ m_x.multiply(
+            v_w[:, np.newaxis])).todense())
+    return m_x.T @ (m_x * v_w[:, np.newaxis])
+
+
+class LogisticObjective(LogLikelihood):
+    def __init__(self, v_y, m_x, recorder=None) -> None:
+        """
+        Fused log-likelihood and gradient kernel for a logistic regression
+        model. The linear predictor is computed once per evaluation and the
+        predicted probabilities, log-likelihood and gradient are all derived
+        from it, writing into buffers that are allocated once and reused for
+        every evaluation.
+
+        Args:
+            v_y (np.array): Vector containing observed values of dependent
+                            variable.
+            m_x (np.array or scipy.sparse matrix): Design matrix containing
+                            observed values of independent variable. Sparse
+                            matrices are never densified, CSR is the
+                            fastest format. A dense float32 matrix is kept
+                            in float32 and converted to float64 in blocks
+                            of rows, so every evaluation is carried out in
+                            float64.
+            recorder (IterationRecorder, optional): Recorder that
+                            accumulates the time spent in the linear
+                            predictor, likelihood, sigmoid, gradient and
+                            Hessian phases. Defaults to None.
+        """
+        super().__init__()
+        self.__m_x = m_x
+        self.__recorder = recorder
+        self.__b_sparse = sparse.issparse(m_x)
+        # Linear predictors accumulated in float32 are too noisy for the
+        # absolute log-likelihood tolerance of the estimators once n is
+        # large, so a dense float32 design is only read in float32
+        self.__b_blocked = not self.__b_sparse and m_x.dtype == np.float32
+        self.__v_y = np.asarray(v_y, dtype=np.float64)
+        # Buffers reused by every evaluation
+        self.__v_z = np.empty(m_x.shape[0])
+        self.__v_softplus = np.empty(m_x.shape[0])
+        self.__v_p = np.empty(m_x.shape[0])
+        self.__v_gradient = np.empty(m_x.shape[1])
+        self.__s_log_likelihood = None
+
+    def evaluate(self, v_beta):
+        """
+        Calculate the predicted probabilities, log-likelihood and gradient at
+        v_beta in a single pass. The log-likelihood is calculated as
+        sum(y * z - log(1 + exp(z))), which is stable for large |z|.
+
+        Args:
+            v_beta (np.array): Vector containing parameters to estimate.
+
+        Returns:
+            float: Log-likelihood for the model.
+        """
+        v_z = self.__v_z
+        v_softplus = self.__v_softplus
+        v_p = self.__v_p
+        v_beta = np.asarray(v_beta, dtype=np.float64)
+        with timed_phase(self.__recorder, "linear_predictor"):
+            self.__multiply(v_beta, v_z)
+        with timed_phase(self.__recorder, "likelihood"):
+            # log(1 + exp(z))
+            np.logaddexp(0, v_z, out=v_softplus)
+            self.__s_log_likelihood = float(
+                self.__v_y @ v_z - np.sum(v_softplus))
+        with timed_phase(self.__recorder, "sigmoid"):
+            # p = exp(z - log(1 + exp(z))), i.e. the sigmoid of z
+            np.subtract(v_z, v_softplus, out=v_p)
+            np.exp(v_p, out=v_p)
+        with timed_phase(self.__recorder, "gradient"):
+            # Gradient X^T (y - p), reusing the softplus buffer for the
+            # residual
+            np.subtract(self.__v_y, v_p, out=v_softplus)
+            self.__multiply_transpose(v_softplus, self.__v_gradient)
+        return self.__s_log_likelihood
+
+    def evaluate_batch(self, m_beta):
+        """
+        Calculate the log-likelihood for each row of m_beta with one matrix
+        multiplication, without touching the single-evaluation buffers.
+
+        Args:
+            m_beta (np.array): Matrix where each row is a parameter vector.
+
+        Returns:
+            np.array: Log-likelihood vector.
+        """
+        m_z = self.__multiply(m_beta.T)
+        return self.__v_y @ m_z - np.sum(np.logaddexp(0, m_z), axis=0)
+
+    def evaluate_batch_gradient(self, m_beta):
+        """
+        Calculate the log-likelihood and gradient for each row of m_beta,
+        sharing the linear predictor between them, without touching the
+        single-evaluation buffers.
+
+        Args:
+            m_beta (np.array): Matrix where each row is a parameter vector.
+
+        Returns:
+            list: Log-likelihood vector and matrix where each row is the
+                  gradient at the corresponding row of m_beta.
+        """
+        m_z = self.__multiply(m_beta.T)
+        m_softplus = np.logaddexp(0, m_z)
+        v_log_likelihood = self.__v_y @ m_z - np.sum(m_softplus, axis=0)
+        # Residuals y - p, one column per parameter vector
+        m_residual = self.__v_y[:, np.newaxis] - np.exp(m_z - m_softplus)
+        m_gradient = self.__multiply_transpose(m_residual).T
+        return [v_log_likelihood, m_gradient]
+
+    def calculate_log_likelihood(self):
+        """
+        Returns:
+            float: Log-likelihood from the last evaluation.
+        """
+        return self.__s_log_likelihood
+
+    def predicted_probability(self):
+        """
+        Returns:
+            np.array: Copy of the predicted probabilities from the last
+                      evaluation.
+        """
+        return self.__v_p.copy()
+
+    def gradient(self):
+        """
+        Returns:
+            np.array: Gradient vector from the last evaluation. The buffer is
+                      overwritten by the next evaluation.
+        """
+        return self.__v_gradient
+
+    def negative_hessian(self):
+        """
+        Returns:
+            np.array: Negative Hessian matrix X^T W X from the last
+                      evaluation.
+        """
+        with timed_phase(self.__recorder, "hessian"):
+            v_w = self.__v_p * (1 - self.__v_p)
+            if not self.__b_blocked:
+                return calculate_weighted_gram(self.__m_x, v_w)
+            m_neg_hessian = np.zeros((self.__m_x.shape[1],) * 2)
+            for s_start, m_block in self.__blocks():
+                m_neg_hessian += calculate_weighted_gram(
+                    m_block, v_w[s_start:s_start + m_block.shape[0]])
+            return m_neg_hessian
+
+    def negative_hessian_product(self, v_vector):
+        """
+        Calculate the product of the negative Hessian matrix from the last
+        evaluation with v_vector, X^T (W (X v_vector)), without forming the
+        k x k matrix.
+
+        Args:
+            v_vector (np.array): Vector of size k.
+
+        Returns:
+            np.array: Vector of size k.
+        """
+        v_w = self.__v_p * (1 - self.__v_p)
+        return self.__multiply_transpose(v_w * self.__multiply(v_vector))
+
+    def num_parameters(self):
+        """
+        Returns:
+            int: Number of columns of the design matrix.
+        """
+        return self.__m_x.shape[1]
+
+    def __multiply(self, m_b, out=None):
+        """Helper method. Calculates X m_b in float64.
+
+        Args:
+            m_b (np.array): Vector of size k or k x m matrix.
+            out (np.array, optional): Buffer for the result. Defaults to None.
+
+        Returns:
+            np.array: Vector of size n or n x m matrix.
+        """
+        if out is None:
+            out = np.empty((self.__m_x.shape[0],) + m_b.shape[1:])
+        if self.__b_blocked:
+            for s_start, m_block in self.__blocks():
+                np.matmul(m_block, m_b,
+                          out=out[s_start:s_start + m_block.shape[0]])
+        elif self.__b_sparse:
+            out[:] = self.__m_x @ m_b
+        else:
+            np.matmul(self.__m_x, m_b, out=out)
+        return out
+
+    def __multiply_transpose(self, m_r, out=None):
+        """Helper method. Calculates X^T m_r in float64.
+
+        Args:
+            m_r (np.array): Vector of size n or n x m matrix.
+            out (np.array, optional): Buffer for the result. Defaults to None.
+
+        Returns:
+            np.array: Vector of size k or k x m matrix.
+        """
+        if out is None:
+            out = np.empty((self.__m_x.shape[1],) + m_r.shape[1:])
+        if self.__b_blocked:
+            out[:] = 0
+            for s_start, m_block in self.__blocks():
+                out += m_block.T @ m_r[s_start:s_start + m_block.shape[0]]
+        elif self.__b_sparse:
+            out[:] = self.__m_x.T @ m_r
+        else:
+            np.matmul(self.__m_x.T, m_r, out=out)
+        return out
+
+    def __blocks(self):
+        """Helper method. Yields the float32 design matrix in float64 blocks
+        of at most _BLOCK_ROWS rows.
+
+        Yields:
+            tuple: Index of the first row and the block of rows.
+        """
+        for s_start in range(0, self.__m_x.shape[0], _BLOCK_ROWS):
+            yield s_start, self.__m_x[
+                s_start:s_start + _BLOCK_ROWS].astype(np.float64)
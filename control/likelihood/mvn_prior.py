@@ -0,0 +1,136 @@
+import numpy as np
+from scipy.linalg import cho_solve, solve_triangular
+from control.likelihood.log_likelihood import LogLikelihood
+
+
+class MVNPrior(LogLikelihood):
+    def __init__(self, v_mu, m_sigma=None, m_chol=None) -> None:
+        """
+        Multivariate normal prior distribution with mean vector v_mu and
+        covariance matrix m_sigma. The covariance matrix is factored once
+        with Cholesky decomposition, and the log-determinant and precision
+        matrix are cached, so each evaluation of the log-density and its
+        gradient only needs triangular solves.
+
+        Args:
+            v_mu (np.array): Mean vector of the MVN.
+            m_sigma (np.array, optional): Covariance matrix of the MVN.
+                                          Defaults to None.
+            m_chol (np.array, optional): Lower triangular Cholesky factor of
+                                         the covariance matrix, used instead
+                                         of m_sigma if it is already known.
+                                         Defaults to None.
+        """
+        super().__init__()
+        self.__v_mu = np.asarray(v_mu, dtype=float)
+        # Lower triangular Cholesky factor, m_sigma = L @ L.T
+        if m_chol is None:
+            m_chol = np.linalg.cholesky(m_sigma)
+        self.__m_chol = m_chol
+        s_k = self.__v_mu.shape[0]
+        # log|m_sigma| = 2 * sum(log(diag(L)))
+        s_log_det = 2 * np.sum(np.log(np.diag(self.__m_chol)))
+        self.__s_const = -0.5 * (s_k * np.log(2 * np.pi) + s_log_det)
+        self.__m_precision = None
+        self.__s_log_likelihood = None
+
+    def evaluate(self, v_x):
+        """
+        Calculate the log-likelihood for a single instance of multiple
+        variables.
+
+        Args:
+            v_x (np.array): A set values for variables that follow the MVN.
+
+        Returns:
+            float: Log-likelihood for a single instance of multiple variables.
+        """
+        v_w = solve_triangular(self.__m_chol, v_x - self.__v_mu, lower=True)
+        self.__s_log_likelihood = self.__s_const - 0.5 * (v_w @ v_w)
+        return self.__s_log_likelihood
+
+    def evaluate_batch(self, m_x):
+        """
+        Calculate the log-likelihood for each row of m_x.
+
+        Args:
+            m_x (np.array): Matrix where each row is a set of values for
+                            variables that follow the MVN.
+
+        Returns:
+            np.array: Log-likelihood vector.
+        """
+        m_w = solve_triangular(self.__m_chol, (m_x - self.__v_mu).T,
+                               lower=True)
+        return self.__s_const - 0.5 * np.sum(m_w * m_w, axis=0)
+
+    def calculate_log_likelihood(self):
+        """
+        Returns:
+            float: Log-likelihood from the last evaluation.
+        """
+        return self.__s_log_likelihood
+
+    def gradient(self, v_x):
+        """
+        Calculate the gradient of the log-likelihood, -m_sigma^-1 (v_x - v_mu).
+
+        Args:
+            v_x (np.array): A set values for variables that follow the MVN.
+
+        Returns:
+            np.array: Gradient vector.
+        """
+        return -cho_solve((self.__m_chol, True), v_x - self.__v_mu)
+
+    def gradient_batch(self, m_x):
+        """
+        Calculate the gradient of the log-likelihood for each row of m_x.
+
+        Args:
+            m_x (np.array): Matrix where each row is a set of values for
+                            variables that follow the MVN.
+
+        Returns:
+            np.array: Matrix where each row is a gradient vector.
+        """
+        return -cho_solve((self.__m_chol, True), (m_x - self.__v_mu).T).T
+
+    def precision_product(self, v_x):
+        """
+        Calculate m_sigma^-1 v_x without forming the precision matrix.
+
+        Args:
+            v_x (np.array): Vector of size k.
+
+        Returns:
+            np.array: Vector of size k.
+        """
+        return cho_solve((self.__m_chol, True), v_x)
+
+    def precision(self):
+        """
+        Returns:
+            np.array: Precision matrix m_sigma^-1, calculated on first use.
+        """
+        if self.__m_precision is None:
+            self.__m_precision = cho_solve(
+                (self.__m_chol, True), np.eye(self.__m_chol.shape[0]))
+        return self.__m_precision
+
+    def scale(self, s_scale):
+        """
+        Create the prior with covariance matrix s_scale * m_sigma, reusing
+        the Cholesky factor and, if already calculated, the precision matrix
+        of this prior instead of factoring the covariance matrix again.
+
+        Args:
+            s_scale (float): Positive factor for the covariance matrix.
+
+        Returns:
+            MVNPrior: Prior with the scaled covariance matrix.
+        """
+        prior = MVNPrior(self.__v_mu, m_chol=np.sqrt(s_scale) * self.__m_chol)
+        if self.__m_precision is not None:
+            prior.__m_precision = self.__m_precision / s_scale
+        return prior
@@ -20,8 +20,9 @@ class Sigmoid:
         # Linear combination of pairwise product
         # between IVs obsered value and coefficient
         v_z = m_x @ v_beta
-        # Apply sigmoid function using broadcasting
-        v_predicted_probability = 1 / (1 + np.exp(-v_z))
+        # Apply sigmoid function using broadcasting, in the form
+        # exp(-log(1 + exp(-z))) that does not overflow for large |z|
+        v_predicted_probability = np.exp(-np.logaddexp(0, -v_z))
         return v_predicted_probability
 
     def calculate_predicted_propability(self):
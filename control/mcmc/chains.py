@@ -0,0 +1,209 @@
+import time
+import numpy as np
+from control.mcmc.diagnostics import effective_sample_size, r_hat
+from control.mcmc.running_covariance import RunningCovariance
+
+# Number of iterations of random draws generated at once for each chain
+_RANDOM_BLOCK_SIZE = 1024
+
+
+def spawn_seed_sequences(seed, s_num_chains):
+    """
+    Create one independent SeedSequence per chain.
+
+    Args:
+        seed (int, np.random.SeedSequence or list): Root seed spawned into
+                                                    one SeedSequence per
+                                                    chain, or a list with one
+                                                    SeedSequence per chain.
+        s_num_chains (int): Number of chains.
+
+    Returns:
+        list: SeedSequence of every chain.
+    """
+    if isinstance(seed, (list, tuple)):
+        return list(seed)
+    if isinstance(seed, np.random.SeedSequence):
+        return seed.spawn(s_num_chains)
+    return np.random.SeedSequence(seed).spawn(s_num_chains)
+
+
+def random_draws(seed_sequences, s_k, num_itr):
+    """
+    Generate the standard normal and uniform draws of every iteration from
+    each chain's own generator. The draws are generated in blocks of
+    iterations, and the draws of a chain only depend on its SeedSequence.
+
+    Args:
+        seed_sequences (list): SeedSequence of every chain.
+        s_k (int): Number of parameters.
+        num_itr (int): Number of iterations.
+
+    Yields:
+        tuple: Standard normal draws (n_chains x k) and uniform draws
+               (n_chains) of the iteration, overwritten by later blocks.
+    """
+    generators = [np.random.default_rng(seed_sequence)
+                  for seed_sequence in seed_sequences]
+    normal_draws = np.empty((len(generators), _RANDOM_BLOCK_SIZE, s_k))
+    uniform_draws = np.empty((len(generators), _RANDOM_BLOCK_SIZE))
+    for i in range(num_itr):
+        s_draw = i % _RANDOM_BLOCK_SIZE
+        if s_draw == 0:
+            for c, generator in enumerate(generators):
+                generator.standard_normal((_RANDOM_BLOCK_SIZE, s_k),
+                                          out=normal_draws[c])
+                generator.random(_RANDOM_BLOCK_SIZE, out=uniform_draws[c])
+        yield normal_draws[:, s_draw], uniform_draws[:, s_draw]
+
+
+def num_retained(num_itr, num_burn_in, s_thin):
+    """
+    Returns:
+        int: Number of samples per chain after burn-in and thinning.
+    """
+    return len(range(num_burn_in, num_itr + 1, s_thin))
+
+
+def collect_samples(run, s_num_chains, s_k, num_itr):
+    """
+    Run the chains and keep all samples in memory.
+
+    Args:
+        run (callable): Runs the chains, called with a store function that
+                        takes the sample index (0 for the initial state) and
+                        the current state of every chain (n_chains x k).
+        s_num_chains (int): Number of chains.
+        s_k (int): Number of parameters.
+        num_itr (int): Number of iterations.
+
+    Returns:
+        np.array: Array of all samples (n_chains x (num_itr + 1) x k), the
+                  first sample being the initial state.
+    """
+    samples = np.empty((s_num_chains, num_itr + 1, s_k))
+
+    def store(s_index, current_sample):
+        samples[:, s_index] = current_sample
+
+    run(store)
+    return samples
+
+
+def collect_summary(run, s_num_chains, s_k, num_itr, num_burn_in, s_thin,
+                    valid_samples=None):
+    """
+    Run the chains without keeping the samples in memory. The mean vector
+    and covariance matrix of the (thinned) samples after burn-in are updated
+    online with Welford's algorithm.
+
+    Args:
+        run (callable): Runs the chains, called with a store function as in
+                        collect_samples, and returns the number of accepted
+                        candidates of each chain.
+        s_num_chains (int): Number of chains.
+        s_k (int): Number of parameters.
+        num_itr (int): Number of iterations.
+        num_burn_in (int): Number of burn-in iterations.
+        s_thin (int): Keep every s_thin-th sample after burn-in.
+        valid_samples (np.array, optional): Array (e.g. a memory map) of size
+                                            n_chains x num_retained x k the
+                                            samples after burn-in are written
+                                            to. Defaults to None.
+
+    Returns:
+        list: Mean vector and covariance matrix of the samples after burn-in
+              and acceptance rate of each chain.
+    """
+    moments = RunningCovariance(s_num_chains, s_k)
+
+    def store(s_index, current_sample):
+        s_offset = s_index - num_burn_in
+        if s_offset >= 0 and s_offset % s_thin == 0:
+            if valid_samples is not None:
+                valid_samples[:, moments.count()] = current_sample
+            moments.update(current_sample)
+
+    v_num_accepted = run(store)
+    return [moments.mean(), moments.covariance(),
+            v_num_accepted / max(num_itr, 1)]
+
+
+def collect_chains(sample, sample_summary, s_num_chains, s_k, num_itr,
+                   num_burn_in, b_single_chain, s_thin=1,
+                   b_keep_samples=True, sample_path=None, recorder=None):
+    """
+    Run the chains of a sampler, keeping the samples in memory, writing them
+    to sample_path or only summarizing them online, and calculate the mean
+    vector and covariance matrix of the samples after burn-in. If a recorder
+    is given, the time per step and acceptance rate per chain are stored as
+    summaries, and, when all samples are kept in memory, the effective
+    sample size, R-hat and effective samples per second per parameter.
+
+    Args:
+        sample (callable): Returns the array of all samples, see
+                           collect_samples.
+        sample_summary (callable): Called with the array the samples after
+                                   burn-in are written to (or None), returns
+                                   the output of collect_summary.
+        s_num_chains (int): Number of chains.
+        s_k (int): Number of parameters.
+        num_itr (int): Number of iterations.
+        num_burn_in (int): Number of burn-in iterations.
+        b_single_chain (bool): True=drop the chain axis of the results.
+        s_thin (int, optional): Keep every s_thin-th sample after burn-in.
+                                Defaults to 1.
+        b_keep_samples (bool, optional): True=keep all samples in memory.
+                                         Defaults to True.
+        sample_path (str, optional): Path of a .npy file the samples after
+                                     burn-in are written to through a memory
+                                     map. Defaults to None.
+        recorder (IterationRecorder, optional): Recorder for the summaries.
+                                                Defaults to None.
+
+    Returns:
+        list: Array of all samples, array of (thinned) samples after
+              burn-in, mean vector and covariance matrix of the samples after
+              burn-in, as returned by the samplers' optimize.
+    """
+    b_stream = not b_keep_samples or sample_path is not None
+    s_start = time.perf_counter()
+    if b_stream:
+        samples = None
+        valid_samples = None
+        if sample_path is not None:
+            valid_samples = np.lib.format.open_memmap(
+                sample_path, mode="w+", dtype=np.float64,
+                shape=(s_num_chains,
+                       num_retained(num_itr, num_burn_in, s_thin), s_k))
+        mean, cov, v_acceptance_rate = sample_summary(valid_samples)
+        if valid_samples is not None:
+            valid_samples.flush()
+    else:
+        samples = sample()
+        # Discard the burn-in samples
+        valid_samples = samples[:, num_burn_in::s_thin]
+        # A proposal drawn from a continuous distribution is accepted
+        # exactly when the chain moves
+        v_acceptance_rate = np.mean(np.any(
+            samples[:, 1:] != samples[:, :-1], axis=2), axis=1)
+    s_elapsed = time.perf_counter() - s_start
+    if recorder is not None:
+        recorder.set_summary("time_per_step", s_elapsed / max(num_itr, 1))
+        recorder.set_summary("acceptance_rate", v_acceptance_rate)
+        if samples is not None:
+            v_ess = effective_sample_size(valid_samples)
+            recorder.set_summary("effective_sample_size", v_ess)
+            recorder.set_summary("r_hat", r_hat(valid_samples))
+            recorder.set_summary("ess_per_second", v_ess / s_elapsed)
+    if not b_stream:
+        # Calculate the mean vector
+        mean = np.average(valid_samples, axis=1)
+        # Calculate the covariance matrix of the samples
+        centered = valid_samples - mean[:, np.newaxis]
+        cov = np.einsum("cij,cik->cjk", centered, centered) / (
+            valid_samples.shape[1] - 1)
+    output = [samples, valid_samples, mean, cov]
+    if b_single_chain:
+        return [None if result is None else result[0] for result in output]
+    return output
@@ -0,0 +1,223 @@
+import numpy as np
+from scipy.special import ndtri
+
+
+def autocorrelation(samples):
+    """
+    Calculate the autocorrelation of every parameter of a chain at all lags
+    with the fast Fourier transform, in O(N log N) instead of O(N^2).
+
+    Args:
+        samples (np.array): Samples of one chain (N x k), or of several
+                            chains (C x N x k).
+
+    Returns:
+        np.array: Autocorrelations with the same shape as samples, lag 0
+                  first.
+    """
+    m_acov = _autocovariance(samples)
+    v_var = np.take(m_acov, [0], axis=-2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(v_var > 0, m_acov / v_var, 0.0)
+
+
+def effective_sample_size(samples):
+    """
+    Calculate the effective sample size of every parameter with Geyer's
+    initial monotone sequence estimator. For several chains, the
+    autocorrelations of the chains are combined with the between-chain
+    variance, so that chains which have not mixed lower the effective sample
+    size.
+
+    Args:
+        samples (np.array): Samples of one chain (N x k), or of several
+                            chains (C x N x k).
+
+    Returns:
+        np.array: Effective sample size of every parameter.
+    """
+    return _effective_sample_size(_as_chains(samples))
+
+
+def bulk_effective_sample_size(samples):
+    """
+    Calculate the bulk effective sample size of every parameter, i.e. the
+    effective sample size of the rank-normalized split chains, which is
+    reliable for estimates of the center of the posterior distribution even
+    with heavy tails (Vehtari et al., 2021).
+
+    Args:
+        samples (np.array): Samples of one chain (N x k), or of several
+                            chains (C x N x k).
+
+    Returns:
+        np.array: Bulk effective sample size of every parameter.
+    """
+    return _effective_sample_size(_rank_normalize(
+        _split_chains(_as_chains(samples))))
+
+
+def tail_effective_sample_size(samples):
+    """
+    Calculate the tail effective sample size of every parameter, i.e. the
+    minimum of the effective sample sizes of the indicators of the 5% and
+    95% quantiles over the split chains, which is relevant for estimates of
+    posterior intervals (Vehtari et al., 2021).
+
+    Args:
+        samples (np.array): Samples of one chain (N x k), or of several
+                            chains (C x N x k).
+
+    Returns:
+        np.array: Tail effective sample size of every parameter.
+    """
+    chains = _split_chains(_as_chains(samples))
+    m_quantiles = np.quantile(chains, [0.05, 0.95], axis=(0, 1))
+    return np.minimum(
+        _effective_sample_size((chains <= m_quantiles[0]).astype(float)),
+        _effective_sample_size((chains <= m_quantiles[1]).astype(float)))
+
+
+def r_hat(samples):
+    """
+    Calculate the rank-normalized split R-hat of every parameter, the
+    maximum of the split R-hat of the rank-normalized samples and of the
+    rank-normalized absolute deviations from the median, which also detects
+    chains that differ in scale (Vehtari et al., 2021). Values close to 1
+    (e.g. below 1.01) indicate that the chains have mixed.
+
+    Args:
+        samples (np.array): Samples of one chain (N x k), or of several
+                            chains (C x N x k).
+
+    Returns:
+        np.array: R-hat of every parameter.
+    """
+    chains = _split_chains(_as_chains(samples))
+    m_folded = np.abs(chains - np.median(chains, axis=(0, 1)))
+    return np.maximum(_r_hat(_rank_normalize(chains)),
+                      _r_hat(_rank_normalize(m_folded)))
+
+
+def _as_chains(samples):
+    """
+    Returns:
+        np.array: Samples as a float array with a chain axis (C x N x k).
+    """
+    samples = np.asarray(samples, dtype=float)
+    if samples.ndim == 2:
+        samples = samples[np.newaxis]
+    return samples
+
+
+def _split_chains(chains):
+    """
+    Split every chain into its first and second half, dropping the middle
+    sample of chains of odd length, so that trends within a chain show up
+    as differences between chains.
+
+    Returns:
+        np.array: Split chains (2C x N // 2 x k).
+    """
+    s_half = chains.shape[1] // 2
+    return np.concatenate([chains[:, :s_half], chains[:, -s_half:]])
+
+
+def _rank_normalize(chains):
+    """
+    Replace every sample by the normal quantile of its rank among all
+    samples of the same parameter.
+
+    Returns:
+        np.array: Rank-normalized chains with the shape of chains.
+    """
+    s_num_chains, s_n, s_k = chains.shape
+    m_rank = _average_rank(chains.reshape(-1, s_k))
+    s_total = s_num_chains * s_n
+    return ndtri((m_rank - 0.375) / (s_total + 0.25)).reshape(chains.shape)
+
+
+def _average_rank(m_x):
+    """
+    Rank every column of m_x, starting at 1, giving tied values (e.g. the
+    repeated states of rejected proposals) the average of their ranks.
+
+    Returns:
+        np.array: Ranks with the shape of m_x.
+    """
+    s_n = m_x.shape[0]
+    m_order = np.argsort(m_x, axis=0)
+    m_sorted = np.take_along_axis(m_x, m_order, axis=0)
+    # First and last sorted position of the group of ties of every value
+    m_new = np.ones(m_sorted.shape, dtype=bool)
+    m_new[1:] = m_sorted[1:] != m_sorted[:-1]
+    m_end = np.ones(m_sorted.shape, dtype=bool)
+    m_end[:-1] = m_new[1:]
+    v_index = np.arange(s_n)[:, np.newaxis]
+    m_first = np.maximum.accumulate(np.where(m_new, v_index, 0), axis=0)
+    m_last = np.minimum.accumulate(
+        np.where(m_end, v_index, s_n)[::-1], axis=0)[::-1]
+    m_rank = np.empty(m_sorted.shape)
+    np.put_along_axis(m_rank, m_order, (m_first + m_last) / 2 + 1, axis=0)
+    return m_rank
+
+
+def _autocovariance(samples):
+    """
+    Calculate the (biased) autocovariance of every parameter of every chain
+    at all lags with the fast Fourier transform.
+
+    Returns:
+        np.array: Autocovariances with the same shape as samples, lag 0
+                  first.
+    """
+    samples = np.asarray(samples, dtype=float)
+    s_n = samples.shape[-2]
+    centered = samples - np.mean(samples, axis=-2, keepdims=True)
+    # Zero-pad to a power of two of at least 2N to avoid circular wrap-around
+    s_size = 1 << int(np.ceil(np.log2(2 * s_n)))
+    m_f = np.fft.rfft(centered, n=s_size, axis=-2)
+    m_acov = np.fft.irfft(m_f * np.conj(m_f), n=s_size, axis=-2)
+    return np.take(m_acov, np.arange(s_n), axis=-2) / s_n
+
+
+def _r_hat(chains):
+    """
+    Returns:
+        np.array: Split R-hat of every parameter of the given chains.
+    """
+    s_n = chains.shape[1]
+    s_between = s_n * np.var(np.mean(chains, axis=1), axis=0, ddof=1)
+    s_within = np.mean(np.var(chains, axis=1, ddof=1), axis=0)
+    s_var_plus = (s_n - 1) / s_n * s_within + s_between / s_n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(s_var_plus / s_within)
+
+
+def _effective_sample_size(chains):
+    """
+    Returns:
+        np.array: Effective sample size of every parameter of the given
+                  chains, NaN for parameters without variance.
+    """
+    s_num_chains, s_n, _ = chains.shape
+    m_acov = _autocovariance(chains)
+    v_within = np.mean(m_acov[:, 0], axis=0) * s_n / (s_n - 1)
+    v_var_plus = v_within * (s_n - 1) / s_n
+    if s_num_chains > 1:
+        v_var_plus = v_var_plus + np.var(np.mean(chains, axis=1), axis=0,
+                                         ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Combined autocorrelation of all chains at every lag (N x k)
+        m_rho = 1 - (v_within - np.mean(m_acov, axis=0)) / v_var_plus
+        # Sums of consecutive pairs of autocorrelations, truncated at the
+        # first negative pair and made monotone
+        s_num_pairs = s_n // 2
+        m_pairs = m_rho[0:2 * s_num_pairs:2] + m_rho[1:2 * s_num_pairs:2]
+        m_positive = np.cumprod(m_pairs > 0, axis=0).astype(bool)
+        m_pairs = np.minimum.accumulate(
+            np.where(m_positive, m_pairs, 0.0), axis=0)
+        v_tau = -1 + 2 * np.sum(m_pairs, axis=0)
+        s_total = s_num_chains * s_n
+        v_tau = np.maximum(v_tau, 1.0 / np.log10(max(s_total, 10)))
+        return np.where(v_var_plus > 0, s_total / v_tau, np.nan)
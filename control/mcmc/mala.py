@@ -0,0 +1,257 @@
+import numpy as np
+from scipy import sparse
+from control.instrumentation.iteration_recorder import timed_phase
+from control.likelihood.logistic_objective import LogisticObjective
+from control.likelihood.mvn_prior import MVNPrior
+from control.mcmc.chains import collect_chains, collect_samples, \
+    collect_summary, random_draws, spawn_seed_sequences
+
+# Acceptance rate the step size is tuned towards during burn-in, optimal for
+# MALA on Gaussian targets (Roberts and Rosenthal, 1998)
+_TARGET_ACCEPTANCE_RATE = 0.574
+# Decay of the step size adaptation gain, gain of iteration t is
+# 1 / (t + 1)^_ADAPTATION_DECAY
+_ADAPTATION_DECAY = 0.6
+
+
+class MALA:
+    def __init__(self, v_y, m_x, starting_mean, prior_mean, prior_sigma,
+                 s_step_size, num_itr, num_burn_in, n_chains=None, seed=None,
+                 b_adaptive=True, s_thin=1, b_keep_samples=True,
+                 sample_path=None, recorder=None):
+        """
+        User interface that carry out the Metropolis-adjusted Langevin
+        algorithm to sample the posterior distribution of the logistic
+        regression coefficients. Candidates are drawn around a gradient step,
+        x + (s_step_size^2 / 2) grad log p(x) + s_step_size z, using the
+        analytic gradient of the log-likelihood and the prior, so far fewer
+        iterations are needed for the same effective sample size than with a
+        random-walk proposal.
+
+        Args:
+            v_y (np.array): Dependent variable, used to calcualte likelihood.
+            m_x (np.array or scipy.sparse matrix): Independent variable(s),
+                            used to calcualte likelihood.
+            starting_mean (np.array): Initial state of the markov chain. Either
+                                      a single state shared by all chains or
+                                      one state per chain (n_chains x k).
+            prior_mean (np.array): Mean for prior distribution.
+            prior_sigma (np.array): Covariance matrix for prior distribution.
+            s_step_size (float): Initial step size of the Langevin proposal.
+            num_itr (int): Number of total iterations of sampling.
+            num_burn_in (int): Number of burn-in iterations of sampling.
+            n_chains (int, optional): Number of chains run in lockstep. None
+                                      runs a single chain and returns results
+                                      without the chain axis. Defaults to
+                                      None.
+            seed (int, np.random.SeedSequence or list, optional): Root seed
+                                    spawned into one independent
+                                    SeedSequence per chain, or a list with
+                                    one SeedSequence per chain. Defaults to
+                                    None.
+            b_adaptive (bool, optional): True=tune the step size of each
+                                    chain during burn-in towards an
+                                    acceptance rate of 0.574. The step size is
+                                    fixed after burn-in. Defaults to True.
+            s_thin (int, optional): Keep every s_thin-th sample after
+                                    burn-in. Defaults to 1.
+            b_keep_samples (bool, optional): True=keep all samples in memory.
+                                    False=only calculate the mean vector and
+                                    covariance matrix of the samples after
+                                    burn-in online (Welford), so that memory
+                                    does not grow with num_itr. Defaults to
+                                    True.
+            sample_path (str, optional): Path of a .npy file the samples after
+                                    burn-in are written to through a memory
+                                    map, instead of keeping them in memory.
+                                    The mean vector and covariance matrix are
+                                    calculated online. Defaults to None.
+            recorder (IterationRecorder, optional): Recorder for the
+                                    acceptance rate and final step size per
+                                    chain, the time per step of the run, the
+                                    fraction of chains accepting at every
+                                    iteration and the time spent in the
+                                    proposal, likelihood and acceptance
+                                    phases. When all samples are kept in
+                                    memory, also the effective sample size,
+                                    R-hat and effective samples per second
+                                    per parameter of the valid samples.
+                                    Defaults to None.
+        """
+        self.__v_y = np.asarray(v_y)
+        self.__m_x = m_x if sparse.issparse(m_x) else np.asarray(m_x)
+        self.__starting_mean = np.asarray(starting_mean, dtype=float)
+        self.__s_step_size = s_step_size
+        self.__num_itr = num_itr
+        self.__num_burn_in = num_burn_in
+        self.__n_chains = n_chains
+        self.__b_adaptive = b_adaptive
+        self.__s_thin = s_thin
+        self.__b_keep_samples = b_keep_samples
+        self.__sample_path = sample_path
+        self.__recorder = recorder
+        self.__seed_sequences = spawn_seed_sequences(
+            seed, 1 if n_chains is None else n_chains)
+        self.__objective = LogisticObjective(self.__v_y, self.__m_x)
+        self.__prior = MVNPrior(prior_mean, prior_sigma)
+        self.__v_step_size = None
+
+    def optimize(self):
+        """
+        User interface that carry out the Metropolis-adjusted Langevin
+        algorithm to sample the posterior distribution of the logistic
+        regression coefficients.
+
+        Returns:
+            list: Array of all samples (n_chains x (num_itr + 1) x k, the
+                  first sample being the initial state), array of (thinned)
+                  samples after burn-in, mean vector and covariance matrix of
+                  the samples after burn-in for each chain. The chain axis is
+                  dropped if n_chains is None. The array of all samples is
+                  None unless b_keep_samples is True and sample_path is None;
+                  the samples after burn-in are then a memory map of
+                  sample_path, or None without sample_path.
+        """
+        if self.__recorder is not None:
+            self.__recorder.start()
+        output = collect_chains(
+            self.sample, self.sample_summary, len(self.__seed_sequences),
+            self.__starting_mean.shape[-1], self.__num_itr,
+            self.__num_burn_in, self.__n_chains is None, self.__s_thin,
+            self.__b_keep_samples, self.__sample_path, self.__recorder)
+        if self.__recorder is not None:
+            self.__recorder.set_summary("step_size", self.__v_step_size)
+        return output
+
+    def sample(self):
+        """
+        Run all chains in this process and keep all samples in memory.
+
+        Returns:
+            np.array: Array of all samples (n_chains x (num_itr + 1) x k), the
+                      first sample being the initial state.
+        """
+        return collect_samples(self.__run, len(self.__seed_sequences),
+                               self.__starting_mean.shape[-1],
+                               self.__num_itr)
+
+    def sample_summary(self, valid_samples=None):
+        """
+        Run all chains in this process without keeping the samples in
+        memory. The mean vector and covariance matrix of the (thinned)
+        samples after burn-in are updated online with Welford's algorithm.
+
+        Args:
+            valid_samples (np.array, optional): Array (e.g. a memory map) of
+                                    size n_chains x number of samples after
+                                    burn-in and thinning x k, the samples
+                                    after burn-in are written to. Defaults to
+                                    None.
+
+        Returns:
+            list: Mean vector and covariance matrix of the samples after
+                  burn-in and acceptance rate of each chain.
+        """
+        return collect_summary(self.__run, len(self.__seed_sequences),
+                               self.__starting_mean.shape[-1],
+                               self.__num_itr, self.__num_burn_in,
+                               self.__s_thin, valid_samples)
+
+    def __run(self, store):
+        """Helper method. Runs all chains in this process and passes the
+        state of every chain after every iteration to store. The chains are
+        advanced together: the log-likelihoods and gradients of the
+        candidates of every chain are calculated with one pair of matrix
+        multiplications per iteration, and the log-likelihood and gradient of
+        the current states are carried forward from the last accept or
+        reject.
+
+        Args:
+            store (callable): Called with the sample index (0 for the initial
+                              state) and the current state of every chain
+                              (n_chains x k), which is overwritten
+                              afterwards.
+
+        Returns:
+            np.array: Number of accepted candidates of each chain.
+        """
+        s_num_chains = len(self.__seed_sequences)
+        s_k = self.__starting_mean.shape[-1]
+        current_sample = np.array(np.broadcast_to(
+            self.__starting_mean, (s_num_chains, s_k)))
+        store(0, current_sample)
+        current_log_likelihood, current_gradient = \
+            self.__calculate_log_likelihood(current_sample)
+        # Step size of each chain, adapted on the log scale
+        v_log_step_size = np.full(s_num_chains, np.log(self.__s_step_size))
+        v_step_size = np.exp(v_log_step_size)
+        s_num_adapt = self.__num_burn_in if self.__b_adaptive else 0
+        v_num_accepted = np.zeros(s_num_chains, dtype=np.int64)
+        recorder = self.__recorder
+        draws = random_draws(self.__seed_sequences, s_k, self.__num_itr)
+        for i, (normal_draw, uniform_draw) in enumerate(draws):
+            v_step = v_step_size[:, np.newaxis]
+            # Langevin step from the current state of each chain
+            with timed_phase(recorder, "proposal"):
+                candidate = current_sample + 0.5 * v_step ** 2 * \
+                    current_gradient + v_step * normal_draw
+            # Calculate the candidates' log-likelihood and gradient
+            with timed_phase(recorder, "likelihood"):
+                candidate_log_likelihood, candidate_gradient = \
+                    self.__calculate_log_likelihood(candidate)
+            with timed_phase(recorder, "accept"):
+                # The Langevin proposal is not symmetric, so the ratio of the
+                # reverse and forward proposal densities enters the
+                # acceptance probability
+                acceptance_probability = \
+                    self.__calculate_acceptance_probability(
+                        current_sample, current_log_likelihood,
+                        current_gradient, candidate, candidate_log_likelihood,
+                        candidate_gradient, v_step)
+                accepted = uniform_draw <= acceptance_probability
+                current_sample[accepted] = candidate[accepted]
+                current_log_likelihood[accepted] = candidate_log_likelihood[
+                    accepted]
+                current_gradient[accepted] = candidate_gradient[accepted]
+            v_num_accepted += accepted
+            store(i + 1, current_sample)
+            if i < s_num_adapt:
+                # Robbins-Monro update towards the target acceptance rate
+                v_log_step_size += (acceptance_probability -
+                                    _TARGET_ACCEPTANCE_RATE) / (
+                    i + 1) ** _ADAPTATION_DECAY
+                v_step_size = np.exp(v_log_step_size)
+            if recorder is not None:
+                recorder.record(i, acceptance_rate=np.mean(accepted))
+        self.__v_step_size = v_step_size
+        return v_num_accepted
+
+    def __calculate_log_likelihood(self, samples):
+        logisticLogLikelihood, logisticGradient = \
+            self.__objective.evaluate_batch_gradient(samples)
+        mvnLogLikelihood = self.__prior.evaluate_batch(samples)
+        mvnGradient = self.__prior.gradient_batch(samples)
+        return (logisticLogLikelihood + mvnLogLikelihood,
+                logisticGradient + mvnGradient)
+
+    def __calculate_acceptance_probability(
+            self, current_sample, current_log_likelihood, current_gradient,
+            candidate, candidate_log_likelihood, candidate_gradient, v_step):
+        """Helper method. Calculates the Metropolis-Hastings acceptance
+        probability of the Langevin proposal of every chain.
+
+        Returns:
+            np.array: Acceptance probability of every chain.
+        """
+        v_step_squared = v_step[:, 0] ** 2
+        # log q(current | candidate) - log q(candidate | current)
+        forward = candidate - current_sample - 0.5 * v_step ** 2 * \
+            current_gradient
+        reverse = current_sample - candidate - 0.5 * v_step ** 2 * \
+            candidate_gradient
+        v_log_ratio = (np.sum(forward * forward, axis=1) -
+                       np.sum(reverse * reverse, axis=1)) / (
+            2 * v_step_squared)
+        return np.exp(np.minimum(
+            0, candidate_log_likelihood - current_log_likelihood +
+            v_log_ratio))
@@ -1,38 +1,141 @@
 import numpy as np
-from control.likelihood.logistic_log_likelihood import LogisticLogLikelihood
-from control.likelihood.mvn_log_likelihood import MVNLogLikelihood
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from scipy import sparse
+from control.instrumentation.iteration_recorder import timed_phase
+from control.likelihood.logistic_objective import LogisticObjective
+from control.likelihood.mvn_prior import MVNPrior
+from control.mcmc.chains import collect_chains, collect_samples, \
+    collect_summary, random_draws, spawn_seed_sequences
+from control.mcmc.running_covariance import RunningCovariance
+
+# Scale of the adaptive proposal covariance is 2.38^2 / k times the sample
+# covariance, optimal for Gaussian targets (Gelman, Roberts and Gilks, 1996)
+_ADAPTIVE_SCALE = 2.38 ** 2
+# The sample covariance of a window of n samples is shrunk to
+# n / (n + _ADAPTIVE_SHRINKAGE) cov + _ADAPTIVE_EPSILON
+# _ADAPTIVE_SHRINKAGE / (n + _ADAPTIVE_SHRINKAGE) I
+_ADAPTIVE_SHRINKAGE = 5
+_ADAPTIVE_EPSILON = 1e-3
+# Acceptance rate the proposal scale is tuned towards during burn-in, optimal
+# for random-walk proposals in many dimensions (Roberts, Gelman and Gilks,
+# 1997), and decay of the adaptation gain, the gain of iteration t is
+# 1 / (t + 1)^_ADAPTATION_DECAY
+_TARGET_ACCEPTANCE_RATE = 0.234
+_ADAPTATION_DECAY = 0.6
 
 
 class Metropolis:
     def __init__(self, v_y, m_x, starting_mean, prior_mean, prior_sigma,
-                 proposal_sigma, num_itr, num_burn_in):
+                 proposal_sigma, num_itr, num_burn_in, n_chains=None,
+                 n_jobs=None, seed=None, b_adaptive=False,
+                 s_adapt_window=50, s_thin=1, b_keep_samples=True,
+                 sample_path=None, recorder=None):
         """
         User interface that carry out Metropolis algorithm to estimate the
         prior distribution of the logsitic regression coefficients.
 
         Args:
             v_y (np.array): Dependent variable, used to calcualte likelihood.
-            m_x (np.array): Independent variable(s), used to calcualte
-                            likelihood.
-            starting_mean (np.array): Initial state of the markov chain.
+            m_x (np.array or scipy.sparse matrix): Independent variable(s),
+                            used to calcualte likelihood.
+            starting_mean (np.array): Initial state of the markov chain. Either
+                                      a single state shared by all chains or
+                                      one state per chain (n_chains x k).
             prior_mean (np.array): Mean for prior distribution.
             prior_sigma (np.array): Covariance matrix for prior distribution.
             proposal_sigma (np.array): Covariance matrix for proposal
                                        distribution.
             num_itr (int): Number of total iterations of sampling.
             num_burn_in (int): Number of burn-in iterations of sampling.
-            discard (bool, optional): True=return all samples. False=return
-                                      valid
-            samples. Defaults to True.
+            n_chains (int, optional): Number of chains run in lockstep. None
+                                      runs a single chain and returns results
+                                      without the chain axis. Defaults to
+                                      None.
+            n_jobs (int, optional): Number of worker processes the chains are
+                                    split across. The design matrix is shared
+                                    with the workers through shared memory.
+                                    None runs all chains in this process.
+                                    Defaults to None.
+            seed (int, np.random.SeedSequence or list, optional): Root seed
+                                    spawned into one independent
+                                    SeedSequence per chain, or a list with
+                                    one SeedSequence per chain. The samples
+                                    of a chain only depend on its own
+                                    SeedSequence, not on n_jobs or the other
+                                    chains, also in adaptive mode. Defaults
+                                    to None.
+            b_adaptive (bool, optional): True=tune the proposal of each chain
+                                    during burn-in: its covariance to
+                                    2.38^2 / k times the covariance of the
+                                    recent samples of the chain, and its
+                                    scale towards an acceptance rate of
+                                    0.234 (adaptive Metropolis). The proposal
+                                    is fixed after burn-in, so the valid
+                                    samples come from a proper Markov chain.
+                                    Defaults to False.
+            s_adapt_window (int, optional): Number of burn-in iterations
+                                    between updates of the adaptive proposal
+                                    covariance. The covariance is estimated
+                                    from the samples since the start of the
+                                    current adaptation window; the first
+                                    window is s_adapt_window iterations long
+                                    and every window is twice as long as the
+                                    previous one, so the early samples far
+                                    from the posterior are forgotten.
+                                    Defaults to 50.
+            s_thin (int, optional): Keep every s_thin-th sample after
+                                    burn-in. Defaults to 1.
+            b_keep_samples (bool, optional): True=keep all samples in memory.
+                                    False=only calculate the mean vector and
+                                    covariance matrix of the samples after
+                                    burn-in online (Welford), so that memory
+                                    does not grow with num_itr. Defaults to
+                                    True.
+            sample_path (str, optional): Path of a .npy file the samples after
+                                    burn-in are written to through a memory
+                                    map, instead of keeping them in memory.
+                                    The mean vector and covariance matrix are
+                                    calculated online. Defaults to None.
+            recorder (IterationRecorder, optional): Recorder for the time
+                                                    per step of the run and
+                                                    the acceptance rate per
+                                                    chain. When all samples
+                                                    are kept in memory, it
+                                                    also receives the
+                                                    effective sample size,
+                                                    R-hat and effective
+                                                    samples per second per
+                                                    parameter of the valid
+                                                    samples. When sampling in
+                                                    this process, it also
+                                                    records the fraction of
+                                                    chains accepting at every
+                                                    iteration and the time
+                                                    spent in the proposal,
+                                                    likelihood and acceptance
+                                                    phases. Defaults to None.
         """
-        self.__v_y = v_y
-        self.__m_x = m_x
-        self.__starting_mean = starting_mean
+        self.__v_y = np.asarray(v_y)
+        self.__m_x = m_x if sparse.issparse(m_x) else np.asarray(m_x)
+        self.__starting_mean = np.asarray(starting_mean, dtype=float)
         self.__prior_mean = prior_mean
         self.__prior_sigma = prior_sigma
         self.__proposal_sigma = proposal_sigma
         self.__num_itr = num_itr
         self.__num_burn_in = num_burn_in
+        self.__n_chains = n_chains
+        self.__n_jobs = n_jobs
+        self.__b_adaptive = b_adaptive
+        self.__s_adapt_window = s_adapt_window
+        self.__s_thin = s_thin
+        self.__b_keep_samples = b_keep_samples
+        self.__sample_path = sample_path
+        self.__recorder = recorder
+        self.__seed_sequences = spawn_seed_sequences(
+            seed, 1 if n_chains is None else n_chains)
+        self.__objective = LogisticObjective(self.__v_y, self.__m_x)
+        self.__prior = MVNPrior(prior_mean, prior_sigma)
 
     def optimize(self):
         """
@@ -40,58 +143,313 @@ class Metropolis:
         prior distribution of the logsitic regression coefficients.
 
         Returns:
-            list: List of sample points from the stationary distribution of the
-            markov chain.
+            list: Array of all samples (n_chains x (num_itr + 1) x k, the
+                  first sample being the initial state), array of (thinned)
+                  samples after burn-in, mean vector and covariance matrix of
+                  the samples after burn-in for each chain. The chain axis is
+                  dropped if n_chains is None. The array of all samples is
+                  None unless b_keep_samples is True and sample_path is None;
+                  the samples after burn-in are then a memory map of
+                  sample_path, or None without sample_path.
+        """
+        if self.__recorder is not None:
+            self.__recorder.start()
+        b_parallel = self.__n_jobs is not None and self.__n_jobs > 1
+
+        def sample():
+            if b_parallel:
+                return self.__sample_in_parallel(b_summary=False)
+            return self.sample()
+
+        def sample_summary(valid_samples):
+            if b_parallel:
+                return self.__sample_in_parallel(b_summary=True)
+            return self.sample_summary(valid_samples)
+
+        return collect_chains(
+            sample, sample_summary, len(self.__seed_sequences),
+            self.__starting_mean.shape[-1], self.__num_itr,
+            self.__num_burn_in, self.__n_chains is None, self.__s_thin,
+            self.__b_keep_samples, self.__sample_path, self.__recorder)
+
+    def sample(self):
+        """
+        Run all chains in this process and keep all samples in memory.
+
+        Returns:
+            np.array: Array of all samples (n_chains x (num_itr + 1) x k), the
+                      first sample being the initial state.
+        """
+        return collect_samples(self.__run, len(self.__seed_sequences),
+                               self.__starting_mean.shape[-1],
+                               self.__num_itr)
+
+    def sample_summary(self, valid_samples=None):
+        """
+        Run all chains in this process without keeping the samples in
+        memory. The mean vector and covariance matrix of the (thinned)
+        samples after burn-in are updated online with Welford's algorithm.
+
+        Args:
+            valid_samples (np.array, optional): Array (e.g. a memory map) of
+                                    size n_chains x number of samples after
+                                    burn-in and thinning x k, the samples
+                                    after burn-in are written to. Defaults to
+                                    None.
+
+        Returns:
+            list: Mean vector and covariance matrix of the samples after
+                  burn-in and acceptance rate of each chain.
+        """
+        return collect_summary(self.__run, len(self.__seed_sequences),
+                               self.__starting_mean.shape[-1],
+                               self.__num_itr, self.__num_burn_in,
+                               self.__s_thin, valid_samples)
+
+    def __run(self, store):
+        """Helper method. Runs all chains in this process and passes the
+        state of every chain after every iteration to store. The chains are
+        advanced together: the candidates of every chain are drawn from a
+        proposal covariance factored once, and their log-likelihoods are
+        calculated with a single matrix multiplication per iteration. In
+        adaptive mode, the running covariance of every chain is updated
+        during burn-in, the proposal of the chain is factored again every
+        s_adapt_window iterations and its scale is adapted at every
+        iteration.
+
+        Args:
+            store (callable): Called with the sample index (0 for the initial
+                              state) and the current state of every chain
+                              (n_chains x k), which is overwritten
+                              afterwards.
+
+        Returns:
+            np.array: Number of accepted candidates of each chain.
+        """
+        s_num_chains = len(self.__seed_sequences)
+        s_k = self.__starting_mean.shape[-1]
+        current_sample = np.array(np.broadcast_to(
+            self.__starting_mean, (s_num_chains, s_k)))
+        store(0, current_sample)
+        # Calcualte the inital log-likelihood, which is the sum of the
+        # log-likelihood of the data distribution and the log-likelihood
+        # of the prior distribution. It is carried forward afterwards, since
+        # it is already known from the last accept or reject
+        current_log_likelihood = self.__calculate_log_likelihood(
+            current_sample)
+        # Cholesky factor of the proposal covariance of each chain
+        proposal_chol = np.array(np.broadcast_to(
+            np.linalg.cholesky(self.__proposal_sigma),
+            (s_num_chains, s_k, s_k)))
+        s_num_adapt = self.__num_burn_in if self.__b_adaptive else 0
+        window_moments = RunningCovariance(s_num_chains, s_k)
+        s_window = self.__s_adapt_window
+        # Global scale of the proposal of each chain, adapted on the log scale
+        v_log_scale = np.zeros(s_num_chains)
+        v_num_accepted = np.zeros(s_num_chains, dtype=np.int64)
+        recorder = self.__recorder
+        draws = random_draws(self.__seed_sequences, s_k, self.__num_itr)
+        for i, (normal_draw, uniform_draw) in enumerate(draws):
+            # Randomly choose the next candidate for each Markov Chain. The
+            # product with the Cholesky factor is summed row by row, so that
+            # a chain's candidate does not depend on how many chains are
+            # batched (a batched einsum rounds differently)
+            with timed_phase(recorder, "proposal"):
+                candidate = current_sample + np.exp(v_log_scale)[
+                    :, np.newaxis] * np.sum(
+                    proposal_chol * normal_draw[:, np.newaxis], axis=2)
+            # Calculate the candidates' log-likelihood
+            with timed_phase(recorder, "likelihood"):
+                candidate_log_likelihood = self.__calculate_log_likelihood(
+                    candidate)
+            with timed_phase(recorder, "accept"):
+                # Calculate the acceptance probability based on the
+                # "detailed balance" condition, with the assumption that the
+                # proposal distribution is a symmetric multi-variate normal
+                # distribution
+                acceptance_probability = \
+                    self.__calculate_acceptance_probability(
+                        current_log_likelihood, candidate_log_likelihood)
+                # Update the current parameter to the candidate, if "detailed
+                # balance" condition is reached
+                accepted = self.__update_samples(
+                    acceptance_probability, uniform_draw,
+                    candidate, current_sample)
+                current_log_likelihood[accepted] = candidate_log_likelihood[
+                    accepted]
+            v_num_accepted += accepted
+            store(i + 1, current_sample)
+            if i < s_num_adapt:
+                # Robbins-Monro update of the scale towards the target
+                # acceptance rate, which corrects the size of a covariance
+                # estimated from few, correlated samples. The accept
+                # indicator is used rather than the probability, so that a
+                # tiny change in the likelihood cannot change the proposal
+                v_log_scale += (accepted -
+                                _TARGET_ACCEPTANCE_RATE) / (
+                    i + 1) ** _ADAPTATION_DECAY
+                window_moments.update(current_sample)
+                s_count = window_moments.count()
+                if s_count % self.__s_adapt_window == 0:
+                    self.__adapt_proposal(
+                        proposal_chol, window_moments.covariance(), s_count)
+                if s_count == s_window:
+                    # Start the next, twice as long, window
+                    window_moments.reset()
+                    s_window *= 2
+            if recorder is not None:
+                recorder.record(i, acceptance_rate=np.mean(accepted))
+        return v_num_accepted
+
+    def __sample_in_parallel(self, b_summary):
+        """Helper method. Splits the chains across n_jobs worker processes.
+        The design matrix (or the arrays of a sparse design matrix) is copied
+        once into shared memory instead of being pickled to every worker.
+
+        Args:
+            b_summary (bool): True=the workers only return the online
+                              summaries and write the samples after burn-in
+                              to their chains of sample_path, if given.
+
+        Returns:
+            np.array or list: Array of all samples (n_chains x (num_itr + 1)
+                              x k), or the mean vectors, covariance matrices
+                              and acceptance rates of all chains.
+        """
+        s_num_chains = len(self.__seed_sequences)
+        starting_mean = np.broadcast_to(
+            self.__starting_mean,
+            (s_num_chains, self.__starting_mean.shape[-1]))
+        # A sparse design matrix is shared through its CSR arrays
+        if sparse.issparse(self.__m_x):
+            m_x = self.__m_x.tocsr()
+            arrays = [m_x.data, m_x.indices, m_x.indptr]
+            sparse_shape = m_x.shape
+        else:
+            arrays = [self.__m_x]
+            sparse_shape = None
+        shms = []
+        try:
+            specs = []
+            for array in arrays:
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(array.nbytes, 1))
+                shms.append(shm)
+                np.ndarray(array.shape, array.dtype, buffer=shm.buf)[:] = \
+                    array
+                specs.append((shm.name, array.shape, array.dtype))
+            groups = [group for group in np.array_split(
+                np.arange(s_num_chains), self.__n_jobs) if len(group) > 0]
+            options = {"b_adaptive": self.__b_adaptive,
+                       "s_adapt_window": self.__s_adapt_window,
+                       "s_thin": self.__s_thin}
+            with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+                futures = [executor.submit(
+                    _sample_in_worker, specs, sparse_shape, self.__v_y,
+                    starting_mean[group], self.__prior_mean,
+                    self.__prior_sigma, self.__proposal_sigma,
+                    self.__num_itr, self.__num_burn_in,
+                    [self.__seed_sequences[c] for c in group], options,
+                    b_summary, self.__sample_path, group[0], group[-1] + 1)
+                    for group in groups]
+                results = [future.result() for future in futures]
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+        if b_summary:
+            return [np.concatenate([result[j] for result in results])
+                    for j in range(3)]
+        return np.concatenate(results)
+
+    def __adapt_proposal(self, proposal_chol, m_cov, s_count):
+        """Helper method. Sets the proposal Cholesky factor of every chain
+        in place from its running covariance, shrunk towards a small multiple
+        of the identity matrix so that it stays positive definite when the
+        window has few samples. A chain that has not moved keeps its previous
+        proposal.
+
+        Args:
+            proposal_chol (np.array): proposal Cholesky factor of every chain
+                                      (C x k x k)
+            m_cov (np.array): running covariance of every chain (C x k x k)
+            s_count (int): number of samples in the running covariance
         """
-        samples = [self.__starting_mean]
-        for i in range(self.__num_itr):
-            # Calcualte the inital log-likelihood, which is the sum of the
-            # log-likelihood of the data distribution and the log-likelihood
-            # of the prior distribution based on the current data and the
-            # assumption about the prior distribution
-            current_log_likelihood = self.__calculate_log_likelihood(
-                samples[-1])
-            # Randomly choose the next candidate for the Markov Chain
-            candidate = np.random.multivariate_normal(samples[-1],
-                                                      self.__proposal_sigma)
-            # Calculate the candidate's log-likelihood
-            candidate_log_likelihood = self.__calculate_log_likelihood(
-                candidate)
-            # Calculate the acceptance probability based on the
-            # "detailed balance" condition, with the assumption that the
-            # proposal distribution is a symmetric multi-variate normal
-            # distribution
-            acceptance_probability = self.__calculate_acceptance_probability(
-                current_log_likelihood, candidate_log_likelihood)
-            # Update the current parameter to the candidate, if "detailed
-            # balance" condition is reached
-            samples.append(self.__update_samples(
-                acceptance_probability, candidate, samples[-1]))
-        # Discard the burn-in samples
-        valid_samples = samples[self.__num_burn_in:]
-        # Calculate the mean vector
-        mean = np.average(valid_samples, axis=0)
-        # Calculate the covariance matrix of the samples
-        cov = np.cov(valid_samples, rowvar=False)
-        return [samples, valid_samples, mean, cov]
-
-    def __calculate_log_likelihood(self, sample):
-        logisticLogLikelihood = LogisticLogLikelihood(
-            self.__v_y,
-            self.__m_x,
-            sample).calculate_log_likelihood()
-        mvnLogLikelihood = MVNLogLikelihood(
-            sample,
-            self.__prior_mean,
-            self.__prior_sigma).calculate_log_likelihood()
-        return logisticLogLikelihood + mvnLogLikelihood
+        s_k = proposal_chol.shape[-1]
+        for c in range(proposal_chol.shape[0]):
+            if not np.any(m_cov[c]):
+                continue
+            m_shrunk = s_count / (s_count + _ADAPTIVE_SHRINKAGE) * m_cov[c] + \
+                _ADAPTIVE_EPSILON * _ADAPTIVE_SHRINKAGE / (
+                    s_count + _ADAPTIVE_SHRINKAGE) * np.eye(s_k)
+            try:
+                proposal_chol[c] = np.linalg.cholesky(
+                    _ADAPTIVE_SCALE / s_k * m_shrunk)
+            except np.linalg.LinAlgError:
+                continue
+
+    def __calculate_log_likelihood(self, samples):
+        # Each chain is evaluated on its own, since a batched product
+        # rounds differently for different numbers of chains and the
+        # samples of a chain must not depend on n_jobs
+        v_log_likelihood = np.empty(samples.shape[0])
+        for c in range(samples.shape[0]):
+            v_sample = samples[c:c + 1]
+            v_log_likelihood[c] = (
+                self.__objective.evaluate_batch(v_sample)[0]
+                + self.__prior.evaluate_batch(v_sample)[0])
+        return v_log_likelihood
 
     def __calculate_acceptance_probability(
             self, current_log_likelihood, candidate_log_likelihood):
-        return min(1,
-                   np.exp(candidate_log_likelihood - current_log_likelihood))
+        return np.exp(np.minimum(
+            0, candidate_log_likelihood - current_log_likelihood))
 
     def __update_samples(
-            self, acceptance_probability, candidate, current_sample):
-        u = np.random.uniform(0.0, 1.0)
-        return candidate if u <= acceptance_probability else current_sample
+            self, acceptance_probability, u, candidate, current_sample):
+        accepted = u <= acceptance_probability
+        current_sample[accepted] = candidate[accepted]
+        return accepted
+
+
+def _sample_in_worker(specs, sparse_shape, v_y, starting_mean, prior_mean,
+                      prior_sigma, proposal_sigma, num_itr, num_burn_in,
+                      seed_sequences, options, b_summary, sample_path,
+                      s_first_chain, s_last_chain):
+    """
+    Run a group of chains in a worker process, reading the design matrix from
+    shared memory. With b_summary, the samples after burn-in are written to
+    chains s_first_chain to s_last_chain of sample_path, if given.
+
+    Returns:
+        np.array or list: Array of all samples of the group of chains, or
+                          their mean vectors, covariance matrices and
+                          acceptance rates.
+    """
+    shms = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    try:
+        arrays = [np.ndarray(shape, dtype, buffer=shm.buf)
+                  for shm, (_, shape, dtype) in zip(shms, specs)]
+        if sparse_shape is None:
+            m_x = arrays[0]
+        else:
+            m_x = sparse.csr_matrix(tuple(arrays), shape=sparse_shape)
+        metropolis = Metropolis(
+            v_y, m_x, starting_mean, prior_mean, prior_sigma, proposal_sigma,
+            num_itr, num_burn_in, n_chains=len(seed_sequences),
+            seed=seed_sequences, **options)
+        if not b_summary:
+            result = metropolis.sample()
+        elif sample_path is None:
+            result = metropolis.sample_summary()
+        else:
+            valid_samples = np.load(sample_path, mmap_mode="r+")[
+                s_first_chain:s_last_chain]
+            result = metropolis.sample_summary(valid_samples)
+            valid_samples.flush()
+            del valid_samples
+        del arrays, m_x, metropolis
+    finally:
+        for shm in shms:
+            shm.close()
+    return result
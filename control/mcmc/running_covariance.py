@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class RunningCovariance:
+    def __init__(self, s_num_chains, s_k) -> None:
+        """
+        Running mean vector and covariance matrix of the states of several
+        chains, updated one state per chain at a time with Welford's
+        algorithm, so that memory does not grow with the number of samples.
+
+        Args:
+            s_num_chains (int): Number of chains.
+            s_k (int): Number of parameters.
+        """
+        self.__m_mean = np.zeros((s_num_chains, s_k))
+        # Sum of products of deviations from the running mean
+        self.__m_m2 = np.zeros((s_num_chains, s_k, s_k))
+        self.__s_count = 0
+
+    def update(self, m_sample):
+        """
+        Add one state per chain.
+
+        Args:
+            m_sample (np.array): Current state of every chain (C x k).
+        """
+        self.__s_count += 1
+        m_delta = m_sample - self.__m_mean
+        self.__m_mean += m_delta / self.__s_count
+        self.__m_m2 += np.einsum("ci,cj->cij", m_delta,
+                                 m_sample - self.__m_mean)
+
+    def reset(self):
+        """
+        Forget all states added so far.
+        """
+        self.__m_mean[:] = 0
+        self.__m_m2[:] = 0
+        self.__s_count = 0
+
+    def count(self):
+        """
+        Returns:
+            int: Number of states added per chain.
+        """
+        return self.__s_count
+
+    def mean(self):
+        """
+        Returns:
+            np.array: Copy of the mean vector of every chain (C x k).
+        """
+        return self.__m_mean.copy()
+
+    def covariance(self):
+        """
+        Returns:
+            np.array: Sample covariance matrix of every chain (C x k x k).
+        """
+        return self.__m_m2 / (self.__s_count - 1)
@@ -0,0 +1,135 @@
+import pickle
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from control.likelihood.logistic_objective import LogisticObjective
+
+# Data of the process pool workers, set once per worker by the initializer
+_worker_data = None
+
+
+class KFoldCrossValidation:
+    def __init__(self, v_y, m_x, strategy_factory, s_num_folds=10,
+                 n_jobs=None, executor="thread"):
+        """
+        Run k-fold cross-validation for any estimation strategy that accepts
+        a chunks argument. The folds are contiguous blocks of rows, so the
+        validation set of a fold and the two blocks of rows around it are
+        views of v_y and m_x rather than copies; the training blocks are
+        handed to the strategy as chunks. Shuffle the rows once beforehand if
+        they are ordered.
+
+        Args:
+            v_y (np.array): Vector containing observed values of dependent
+                            variable.
+            m_x (np.array): Design matrix containing observed values of
+                            independent variable.
+            strategy_factory (callable): Function that takes a chunks callable
+                                         and returns an EstimationStrategy,
+                                         e.g. the module-level function
+                                         def newton(chunks): return
+                                         LogisticNewton(None, None, 50,
+                                         1e-8, chunks=chunks). With
+                                         executor="process" it is sent to
+                                         the workers and has to be
+                                         picklable, which rules out lambdas
+                                         and nested functions.
+            s_num_folds (int, optional): Number of folds. Defaults to 10.
+            n_jobs (int, optional): Number of folds fitted concurrently. None
+                                    fits the folds one after another.
+                                    Defaults to None.
+            executor (str, optional): "thread" for a thread pool, which
+                                      shares the data and works well since
+                                      NumPy releases the GIL in matrix
+                                      products, or "process" for a process
+                                      pool, where each worker receives the
+                                      data once. Defaults to "thread".
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(
+                f"executor must be 'thread' or 'process', got {executor!r}.")
+        if executor == "process" and n_jobs is not None and n_jobs > 1:
+            # Fail here rather than in the pool, where a start method other
+            # than fork pickles the factory for every worker
+            try:
+                pickle.dumps(strategy_factory)
+            except (pickle.PicklingError, AttributeError, TypeError) as error:
+                raise ValueError(
+                    "strategy_factory must be picklable with "
+                    "executor='process', use a module-level function "
+                    "instead of a lambda or nested function.") from error
+        self.__v_y = np.asarray(v_y)
+        self.__m_x = m_x
+        self.__strategy_factory = strategy_factory
+        self.__s_num_folds = s_num_folds
+        self.__n_jobs = n_jobs
+        self.__executor = executor
+
+    def validate(self):
+        """
+        Fit the strategy on every training set and evaluate the
+        log-likelihood of the held-out fold.
+
+        Returns:
+            list: Vector of held-out log-likelihoods, vector of fit times in
+                  seconds and matrix of estimates (one row per fold). Folds
+                  whose fit did not converge have NaN log-likelihood and
+                  estimates.
+        """
+        v_bounds = np.linspace(
+            0, self.__m_x.shape[0], self.__s_num_folds + 1).astype(int)
+        folds = list(zip(v_bounds[:-1], v_bounds[1:]))
+        if self.__n_jobs is None or self.__n_jobs <= 1:
+            results = [_validate_fold(
+                self.__v_y, self.__m_x, self.__strategy_factory, s_start,
+                s_stop) for s_start, s_stop in folds]
+        elif self.__executor == "thread":
+            with ThreadPoolExecutor(max_workers=self.__n_jobs) as executor:
+                results = list(executor.map(
+                    lambda fold: _validate_fold(
+                        self.__v_y, self.__m_x, self.__strategy_factory,
+                        *fold), folds))
+        else:
+            with ProcessPoolExecutor(
+                    max_workers=self.__n_jobs, initializer=_init_worker,
+                    initargs=(self.__v_y, self.__m_x,
+                              self.__strategy_factory)) as executor:
+                results = list(executor.map(
+                    _validate_fold_in_worker, *zip(*folds)))
+        v_log_likelihood = np.array([result[0] for result in results])
+        v_fit_time = np.array([result[1] for result in results])
+        m_beta = np.array([result[2] for result in results])
+        return [v_log_likelihood, v_fit_time, m_beta]
+
+
+def _validate_fold(v_y, m_x, strategy_factory, s_start, s_stop):
+    """
+    Fit the strategy on all rows outside [s_start, s_stop) and evaluate the
+    log-likelihood of the rows inside.
+
+    Returns:
+        tuple: Held-out log-likelihood, fit time and estimates.
+    """
+    def chunks():
+        return ((v_y[a:b], m_x[a:b])
+                for a, b in ((0, s_start), (s_stop, m_x.shape[0])) if b > a)
+
+    strategy = strategy_factory(chunks)
+    s_time = time.perf_counter()
+    output = strategy.estimate()
+    s_fit_time = time.perf_counter() - s_time
+    if not output:
+        return np.nan, s_fit_time, np.full(m_x.shape[1], np.nan)
+    v_beta = output[0]
+    s_log_likelihood = LogisticObjective(
+        v_y[s_start:s_stop], m_x[s_start:s_stop]).evaluate(v_beta)
+    return s_log_likelihood, s_fit_time, v_beta
+
+
+def _init_worker(v_y, m_x, strategy_factory):
+    global _worker_data
+    _worker_data = (v_y, m_x, strategy_factory)
+
+
+def _validate_fold_in_worker(s_start, s_stop):
+    return _validate_fold(*_worker_data, s_start, s_stop)
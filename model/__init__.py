@@ -0,0 +1,33 @@
+"""
+Regression models. The public classes are loaded on first access, so that
+loading a ScoringModel only imports NumPy:
+
+    from model import ScoringModel
+    model = ScoringModel.load(path)
+"""
+import importlib
+
+# Public name -> (module, attribute)
+_EXPORTS = {
+    "Regression": ("model.regressionModel.regression_model", "Regression"),
+    "LogisticRegression": ("model.regressionModel.logistic_regression_model",
+                           "LogisticRegression"),
+    "ScoringModel": ("model.regressionModel.scoring_model", "ScoringModel"),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _EXPORTS[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    # Cache the value, so that __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
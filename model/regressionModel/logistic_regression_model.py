@@ -1,10 +1,12 @@
 import numpy as np
 from model.regressionModel.regression_model import Regression
+from model.regressionModel.scoring_model import ScoringModel
 
 
 # Logistic regression model class
 class LogisticRegression(Regression):
-    def __init__(self, DV, IV, dataframe) -> None:
+    def __init__(self, DV, IV, dataframe=None, dtype=np.float64, order="C",
+                 b_intercept=True) -> None:
         """
         Create an instance of LogisticRegression model. The dataframe has
         size n x p, where n is the total number of observations and p is
@@ -16,11 +18,24 @@ class LogisticRegression(Regression):
         column.
 
         Args:
-            DV (str): Column name of the dependent variable.
-            IV (list): List of column names of the independent variables.
-            dataframe (pd.dataframe): Dataframe containing DV and IVs.
+            DV (str or np.array): Column name of the dependent variable, or the
+                                  dependent variable vector if no dataframe is
+                                  given.
+            IV (list or np.array): List of column names of the independent
+                                   variables, or the n x k matrix of
+                                   independent variables if no dataframe is
+                                   given.
+            dataframe (pd.dataframe, optional): Dataframe containing DV and
+                                                IVs. Defaults to None.
+            dtype (np.dtype, optional): Floating point type of the design
+                                        matrix. See Regression. Defaults to
+                                        np.float64.
+            order (str, optional): "C" for row-major or "F" for column-major
+                                   design matrix. Defaults to "C".
+            b_intercept (bool, optional): True=insert the intercept column.
+                                          Defaults to True.
         """
-        super().__init__(DV, IV, dataframe)
+        super().__init__(DV, IV, dataframe, dtype, order, b_intercept)
         # Initialize change in odds
         self.v_change_in_odds = None
         # Initialize predicted probabilities
@@ -28,9 +43,9 @@ class LogisticRegression(Regression):
         # Likelihood for binomial distribution
         self.s_log_likelihood = None
         # Hessian matrix
-        self.m_hessian = np.zeros((len(IV), len(IV)))
+        self.m_hessian = np.zeros((self.m_x.shape[1], self.m_x.shape[1]))
         # SE for coefficients
-        self.v_se = np.zeros(len(IV))
+        self.v_se = np.zeros(self.m_x.shape[1])
         # Wald statistics
         self.wald_stats = None
         # Akaike information criterion (AIC)
@@ -39,3 +54,144 @@ class LogisticRegression(Regression):
         self.s_num_itr = None
         # Log-likelihood for each iterations
         self.v_log_likelihood = None
+        # Class name of the estimation strategy of the last fit
+        self.estimation_strategy = None
+        # Whether the last fit converged
+        self.b_converged = None
+
+    def fit(self, estimation_strategy, recorder=None):
+        """
+        Estimate the model coefficients with the given estimation strategy
+        and store the estimates in the model. The Hessian matrix and the
+        standard errors are only stored if the strategy provides them. If
+        the fit did not converge, b_converged is False, v_beta holds the
+        coefficients of the last iteration (NaN if the strategy does not keep
+        them) and the other estimates are reset.
+
+        Args:
+            estimation_strategy (EstimationStrategy): Strategy constructed
+                                                      with this model's v_y
+                                                      and m_x.
+            recorder (IterationRecorder, optional): Recorder the strategy was
+                                                    constructed with. Its
+                                                    objective trace is stored
+                                                    as v_log_likelihood.
+                                                    Defaults to None.
+
+        Returns:
+            list: Output of the estimation strategy.
+        """
+        output = estimation_strategy.estimate()
+        self.estimation_strategy = type(estimation_strategy).__name__
+        if recorder is not None:
+            self.v_log_likelihood = recorder.trace().get("objective")
+        self.b_converged = len(output) >= 4
+        if self.b_converged:
+            self.v_beta = output[0]
+            self.v_p = output[1]
+            self.s_log_likelihood = output[2]
+            self.s_num_itr = output[3]
+        else:
+            v_beta_last = estimation_strategy.last_iterate()
+            if v_beta_last is None:
+                v_beta_last = np.full(self.m_x.shape[1], np.nan)
+            self.v_beta = v_beta_last
+            self.v_p = None
+            self.s_log_likelihood = None
+            self.s_num_itr = None
+        # Estimates of a previous fit must not outlive this one
+        self.m_hessian = np.zeros((self.m_x.shape[1], self.m_x.shape[1]))
+        self.v_se = np.zeros(self.m_x.shape[1])
+        if len(output) >= 6:
+            self.m_hessian = output[4]
+            self.v_se = output[5]
+        return output
+
+    def scoring_model(self, metadata=None):
+        """
+        Reduce the fitted model to a ScoringModel with the coefficients,
+        feature names, Hessian matrix and covariance matrix (the inverse of
+        the negative Hessian matrix, if the strategy provided the Hessian) and
+        fit metadata.
+
+        Args:
+            metadata (dict, optional): Additional JSON-serializable metadata.
+                                       Defaults to None.
+
+        Returns:
+            ScoringModel: Model for scoring new observations.
+        """
+        m_hessian = None
+        m_covariance = None
+        if np.any(self.m_hessian):
+            m_hessian = self.m_hessian
+            if np.all(np.isfinite(self.v_se)):
+                m_covariance = np.linalg.inv(-self.m_hessian)
+            else:
+                # Singular Hessian matrix of a rank-deficient design matrix
+                m_covariance = np.full(self.m_hessian.shape, np.nan)
+        fit_metadata = {"converged": self.b_converged,
+                        "log_likelihood": self.s_log_likelihood,
+                        "num_itr": self.s_num_itr,
+                        "num_observations": self.m_x.shape[0],
+                        "dependent_name": self.dependent_name,
+                        "estimation_strategy": self.estimation_strategy}
+        if metadata is not None:
+            fit_metadata.update(metadata)
+        return ScoringModel(self.v_beta, self.b_intercept, self.feature_names,
+                            m_covariance, m_hessian, fit_metadata)
+
+    def save(self, path, metadata=None):
+        """
+        Save the fitted model as a scoring artifact, which is loaded with
+        ScoringModel.load without pandas or the estimation classes.
+
+        Args:
+            path (str): Directory of the artifact.
+            metadata (dict, optional): Additional JSON-serializable metadata.
+                                       Defaults to None.
+        """
+        self.scoring_model(metadata).save(path)
+
+    def predict_proba(self, m_features, s_block_size=65536):
+        """
+        Calculate the predicted probabilities for new observations with the
+        fitted coefficients, see ScoringModel.predict_proba.
+
+        Args:
+            m_features (np.array or iterator): n x k matrix of independent
+                                               variables (dense, memmap or
+                                               scipy.sparse), or an iterator
+                                               of such matrices.
+            s_block_size (int, optional): Number of rows scored at once.
+                                          Defaults to 65536.
+
+        Returns:
+            np.array or generator: Vector of predicted probabilities, or a
+                                   generator of such vectors.
+        """
+        return ScoringModel(self.v_beta, self.b_intercept,
+                            self.feature_names).predict_proba(
+            m_features, s_block_size)
+
+    def predict(self, m_features, s_threshold=0.5, s_block_size=65536):
+        """
+        Classify new observations by comparing the predicted probabilities
+        with s_threshold. Iterators are scored lazily, as in predict_proba.
+
+        Args:
+            m_features (np.array or iterator): n x k matrix of independent
+                                               variables, or an iterator of
+                                               such matrices.
+            s_threshold (float, optional): Probability threshold for class 1.
+                                           Defaults to 0.5.
+            s_block_size (int, optional): Number of rows scored at once.
+                                          Defaults to 65536.
+
+        Returns:
+            np.array or generator: Vector of predicted classes (0 or 1), or a
+                                   generator of such vectors.
+        """
+        return ScoringModel(self.v_beta, self.b_intercept,
+                            self.feature_names).predict(
+            m_features, s_threshold, s_block_size)
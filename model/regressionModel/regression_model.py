@@ -1,9 +1,11 @@
+import sys
 import numpy as np
 from abc import ABC
 
 
 class Regression(ABC):
-    def __init__(self, DV, IV, dataframe) -> None:
+    def __init__(self, DV, IV, dataframe=None, dtype=np.float64, order="C",
+                 b_intercept=True) -> None:
         super().__init__()
         """
         Create an instance of Regression model. The dataframe has size n x p,
@@ -13,22 +15,79 @@ class Regression(ABC):
         The independent variables are initialized as the design matrix of size
         n x (k + 1), where k is the number of independent variables and k + 1
         accounts for the intercept by inserting one column of ones at the 0th
-        column.
+        column. The design matrix is allocated once and filled in place.
 
         Args:
-            DV (str): Column name of the dependent variable.
-            IV (list): List of column names of the independent variables.
-            dataframe (pd.dataframe): Dataframe containing DV and IVs.
+            DV (str or np.array): Column name of the dependent variable, or the
+                                  dependent variable vector if no dataframe is
+                                  given.
+            IV (list or np.array): List of column names of the independent
+                                   variables, or the n x k matrix of
+                                   independent variables (e.g. a memmap) if no
+                                   dataframe is given.
+            dataframe (pd.dataframe, optional): Dataframe containing DV and
+                                                IVs. Any table whose columns
+                                                have to_numpy() works, pandas
+                                                is never imported. Defaults
+                                                to None.
+            dtype (np.dtype, optional): Floating point type of the design
+                                        matrix, np.float32 halves its memory.
+                                        The likelihood is still evaluated
+                                        in float64, one block of rows at a
+                                        time, but the data are rounded to
+                                        about 7 significant digits, so the
+                                        estimates only match a float64 fit
+                                        to that precision. Defaults to
+                                        np.float64.
+            order (str, optional): "C" for row-major or "F" for column-major
+                                   design matrix. Defaults to "C".
+            b_intercept (bool, optional): True=insert the intercept column.
+                                          False=use the matrix of independent
+                                          variables as the design matrix,
+                                          without copying it if it already
+                                          has the requested dtype and order.
+                                          Defaults to True.
         """
         # Dataframe
         self.df = dataframe
+        # Whether the 0th column of the design matrix is the intercept
+        self.b_intercept = b_intercept
+        # Names of the dependent and independent variables, only known if
+        # they are columns of the dataframe
+        self.dependent_name = DV if dataframe is not None else None
+        self.feature_names = list(IV) if dataframe is not None else None
         # Initialize dependent variable as a vector of n x 1
-        self.v_y = self.df[DV]
-        # Account for intercept
-        self.v_ones = np.ones(self.df.shape[0])
-        # Initialize independent variable as a matrix of n x k
-        self.m_x = self.df[IV].values
-        # Design matrix of size n x (k + 1)
-        self.m_x = np.insert(self.m_x, 0, self.v_ones, axis=1)
+        if dataframe is not None:
+            self.v_y = dataframe[DV].to_numpy(dtype=dtype)
+        else:
+            self.v_y = np.asarray(DV, dtype=dtype)
+        # A sparse matrix can only have been created if scipy.sparse is
+        # already imported, so dense data does not import SciPy
+        sparse = sys.modules.get("scipy.sparse")
+        if sparse is not None and sparse.issparse(IV):
+            self.m_x = sparse.csr_matrix(IV, dtype=dtype)
+            if b_intercept:
+                # Account for intercept with a sparse column of ones
+                self.m_x = sparse.hstack(
+                    [np.ones((self.m_x.shape[0], 1), dtype=dtype), self.m_x],
+                    format="csr")
+        elif dataframe is None and not b_intercept:
+            self.m_x = np.asarray(IV, dtype=dtype, order=order)
+        else:
+            # Account for intercept
+            s_offset = 1 if b_intercept else 0
+            s_k = len(IV) if dataframe is not None else IV.shape[1]
+            # Design matrix of size n x (k + 1)
+            self.m_x = np.empty((self.v_y.shape[0], s_k + s_offset),
+                                dtype=dtype, order=order)
+            if b_intercept:
+                self.m_x[:, 0] = 1
+            if dataframe is not None:
+                # Copy the columns one at a time, so that no intermediate
+                # n x k matrix is created
+                for j, column in enumerate(IV):
+                    self.m_x[:, j + s_offset] = dataframe[column].to_numpy()
+            else:
+                self.m_x[:, s_offset:] = IV
         # Initialize coefficients
         self.v_beta = np.zeros(self.m_x.shape[1])
@@ -0,0 +1,206 @@
+import json
+import os
+import numpy as np
+from collections.abc import Iterator
+
+# Version of the saved artifact layout
+_FORMAT_VERSION = 1
+_METADATA_FILE = "metadata.json"
+# Arrays saved as one .npy file each, so that they can be memory-mapped
+_ARRAY_FILES = {"v_beta": "coefficients.npy",
+                "m_covariance": "covariance.npy",
+                "m_hessian": "hessian.npy"}
+
+
+# Scoring model class
+class ScoringModel:
+    def __init__(self, v_beta, b_intercept=True, feature_names=None,
+                 m_covariance=None, m_hessian=None, metadata=None) -> None:
+        """
+        Fitted logistic regression model reduced to what is needed to score
+        new observations and report uncertainty. It only depends on NumPy, so
+        scoring workers do not need to import pandas or the estimation
+        classes. It is saved as a directory with one .npy file per array and a
+        JSON metadata file, and loaded with memory-mapping.
+
+        Args:
+            v_beta (np.array): Fitted coefficients, the intercept first if
+                               b_intercept is True.
+            b_intercept (bool, optional): True=v_beta[0] is the intercept.
+                                          Defaults to True.
+            feature_names (list, optional): Names of the independent
+                                            variables, in the order of the
+                                            coefficients without the
+                                            intercept. Defaults to None.
+            m_covariance (np.array, optional): Estimated covariance matrix of
+                                               the coefficients. Defaults to
+                                               None.
+            m_hessian (np.array, optional): Hessian matrix of the
+                                            log-likelihood at v_beta.
+                                            Defaults to None.
+            metadata (dict, optional): JSON-serializable fit metadata, e.g.
+                                       log-likelihood and number of
+                                       iterations. Defaults to None.
+        """
+        self.v_beta = v_beta
+        self.b_intercept = b_intercept
+        self.feature_names = None if feature_names is None else \
+            [str(name) for name in feature_names]
+        self.m_covariance = m_covariance
+        self.m_hessian = m_hessian
+        self.metadata = {} if metadata is None else dict(metadata)
+
+    def save(self, path):
+        """
+        Save the model to the directory path, which is created if needed.
+
+        Args:
+            path (str): Directory of the artifact.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name, file_name in _ARRAY_FILES.items():
+            array = getattr(self, name)
+            file_path = os.path.join(path, file_name)
+            if array is not None:
+                np.save(file_path, np.asarray(array), allow_pickle=False)
+            elif os.path.exists(file_path):
+                # Do not leave an array of a previously saved model behind
+                os.remove(file_path)
+        metadata = {"format_version": _FORMAT_VERSION,
+                    "b_intercept": bool(self.b_intercept),
+                    "feature_names": self.feature_names,
+                    "metadata": self.metadata}
+        with open(os.path.join(path, _METADATA_FILE), "w") as file:
+            json.dump(metadata, file, indent=2, default=_to_json)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Load a model saved with save.
+
+        Args:
+            path (str): Directory of the artifact.
+            mmap_mode (str, optional): Memory-map mode passed to np.load, None
+                                       reads the arrays into memory. Defaults
+                                       to "r".
+
+        Returns:
+            ScoringModel: The loaded model.
+        """
+        with open(os.path.join(path, _METADATA_FILE)) as file:
+            metadata = json.load(file)
+        if metadata.get("format_version") != _FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model format version "
+                f"{metadata.get('format_version')!r}.")
+        arrays = {}
+        for name, file_name in _ARRAY_FILES.items():
+            file_path = os.path.join(path, file_name)
+            arrays[name] = np.load(file_path, mmap_mode=mmap_mode,
+                                   allow_pickle=False) \
+                if os.path.exists(file_path) else None
+        return cls(arrays["v_beta"], metadata["b_intercept"],
+                   metadata["feature_names"], arrays["m_covariance"],
+                   arrays["m_hessian"], metadata["metadata"])
+
+    def standard_errors(self):
+        """
+        Returns:
+            np.array: Standard errors of the coefficients, None without a
+                      covariance matrix.
+        """
+        if self.m_covariance is None:
+            return None
+        return np.sqrt(np.diag(self.m_covariance))
+
+    def predict_proba(self, m_features, s_block_size=65536):
+        """
+        Calculate the predicted probabilities for new observations. The rows
+        are scored in blocks of s_block_size, and the intercept is added to
+        the linear predictor rather than inserted into the features, so no
+        design matrix is built.
+        If m_features is an iterator (e.g. a generator of chunks), a generator
+        yielding the predicted probabilities of each chunk is returned, so
+        that arbitrarily many rows can be scored with constant memory.
+        A table with named columns (e.g. a pandas DataFrame) is scored by
+        feature_names, regardless of its column order.
+
+        Args:
+            m_features (np.array or iterator): n x k matrix of independent
+                                               variables (dense, memmap,
+                                               scipy.sparse or a table with
+                                               named columns), or an iterator
+                                               of such matrices.
+            s_block_size (int, optional): Number of rows scored at once.
+                                          Defaults to 65536.
+
+        Returns:
+            np.array or generator: Vector of predicted probabilities, or a
+                                   generator of such vectors.
+        """
+        if isinstance(m_features, Iterator):
+            return (self.predict_proba(m_chunk, s_block_size)
+                    for m_chunk in m_features)
+        if hasattr(m_features, "columns") and self.feature_names is not None:
+            m_features = m_features[self.feature_names].to_numpy()
+        elif not hasattr(m_features, "shape"):
+            m_features = np.asarray(m_features)
+        s_n = m_features.shape[0]
+        v_p = np.empty(s_n)
+        for s_start in range(0, s_n, s_block_size):
+            s_stop = min(s_start + s_block_size, s_n)
+            v_p[s_start:s_stop] = self.__predict_block(
+                m_features[s_start:s_stop])
+        return v_p
+
+    def predict(self, m_features, s_threshold=0.5, s_block_size=65536):
+        """
+        Classify new observations by comparing the predicted probabilities
+        with s_threshold. Iterators are scored lazily, as in predict_proba.
+
+        Args:
+            m_features (np.array or iterator): n x k matrix of independent
+                                               variables, or an iterator of
+                                               such matrices.
+            s_threshold (float, optional): Probability threshold for class 1.
+                                           Defaults to 0.5.
+            s_block_size (int, optional): Number of rows scored at once.
+                                          Defaults to 65536.
+
+        Returns:
+            np.array or generator: Vector of predicted classes (0 or 1), or a
+                                   generator of such vectors.
+        """
+        v_p = self.predict_proba(m_features, s_block_size)
+        if isinstance(v_p, Iterator):
+            return ((v_p_chunk >= s_threshold).astype(np.int8)
+                    for v_p_chunk in v_p)
+        return (v_p >= s_threshold).astype(np.int8)
+
+    def __predict_block(self, m_block):
+        """Helper method. Calculates the predicted probabilities of a block
+        of rows with the stable form of the sigmoid function.
+
+        Args:
+            m_block (np.array): block of rows of independent variables
+
+        Returns:
+            np.array: vector of predicted probabilities
+        """
+        if self.b_intercept:
+            v_z = m_block @ self.v_beta[1:] + self.v_beta[0]
+        else:
+            v_z = m_block @ self.v_beta
+        return np.exp(-np.logaddexp(0, -np.ravel(v_z)))
+
+
+def _to_json(value):
+    """
+    Convert NumPy scalars and arrays in the metadata to JSON types.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON "
+                    f"serializable.")
@@ -0,0 +1,54 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Make the packages importable when pytest is run from any directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def simulate_data(s_n, s_k, s_seed=0):
+    """
+    Simulate a design matrix with intercept column and binary dependent
+    variable from a logistic regression model.
+
+    Args:
+        s_n (int): Number of observations.
+        s_k (int): Number of independent variables.
+        s_seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        tuple: Dependent variable vector and design matrix.
+    """
+    rng = np.random.default_rng(s_seed)
+    m_x = np.empty((s_n, s_k + 1))
+    m_x[:, 0] = 1.0
+    m_x[:, 1:] = rng.standard_normal((s_n, s_k))
+    v_beta = rng.normal(0.0, 0.5, s_k + 1)
+    v_y = (rng.uniform(size=s_n) < 1 / (1 + np.exp(-m_x @ v_beta))) * 1.0
+    return v_y, m_x
+
+
+@pytest.fixture(scope="session")
+def simulate():
+    """
+    Returns:
+        callable: simulate_data, for tests that need several data sets.
+    """
+    return simulate_data
+
+
+@pytest.fixture(scope="session")
+def posterior():
+    """
+    Returns:
+        tuple: Simulated data, prior covariance matrix and the MAP estimates
+               and covariance matrix of the posterior distribution.
+    """
+    from control.estimation.logistic_newton import LogisticNewton
+    v_y, m_x = simulate_data(500, 2)
+    m_prior_sigma = 100 * np.eye(m_x.shape[1])
+    output = LogisticNewton(v_y, m_x, 100, 1e-10, np.zeros(m_x.shape[1]),
+                            m_prior_sigma).estimate()
+    return v_y, m_x, m_prior_sigma, output[0], np.linalg.inv(-output[4])
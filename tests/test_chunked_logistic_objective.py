@@ -0,0 +1,88 @@
+import numpy as np
+from control.estimation.logistic_map import LogisticMAP
+from control.estimation.logistic_mle import LogisticMLE
+from control.estimation.logistic_newton import LogisticNewton
+from control.likelihood.chunked_logistic_objective import \
+    ChunkedLogisticObjective
+from control.likelihood.logistic_objective import LogisticObjective
+
+
+def chunked(v_y, m_x, s_chunk_size):
+    """
+    Returns:
+        callable: Callable returning a fresh iterator of (v_y, m_x) chunks.
+    """
+    def chunks():
+        for s_start in range(0, v_y.shape[0], s_chunk_size):
+            yield (v_y[s_start:s_start + s_chunk_size],
+                   m_x[s_start:s_start + s_chunk_size])
+    return chunks
+
+
+def test_chunked_objective_matches_in_memory_objective(simulate):
+    v_y, m_x = simulate(1000, 3)
+    v_beta = np.array([0.2, -0.4, 0.1, 0.3])
+    objective = LogisticObjective(v_y, m_x)
+    chunked_objective = ChunkedLogisticObjective(chunked(v_y, m_x, 128),
+                                                 b_hessian=True)
+    np.testing.assert_allclose(chunked_objective.evaluate(v_beta),
+                               objective.evaluate(v_beta), rtol=1e-12)
+    np.testing.assert_allclose(chunked_objective.gradient(),
+                               objective.gradient(), rtol=1e-10)
+    np.testing.assert_allclose(chunked_objective.negative_hessian(),
+                               objective.negative_hessian(), rtol=1e-10)
+    assert chunked_objective.num_parameters() == m_x.shape[1]
+
+
+def test_negative_hessian_is_not_an_internal_buffer(simulate):
+    v_y, m_x = simulate(500, 2)
+    v_beta = np.array([0.2, -0.4, 0.1])
+    chunked_objective = ChunkedLogisticObjective(chunked(v_y, m_x, 128),
+                                                 b_hessian=True)
+    chunked_objective.evaluate(v_beta)
+    m_neg_hessian = chunked_objective.negative_hessian()
+    m_expected = m_neg_hessian.copy()
+    m_neg_hessian += np.eye(3)
+    np.testing.assert_array_equal(chunked_objective.negative_hessian(),
+                                  m_expected)
+
+
+def test_chunked_newton_matches_in_memory_fit(simulate):
+    v_y, m_x = simulate(2000, 4)
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    output = LogisticNewton(v_y, m_x, 100, 1e-10,
+                            chunks=chunked(v_y, m_x, 300)).estimate()
+    np.testing.assert_allclose(output[0], expected[0], rtol=1e-10)
+    np.testing.assert_allclose(output[2], expected[2], rtol=1e-12)
+    np.testing.assert_allclose(output[5], expected[5], rtol=1e-10)
+
+
+def test_chunked_newton_map_matches_in_memory_fit(simulate):
+    v_y, m_x = simulate(1000, 2)
+    v_mu = np.zeros(3)
+    m_sigma = np.eye(3)
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10, v_mu,
+                              m_sigma).estimate()
+    output = LogisticNewton(v_y, m_x, 100, 1e-10, v_mu, m_sigma,
+                            chunks=chunked(v_y, m_x, 256)).estimate()
+    np.testing.assert_allclose(output[0], expected[0], rtol=1e-10)
+    np.testing.assert_allclose(output[4], expected[4], rtol=1e-10)
+    np.testing.assert_allclose(output[5], expected[5], rtol=1e-10)
+
+
+def test_chunked_gradient_ascent_matches_in_memory_fit(simulate):
+    v_y, m_x = simulate(1000, 3)
+    expected = LogisticMLE(v_y, m_x, 20000, 1e-8, 1e-3).estimate()
+    output = LogisticMLE(v_y, m_x, 20000, 1e-8, 1e-3,
+                         chunks=chunked(v_y, m_x, 128)).estimate()
+    assert output[3] == expected[3]
+    np.testing.assert_allclose(output[0], expected[0], rtol=1e-10)
+    np.testing.assert_allclose(output[2], expected[2], rtol=1e-12)
+    v_mu = np.zeros(4)
+    m_sigma = 4 * np.eye(4)
+    expected = LogisticMAP(v_y, m_x, v_mu, m_sigma, 20000, 1e-8,
+                           1e-3).estimate()
+    output = LogisticMAP(v_y, m_x, v_mu, m_sigma, 20000, 1e-8, 1e-3,
+                         chunks=chunked(v_y, m_x, 128)).estimate()
+    assert output[3] == expected[3]
+    np.testing.assert_allclose(output[0], expected[0], rtol=1e-10)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from control.estimation.logistic_newton import LogisticNewton
+from control.likelihood.logistic_objective import LogisticObjective
+from control.validation.cross_validation import KFoldCrossValidation
+
+
+def newton(chunks):
+    return LogisticNewton(None, None, 100, 1e-10, chunks=chunks)
+
+
+def test_folds_match_fits_on_the_training_rows(simulate):
+    v_y, m_x = simulate(500, 2)
+    v_log_likelihood, v_fit_time, m_beta = KFoldCrossValidation(
+        v_y, m_x, newton, s_num_folds=5).validate()
+    assert v_log_likelihood.shape == (5,) and np.all(v_fit_time >= 0)
+    for j, s_start in enumerate(range(0, 500, 100)):
+        v_fold = np.arange(s_start, s_start + 100)
+        expected = LogisticNewton(np.delete(v_y, v_fold),
+                                  np.delete(m_x, v_fold, axis=0), 100,
+                                  1e-10).estimate()
+        np.testing.assert_allclose(m_beta[j], expected[0], atol=1e-6)
+        np.testing.assert_allclose(
+            v_log_likelihood[j],
+            LogisticObjective(v_y[v_fold], m_x[v_fold]).evaluate(
+                expected[0]), rtol=1e-8)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_folds_match_serial_folds(simulate, executor):
+    v_y, m_x = simulate(500, 2)
+    expected = KFoldCrossValidation(v_y, m_x, newton, s_num_folds=4).validate()
+    output = KFoldCrossValidation(v_y, m_x, newton, s_num_folds=4, n_jobs=2,
+                                  executor=executor).validate()
+    np.testing.assert_array_equal(output[0], expected[0])
+    np.testing.assert_array_equal(output[2], expected[2])
+
+
+def test_non_converged_folds_are_nan(simulate):
+    v_y, m_x = simulate(200, 2)
+    output = KFoldCrossValidation(
+        v_y, m_x, lambda chunks: LogisticNewton(None, None, 1, 1e-10,
+                                                chunks=chunks),
+        s_num_folds=2).validate()
+    assert np.all(np.isnan(output[0])) and np.all(np.isnan(output[2]))
+
+
+def test_process_executor_rejects_unpicklable_factory(simulate):
+    v_y, m_x = simulate(100, 1)
+    with pytest.raises(ValueError, match="picklable"):
+        KFoldCrossValidation(
+            v_y, m_x, lambda chunks: newton(chunks), s_num_folds=2,
+            n_jobs=2, executor="process")
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from control.instrumentation.iteration_recorder import IterationRecorder
+from control.mcmc import diagnostics
+from control.mcmc.mala import MALA
+from control.mcmc.metropolis import Metropolis
+
+
+def ar1(s_num_chains, s_n, s_phi, s_seed=0):
+    """
+    Returns:
+        np.array: Stationary AR(1) chains with unit variance and
+                  autocorrelation s_phi (C x N x 1).
+    """
+    rng = np.random.default_rng(s_seed)
+    m_noise = rng.standard_normal((s_num_chains, s_n)) * np.sqrt(
+        1 - s_phi ** 2)
+    chains = np.empty((s_num_chains, s_n))
+    chains[:, 0] = rng.standard_normal(s_num_chains)
+    for t in range(1, s_n):
+        chains[:, t] = s_phi * chains[:, t - 1] + m_noise[:, t]
+    return chains[:, :, np.newaxis]
+
+
+def test_autocorrelation_of_ar1_chain():
+    v_rho = diagnostics.autocorrelation(ar1(1, 20000, 0.7)[0])[:4, 0]
+    np.testing.assert_allclose(v_rho, 0.7 ** np.arange(4), atol=0.03)
+
+
+def test_effective_sample_size_of_ar1_chains():
+    s_phi = 0.8
+    chains = ar1(4, 5000, s_phi)
+    # Integrated autocorrelation time of AR(1) is (1 + phi) / (1 - phi)
+    s_expected = chains.shape[0] * chains.shape[1] * (1 - s_phi) / (
+        1 + s_phi)
+    for v_ess in [diagnostics.effective_sample_size(chains),
+                  diagnostics.bulk_effective_sample_size(chains)]:
+        np.testing.assert_allclose(v_ess, s_expected, rtol=0.15)
+
+
+def test_effective_sample_size_of_independent_samples():
+    chains = np.random.default_rng(1).standard_normal((4, 2000, 2))
+    v_ess = diagnostics.effective_sample_size(chains)
+    np.testing.assert_allclose(v_ess, 8000, rtol=0.15)
+    assert np.all(diagnostics.tail_effective_sample_size(chains) > 4000)
+
+
+def test_r_hat_of_mixed_chains():
+    v_r_hat = diagnostics.r_hat(ar1(4, 2000, 0.5))
+    assert np.all(v_r_hat < 1.01)
+
+
+def test_r_hat_detects_chains_that_have_not_mixed():
+    chains = ar1(4, 2000, 0.5)
+    # A chain with a different location
+    shifted = chains.copy()
+    shifted[0] += 2
+    assert np.all(diagnostics.r_hat(shifted) > 1.1)
+    # A chain with a different scale
+    scaled = chains.copy()
+    scaled[0] *= 4
+    assert np.all(diagnostics.r_hat(scaled) > 1.1)
+    # A trend within each chain is caught by splitting the chains
+    trending = chains + np.linspace(0, 3, chains.shape[1])[:, np.newaxis]
+    assert np.all(diagnostics.r_hat(trending) > 1.1)
+
+
+@pytest.mark.parametrize("sampler", [Metropolis, MALA])
+def test_samplers_record_diagnostics_of_valid_samples(posterior, sampler):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    v_zero = np.zeros(s_k)
+    recorder = IterationRecorder()
+    # Proposal covariance matrix of Metropolis or step size of MALA
+    proposal = m_cov if sampler is Metropolis else 0.05
+    valid_samples = sampler(v_y, m_x, v_map, v_zero, m_prior_sigma, proposal,
+                            600, 100, n_chains=2, seed=0,
+                            recorder=recorder).optimize()[1]
+    summary = recorder.summary()
+    np.testing.assert_array_equal(
+        summary["effective_sample_size"],
+        diagnostics.effective_sample_size(valid_samples))
+    np.testing.assert_array_equal(summary["r_hat"],
+                                  diagnostics.r_hat(valid_samples))
+    assert np.all(summary["ess_per_second"] > 0)
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code):
+    """
+    Run code in a fresh interpreter with only the repository root on the
+    path.
+
+    Returns:
+        str: Standard output of the interpreter.
+    """
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def test_importing_the_packages_imports_no_submodule():
+    output = run(
+        "import sys, control, model\n"
+        "print(sorted(name for name in sys.modules\n"
+        "             if name.startswith(('control.', 'model.', 'scipy'))))")
+    assert output.strip() == "[]"
+
+
+def test_scoring_model_only_imports_numpy():
+    output = run(
+        "import sys\n"
+        "from model import ScoringModel\n"
+        "print(ScoringModel.__name__, 'scipy' in sys.modules,\n"
+        "      'pandas' in sys.modules, 'control' in sys.modules)")
+    assert output.split() == ["ScoringModel", "False", "False", "False"]
+
+
+def test_diagnostics_do_not_import_scipy_stats():
+    output = run("import sys\n"
+                 "from control.mcmc import diagnostics\n"
+                 "print('scipy.stats' in sys.modules)")
+    assert output.strip() == "False"
+
+
+def test_public_names_resolve_to_their_classes():
+    import control
+    import model
+    from control.estimation.logistic_newton import LogisticNewton
+    from control.mcmc import diagnostics
+    from model.regressionModel.scoring_model import ScoringModel
+    assert control.LogisticNewton is LogisticNewton
+    assert control.diagnostics is diagnostics
+    assert model.ScoringModel is ScoringModel
+    for package in [control, model]:
+        assert set(package.__all__) <= set(dir(package))
+        for name in package.__all__:
+            getattr(package, name)
+        with pytest.raises(AttributeError):
+            package.NoSuchClass
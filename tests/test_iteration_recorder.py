@@ -0,0 +1,64 @@
+import numpy as np
+from control.estimation.logistic_newton import LogisticNewton
+from control.instrumentation.iteration_recorder import IterationRecorder
+from control.mcmc.metropolis import Metropolis
+from model.regressionModel.logistic_regression_model import \
+    LogisticRegression
+
+
+def test_grown_buffers_are_nan_for_missing_values():
+    recorder = IterationRecorder(s_capacity=2)
+    recorder.start()
+    for i in range(5):
+        if i < 2:
+            recorder.record(i, objective=float(i), gradient_norm=1.0)
+        else:
+            recorder.record(i, objective=float(i))
+    trace = recorder.trace()
+    np.testing.assert_array_equal(trace["objective"], np.arange(5.0))
+    np.testing.assert_array_equal(trace["iteration"], np.arange(5))
+    np.testing.assert_array_equal(trace["gradient_norm"],
+                                  [1.0, 1.0, np.nan, np.nan, np.nan])
+
+
+def test_record_every_s_every_th_iteration():
+    recorder = IterationRecorder(s_every=3)
+    recorder.start()
+    for i in range(10):
+        recorder.record(i, objective=float(i))
+    np.testing.assert_array_equal(recorder.trace()["iteration"],
+                                  [0, 3, 6, 9])
+
+
+def test_newton_records_every_iteration(simulate):
+    v_y, m_x = simulate(500, 3)
+    recorder = IterationRecorder(s_capacity=2)
+    model = LogisticRegression(v_y, m_x[:, 1:])
+    output = model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-10,
+                                      recorder=recorder), recorder)
+    trace = recorder.trace()
+    np.testing.assert_array_equal(trace["iteration"],
+                                  np.arange(output[3] + 1))
+    assert trace["objective"][-1] == output[2]
+    assert np.all(np.diff(trace["objective"]) >= 0)
+    assert np.all(np.diff(trace["time"]) >= 0)
+    np.testing.assert_array_equal(model.v_log_likelihood, trace["objective"])
+    assert recorder.summary()["converged"]
+    assert {"solve", "gradient"} <= set(recorder.phase_times())
+    recorder = IterationRecorder()
+    assert LogisticNewton(v_y, m_x, 1, 1e-10, recorder=recorder).estimate() \
+        == []
+    assert not recorder.summary()["converged"]
+
+
+def test_metropolis_records_acceptance(simulate):
+    v_y, m_x = simulate(200, 1)
+    recorder = IterationRecorder()
+    samples = Metropolis(v_y, m_x, np.zeros(2), np.zeros(2), np.eye(2),
+                         0.01 * np.eye(2), 200, 100, n_chains=4, seed=0,
+                         recorder=recorder).optimize()[0]
+    v_moved = np.any(samples[:, 1:] != samples[:, :-1], axis=2)
+    np.testing.assert_allclose(recorder.trace()["acceptance_rate"],
+                               np.mean(v_moved, axis=0))
+    np.testing.assert_allclose(recorder.summary()["acceptance_rate"],
+                               np.mean(v_moved, axis=1))
@@ -0,0 +1,111 @@
+import numpy as np
+from control.estimation.logistic_batched import LogisticBatched
+from control.estimation.logistic_mle import LogisticMLE
+from control.estimation.logistic_newton import LogisticNewton
+
+
+def stacked(simulate, s_num_models, s_n, s_k):
+    """
+    Returns:
+        tuple: Stacked dependent variables (M x n) and design matrices
+               (M x n x (k + 1)) of independent simulated models.
+    """
+    data = [simulate(s_n, s_k, s_seed=s_seed)
+            for s_seed in range(s_num_models)]
+    return (np.stack([v_y for v_y, _ in data]),
+            np.stack([m_x for _, m_x in data]))
+
+
+def test_batched_newton_matches_per_model_fits(simulate):
+    m_y, m_x = stacked(simulate, 20, 200, 3)
+    output = LogisticBatched(m_y, m_x, 100, 1e-10).estimate()
+    assert np.all(output[6])
+    for m in range(m_y.shape[0]):
+        expected = LogisticNewton(m_y[m], m_x[m], 100, 1e-10).estimate()
+        np.testing.assert_allclose(output[0][m], expected[0], atol=1e-7)
+        np.testing.assert_allclose(output[1][m], expected[1], atol=1e-8)
+        np.testing.assert_allclose(output[2][m], expected[2], rtol=1e-12)
+        assert output[3][m] == expected[3]
+        np.testing.assert_allclose(output[4][m], expected[4], rtol=1e-6)
+        np.testing.assert_allclose(output[5][m], expected[5], rtol=1e-6)
+
+
+def test_batched_map_matches_per_model_fits(simulate):
+    m_y, m_x = stacked(simulate, 10, 100, 3)
+    v_mu = np.zeros(4)
+    m_sigma = 4 * np.eye(4)
+    output = LogisticBatched(m_y, m_x, 100, 1e-10, v_mu=v_mu,
+                             m_sigma=m_sigma).estimate()
+    for m in range(m_y.shape[0]):
+        expected = LogisticNewton(m_y[m], m_x[m], 100, 1e-10, v_mu,
+                                  m_sigma).estimate()
+        np.testing.assert_allclose(output[0][m], expected[0], atol=1e-7)
+        np.testing.assert_allclose(output[2][m], expected[2], rtol=1e-12)
+
+
+def test_batched_gradient_ascent_matches_per_model_fits(simulate):
+    m_y, m_x = stacked(simulate, 10, 100, 2)
+    output = LogisticBatched(m_y, m_x, 20000, 1e-8, s_alpha=1e-2,
+                             method="gradient").estimate()
+    assert output[4] is None and output[5] is None
+    for m in range(m_y.shape[0]):
+        expected = LogisticMLE(m_y[m], m_x[m], 20000, 1e-8, 1e-2).estimate()
+        assert output[3][m] == expected[3]
+        np.testing.assert_allclose(output[0][m], expected[0], rtol=1e-10)
+
+
+def test_batched_segments_match_per_segment_fits():
+    rng = np.random.default_rng(3)
+    # One large segment and many small ones of different size classes
+    v_sizes = np.concatenate([[3000], rng.integers(20, 200, 30)])
+    segments = np.repeat(rng.permutation(1000)[:v_sizes.shape[0]], v_sizes)
+    rng.shuffle(segments)
+    s_n = segments.shape[0]
+    m_x = np.column_stack([np.ones(s_n), rng.standard_normal((s_n, 2))])
+    v_y = (rng.uniform(size=s_n) < 1 / (1 + np.exp(
+        -m_x @ [0.2, 0.5, -0.3]))) * 1.0
+    strategy = LogisticBatched(v_y, m_x, 100, 1e-10, segments=segments)
+    output = strategy.estimate()
+    np.testing.assert_array_equal(strategy.segment_ids(),
+                                  np.unique(segments))
+    assert output[1].shape == (s_n,)
+    for m, s_segment in enumerate(strategy.segment_ids()):
+        v_rows = segments == s_segment
+        expected = LogisticNewton(v_y[v_rows], m_x[v_rows], 100,
+                                  1e-10).estimate()
+        np.testing.assert_allclose(output[0][m], expected[0], atol=1e-7)
+        np.testing.assert_allclose(output[1][v_rows], expected[1],
+                                   atol=1e-8)
+        np.testing.assert_allclose(output[2][m], expected[2], rtol=1e-12)
+
+
+def test_batched_frozen_models_do_not_disturb_the_others(simulate):
+    m_y, m_x = stacked(simulate, 6, 200, 2)
+    # Perfectly separated data, whose estimates diverge
+    m_y[2] = m_x[2, :, 1] > 0
+    output = LogisticBatched(m_y, m_x, 30, 1e-10).estimate()
+    np.testing.assert_array_equal(output[6], np.arange(6) != 2)
+    for m in [0, 1, 3, 4, 5]:
+        expected = LogisticNewton(m_y[m], m_x[m], 30, 1e-10).estimate()
+        np.testing.assert_allclose(output[0][m], expected[0], atol=1e-7)
+        np.testing.assert_allclose(output[2][m], expected[2], rtol=1e-12)
+        assert output[3][m] == expected[3]
+    assert output[3][2] == 30
+
+
+def test_batched_standard_errors_are_nan_for_unidentified_models(simulate):
+    m_y, m_x = stacked(simulate, 4, 200, 3)
+    # Exactly collinear columns in model 1
+    m_x[1, :, 3] = 2 * m_x[1, :, 1] - m_x[1, :, 2]
+    output = LogisticBatched(m_y, m_x, 100, 1e-10).estimate()
+    assert np.all(np.isnan(output[5][1]))
+    for m in [0, 2, 3]:
+        expected = LogisticNewton(m_y[m], m_x[m], 100, 1e-10).estimate()
+        np.testing.assert_allclose(output[5][m], expected[5], rtol=1e-6)
+    # A segment of two rows cannot identify four parameters
+    v_y, m_x = simulate(402, 3)
+    segments = np.repeat([0, 1, 2], [200, 2, 200])
+    output = LogisticBatched(v_y, m_x, 100, 1e-10,
+                             segments=segments).estimate()
+    assert np.all(np.isnan(output[5][1]))
+    assert np.all(np.isfinite(output[5][[0, 2]]))
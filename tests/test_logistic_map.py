@@ -0,0 +1,69 @@
+import numpy as np
+from control.estimation.logistic_map import LogisticMAP
+from control.estimation.logistic_newton import LogisticNewton
+from control.likelihood.mvn_prior import MVNPrior
+
+
+def test_scaled_prior_matches_prior_with_scaled_covariance():
+    v_mu = np.array([0.5, -1.0])
+    m_sigma = np.array([[2.0, 0.3], [0.3, 1.0]])
+    v_x = np.array([0.1, 0.2])
+    prior = MVNPrior(v_mu, m_sigma)
+    # Cache the precision matrix before scaling
+    prior.precision()
+    for s_scale in [0.1, 3.0]:
+        scaled = prior.scale(s_scale)
+        expected = MVNPrior(v_mu, s_scale * m_sigma)
+        np.testing.assert_allclose(scaled.evaluate(v_x),
+                                   expected.evaluate(v_x), rtol=1e-12)
+        np.testing.assert_allclose(scaled.gradient(v_x),
+                                   expected.gradient(v_x), rtol=1e-12)
+        np.testing.assert_allclose(scaled.precision(), expected.precision(),
+                                   rtol=1e-12)
+
+
+def test_path_matches_independent_fits(simulate):
+    v_y, m_x = simulate(500, 3)
+    v_mu = np.zeros(4)
+    m_sigma = np.eye(4)
+    v_scales = [0.01, 0.1, 1.0, 10.0]
+    strategy = LogisticMAP(v_y, m_x, v_mu, m_sigma, 50000, 1e-10, 1e-3)
+    m_beta_path, v_log_posterior, v_num_itr, v_converged = \
+        strategy.estimate_path(v_scales)
+    assert m_beta_path.shape == (4, 4) and np.all(v_converged)
+    s_num_itr = 0
+    for j, s_scale in enumerate(v_scales):
+        expected = LogisticNewton(v_y, m_x, 100, 1e-12, v_mu,
+                                  s_scale * m_sigma).estimate()
+        np.testing.assert_allclose(m_beta_path[j], expected[0], atol=1e-4)
+        np.testing.assert_allclose(v_log_posterior[j], expected[2],
+                                   rtol=1e-8)
+        s_num_itr += LogisticMAP(v_y, m_x, v_mu, s_scale * m_sigma, 50000,
+                                 1e-10, 1e-3).estimate()[3]
+    # Warm starts need fewer iterations than independent cold starts
+    assert np.sum(v_num_itr) < s_num_itr
+
+
+def test_warm_start_from_solution_converges_immediately(simulate):
+    v_y, m_x = simulate(500, 3)
+    v_mu = np.zeros(4)
+    m_sigma = np.eye(4)
+    expected = LogisticMAP(v_y, m_x, v_mu, m_sigma, 50000, 1e-10,
+                           1e-3).estimate()
+    output = LogisticMAP(v_y, m_x, v_mu, m_sigma, 50000, 1e-10, 1e-3,
+                         v_beta_init=expected[0]).estimate()
+    assert output[3] <= 1
+    np.testing.assert_allclose(output[0], expected[0], atol=1e-6)
+
+
+def test_last_iterate_of_non_converged_fit(simulate):
+    v_y, m_x = simulate(500, 2)
+    v_mu = np.zeros(3)
+    m_sigma = np.eye(3)
+    strategy = LogisticMAP(v_y, m_x, v_mu, m_sigma, 5, 1e-12, 1e-3)
+    assert strategy.last_iterate() is None
+    assert strategy.estimate() == []
+    expected = LogisticMAP(v_y, m_x, v_mu, m_sigma, 5, 1e-12, 1e-3,
+                           v_beta_init=np.zeros(3)).estimate_path([1.0])
+    assert not expected[3][0]
+    np.testing.assert_array_equal(strategy.last_iterate(), expected[0][0])
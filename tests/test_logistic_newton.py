@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from control.estimation.logistic_map import LogisticMAP
+from control.estimation.logistic_mle import LogisticMLE
+from control.estimation.logistic_newton import LogisticNewton
+
+
+def test_newton_mle_solves_score_equations(simulate):
+    v_y, m_x = simulate(1000, 3)
+    output = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    v_beta, v_p = output[0], output[1]
+    np.testing.assert_allclose(m_x.T @ (v_y - v_p), 0, atol=1e-6)
+    m_neg_hessian = m_x.T @ (m_x * (v_p * (1 - v_p))[:, np.newaxis])
+    np.testing.assert_allclose(output[4], -m_neg_hessian, rtol=1e-10)
+    np.testing.assert_allclose(
+        output[5], np.sqrt(np.diag(np.linalg.inv(m_neg_hessian))),
+        rtol=1e-8)
+    # Newton converges in a handful of iterations, gradient ascent does not
+    assert output[3] < 10
+    expected = LogisticMLE(v_y, m_x, 20000, 1e-10, 1e-3).estimate()
+    np.testing.assert_allclose(v_beta, expected[0], atol=1e-4)
+
+
+def test_newton_map_matches_gradient_ascent(simulate):
+    v_y, m_x = simulate(500, 2, s_seed=1)
+    v_mu = np.full(3, 0.5)
+    m_sigma = np.diag([1.0, 0.5, 2.0])
+    output = LogisticNewton(v_y, m_x, 100, 1e-10, v_mu, m_sigma).estimate()
+    v_gradient = m_x.T @ (v_y - output[1]) - np.linalg.solve(
+        m_sigma, output[0] - v_mu)
+    np.testing.assert_allclose(v_gradient, 0, atol=1e-6)
+    expected = LogisticMAP(v_y, m_x, v_mu, m_sigma, 20000, 1e-10,
+                           1e-3).estimate()
+    np.testing.assert_allclose(output[0], expected[0], atol=1e-4)
+    np.testing.assert_allclose(output[2], expected[2], rtol=1e-8)
+
+
+def test_newton_without_line_search_reaches_same_estimates(simulate):
+    v_y, m_x = simulate(1000, 3, s_seed=2)
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    output = LogisticNewton(v_y, m_x, 100, 1e-10,
+                            b_line_search=False).estimate()
+    np.testing.assert_allclose(output[0], expected[0], atol=1e-8)
+
+
+@pytest.mark.parametrize("design", ["dummy", "collinear", "zero"])
+def test_newton_rank_deficient_design_matrix(design):
+    rng = np.random.default_rng(0)
+    s_n = 500
+    v_x = rng.standard_normal(s_n)
+    v_category = rng.integers(0, 3, s_n)
+    v_y = (rng.uniform(size=s_n) < 1 / (1 + np.exp(
+        -(0.3 * v_x + 0.5 * v_category - 0.5)))) * 1.0
+    m_x = {"dummy": np.column_stack([np.ones(s_n), np.eye(3)[v_category],
+                                     v_x]),
+           "collinear": np.column_stack([np.ones(s_n), v_x, 2 * v_x]),
+           "zero": np.column_stack([np.ones(s_n), v_x,
+                                    np.zeros(s_n)])}[design]
+    output = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10,
+                              b_conjugate_gradient=True).estimate()
+    np.testing.assert_allclose(output[2], expected[2], rtol=1e-10)
+    assert np.all(np.isnan(output[5]))
@@ -0,0 +1,60 @@
+import numpy as np
+from control.likelihood.logistic_log_likelihood import LogisticLogLikelihood
+from control.likelihood.logistic_objective import LogisticObjective
+from control.link_function.sigmoid import Sigmoid
+
+
+def test_fused_kernel_matches_separate_evaluations(simulate):
+    v_y, m_x = simulate(1000, 4)
+    objective = LogisticObjective(v_y, m_x)
+    rng = np.random.default_rng(1)
+    for _ in range(3):
+        v_beta = rng.normal(0.0, 1.0, m_x.shape[1])
+        s_ll = objective.evaluate(v_beta)
+        v_p = Sigmoid(m_x, v_beta).calculate_predicted_propability()
+        np.testing.assert_allclose(
+            s_ll, LogisticLogLikelihood(
+                v_y, m_x, v_beta).calculate_log_likelihood(), rtol=1e-12)
+        np.testing.assert_allclose(
+            s_ll, np.sum(v_y * np.log(v_p) + (1 - v_y) * np.log(1 - v_p)),
+            rtol=1e-10)
+        assert objective.calculate_log_likelihood() == s_ll
+        np.testing.assert_allclose(objective.predicted_probability(), v_p,
+                                   rtol=1e-12)
+        np.testing.assert_allclose(objective.gradient(),
+                                   m_x.T @ (v_y - v_p), rtol=1e-10,
+                                   atol=1e-10)
+
+
+def test_fused_kernel_is_stable_for_large_linear_predictors():
+    m_x = np.array([[1.0, 800.0], [1.0, -800.0]])
+    v_y = np.array([1.0, 0.0])
+    objective = LogisticObjective(v_y, m_x)
+    assert objective.evaluate(np.array([0.0, 1.0])) == 0.0
+    np.testing.assert_array_equal(objective.predicted_probability(),
+                                  [1.0, 0.0])
+    s_ll = objective.evaluate(np.array([0.0, -1.0]))
+    assert np.isfinite(s_ll) and s_ll == -1600.0
+
+
+def test_batch_evaluation_matches_single_evaluations(simulate):
+    v_y, m_x = simulate(500, 3)
+    objective = LogisticObjective(v_y, m_x)
+    m_beta = np.random.default_rng(2).normal(0.0, 1.0, (5, m_x.shape[1]))
+    v_log_likelihood = objective.evaluate_batch(m_beta)
+    for j, v_beta in enumerate(m_beta):
+        np.testing.assert_allclose(v_log_likelihood[j],
+                                   objective.evaluate(v_beta), rtol=1e-12)
+
+
+def test_integer_design_matrix_is_evaluated_in_float64(simulate):
+    v_y, m_x = simulate(500, 3)
+    v_beta = np.array([0.3, -0.7, 1.1, 0.2])
+    for m_x_int in (np.rint(m_x * 4).astype(np.int8), m_x > 0,
+                    (m_x > 0).astype(np.uint8)):
+        objective = LogisticObjective(v_y, m_x_int)
+        reference = LogisticObjective(v_y, m_x_int.astype(np.float64))
+        assert objective.evaluate(v_beta) == reference.evaluate(v_beta)
+        assert objective.gradient().dtype == np.float64
+        np.testing.assert_allclose(objective.gradient(),
+                                   reference.gradient(), rtol=1e-12)
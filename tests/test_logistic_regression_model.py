@@ -0,0 +1,80 @@
+import numpy as np
+from scipy import sparse
+from control.estimation.logistic_mle import LogisticMLE
+from control.estimation.logistic_newton import LogisticNewton
+from control.likelihood.logistic_objective import LogisticObjective
+from model.regressionModel.logistic_regression_model import \
+    LogisticRegression
+
+
+def fitted(simulate, b_intercept=True):
+    """
+    Returns:
+        tuple: LogisticRegression fitted with Newton-Raphson and its matrix
+               of independent variables.
+    """
+    v_y, m_x = simulate(1000, 3)
+    m_features = m_x[:, 1:] if b_intercept else m_x
+    model = LogisticRegression(v_y, m_features, b_intercept=b_intercept)
+    model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-10))
+    return model, m_features
+
+
+def test_predict_proba_matches_fitted_probabilities(simulate):
+    for b_intercept in [True, False]:
+        model, m_features = fitted(simulate, b_intercept)
+        np.testing.assert_allclose(
+            model.predict_proba(m_features, s_block_size=64), model.v_p,
+            rtol=1e-12)
+        np.testing.assert_allclose(
+            model.predict_proba(sparse.csr_matrix(m_features)), model.v_p,
+            rtol=1e-12)
+        np.testing.assert_array_equal(model.predict(m_features),
+                                      model.v_p >= 0.5)
+        np.testing.assert_array_equal(
+            model.predict(m_features, s_threshold=0.3), model.v_p >= 0.3)
+
+
+def test_predict_proba_scores_iterators_lazily(simulate):
+    model, m_features = fitted(simulate)
+    s_num_consumed = 0
+
+    def chunks():
+        nonlocal s_num_consumed
+        for s_start in range(0, m_features.shape[0], 300):
+            s_num_consumed += 1
+            yield m_features[s_start:s_start + 300]
+
+    v_p = model.predict_proba(chunks())
+    assert s_num_consumed == 0
+    v_p_first = next(v_p)
+    assert s_num_consumed == 1
+    np.testing.assert_allclose(np.concatenate([v_p_first, *v_p]),
+                               model.v_p, rtol=1e-12)
+    v_class = np.concatenate(list(model.predict(chunks())))
+    np.testing.assert_array_equal(v_class, model.v_p >= 0.5)
+
+
+def test_predict_proba_is_stable_for_large_linear_predictors():
+    model = LogisticRegression(np.zeros(2), np.zeros((2, 1)))
+    model.v_beta = np.array([0.0, 1.0])
+    v_p = model.predict_proba(np.array([[-1000.0], [1000.0]]))
+    np.testing.assert_array_equal(v_p, [0.0, 1.0])
+
+
+def test_non_converged_fit_keeps_the_last_iterate(simulate):
+    model, _ = fitted(simulate)
+    assert model.b_converged
+    # Three gradient ascent steps are far from converged
+    model.fit(LogisticMLE(model.v_y, model.m_x, 3, 1e-10, 1e-4))
+    assert not model.b_converged
+    objective = LogisticObjective(model.v_y, model.m_x)
+    v_beta = np.zeros(model.m_x.shape[1])
+    for _ in range(3):
+        objective.evaluate(v_beta)
+        v_beta = v_beta + 1e-4 * objective.gradient()
+    np.testing.assert_allclose(model.v_beta, v_beta, rtol=1e-12)
+    assert model.s_log_likelihood is None and model.s_num_itr is None
+    # The Hessian of the converged Newton fit does not outlive it
+    assert not np.any(model.m_hessian)
+    assert model.scoring_model().metadata["converged"] is False
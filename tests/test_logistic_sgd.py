@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from control.estimation.logistic_newton import LogisticNewton
+from control.estimation.logistic_sgd import LogisticSGD
+from control.instrumentation.iteration_recorder import IterationRecorder
+
+
+@pytest.mark.parametrize("optimizer, s_alpha", [("sgd", 0.1),
+                                                ("adam", 0.01)])
+def test_sgd_approaches_newton_estimates(simulate, optimizer, s_alpha):
+    v_y, m_x = simulate(5000, 3)
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    output = LogisticSGD(v_y, m_x, 300, 1e-5, s_alpha, s_batch_size=100,
+                         optimizer=optimizer, s_decay=0.1,
+                         seed=0).estimate()
+    assert len(output) == 4
+    np.testing.assert_allclose(output[0], expected[0], atol=0.02)
+    np.testing.assert_allclose(output[2], expected[2], rtol=1e-3)
+
+
+def test_sgd_map_approaches_newton_estimates(simulate):
+    v_y, m_x = simulate(2000, 2, s_seed=1)
+    v_mu = np.full(3, 0.5)
+    m_sigma = 0.01 * np.eye(3)
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10, v_mu,
+                              m_sigma).estimate()
+    output = LogisticSGD(v_y, m_x, 300, 3e-5, 0.05, s_batch_size=100,
+                         v_mu=v_mu, m_sigma=m_sigma, s_decay=0.1,
+                         seed=0).estimate()
+    np.testing.assert_allclose(output[0], expected[0], atol=0.02)
+
+
+def test_sgd_is_reproducible_with_holdout(simulate):
+    v_y, m_x = simulate(2000, 2)
+    output = [LogisticSGD(v_y, m_x, 100, 1e-4, 0.01, s_decay=0.1,
+                          s_holdout=0.2, seed=3).estimate()
+              for _ in range(2)]
+    assert len(output[0]) == 4
+    np.testing.assert_array_equal(output[0][0], output[1][0])
+    assert output[0][3] == output[1][3]
+
+
+def test_sgd_rejects_unknown_optimizer(simulate):
+    v_y, m_x = simulate(10, 1)
+    with pytest.raises(ValueError):
+        LogisticSGD(v_y, m_x, 10, 1e-6, 0.01, optimizer="rmsprop")
+
+
+def test_sgd_only_stops_after_s_patience_epochs_within_tolerance(simulate):
+    v_y, m_x = simulate(5000, 3)
+    recorder = IterationRecorder()
+    output = LogisticSGD(v_y, m_x, 300, 1e-5, 0.01, s_batch_size=100,
+                         s_decay=0.1, seed=0, recorder=recorder).estimate()
+    v_change = np.abs(np.diff(recorder.trace()["objective"]))
+    assert np.all(v_change[-3:] < 1e-5)
+    # A single epoch within the tolerance stopped training much earlier
+    output_single = LogisticSGD(v_y, m_x, 300, 1e-5, 0.01, s_batch_size=100,
+                                s_decay=0.1, s_patience=1, seed=0).estimate()
+    assert output_single[3] < output[3]
+
+
+def test_sgd_rejects_holdout_without_training_data(simulate):
+    v_y, m_x = simulate(10, 1)
+    with pytest.raises(ValueError):
+        LogisticSGD(v_y, m_x, 10, 1e-6, 0.01, s_holdout=1.0)
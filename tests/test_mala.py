@@ -0,0 +1,73 @@
+import numpy as np
+from control.instrumentation.iteration_recorder import IterationRecorder
+from control.likelihood.logistic_objective import LogisticObjective
+from control.likelihood.mvn_prior import MVNPrior
+from control.mcmc.mala import MALA
+
+S_NUM_ITR = 2000
+S_NUM_BURN_IN = 1000
+
+
+def test_mala_chains_sample_the_posterior(posterior):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    recorder = IterationRecorder()
+    starting_mean = v_map + np.array([-1.0, 0.0, 1.0])[:, np.newaxis]
+    samples, valid_samples, mean, cov = MALA(
+        v_y, m_x, starting_mean, np.zeros(s_k), m_prior_sigma, 0.01,
+        S_NUM_ITR, S_NUM_BURN_IN, n_chains=3, seed=0,
+        recorder=recorder).optimize()
+    assert samples.shape == (3, S_NUM_ITR + 1, s_k)
+    np.testing.assert_array_equal(samples[:, 0], starting_mean)
+    v_sd = np.sqrt(np.diag(m_cov))
+    for c in range(3):
+        assert np.all(np.abs(mean[c] - v_map) < 0.5 * v_sd)
+        np.testing.assert_allclose(np.sqrt(np.diag(cov[c])), v_sd, rtol=0.3)
+    # The step size is adapted towards an acceptance rate of 0.574
+    v_after_burn_in = recorder.trace()["acceptance_rate"][S_NUM_BURN_IN:]
+    assert 0.4 < np.mean(v_after_burn_in) < 0.75
+    assert recorder.summary()["step_size"].shape == (3,)
+
+
+def test_mala_gradients_match_single_evaluations(posterior):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    objective = LogisticObjective(v_y, m_x)
+    prior = MVNPrior(np.zeros(m_x.shape[1]), m_prior_sigma)
+    m_beta = v_map + np.random.default_rng(0).standard_normal(
+        (4, m_x.shape[1]))
+    v_log_likelihood, m_gradient = objective.evaluate_batch_gradient(m_beta)
+    m_prior_gradient = prior.gradient_batch(m_beta)
+    for j, v_beta in enumerate(m_beta):
+        np.testing.assert_allclose(v_log_likelihood[j],
+                                   objective.evaluate(v_beta), rtol=1e-12)
+        np.testing.assert_allclose(m_gradient[j], objective.gradient(),
+                                   rtol=1e-10)
+        np.testing.assert_allclose(m_prior_gradient[j],
+                                   prior.gradient(v_beta), rtol=1e-12)
+
+
+def test_online_summary_matches_in_memory_samples(posterior, tmp_path):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+
+    def mala(**options):
+        return MALA(v_y, m_x, v_map, np.zeros(s_k), m_prior_sigma, 0.05,
+                    1500, 500, n_chains=3, seed=5, **options)
+
+    valid_samples = mala().optimize()[1]
+    m_thinned = valid_samples[:, ::3]
+    m_centered = m_thinned - np.mean(m_thinned, axis=1, keepdims=True)
+    m_expected_cov = np.einsum("cij,cik->cjk", m_centered, m_centered) / (
+        m_thinned.shape[1] - 1)
+    recorder = IterationRecorder()
+    output = mala(b_keep_samples=False, s_thin=3,
+                  recorder=recorder).optimize()
+    assert output[0] is None and output[1] is None
+    np.testing.assert_allclose(output[2], np.mean(m_thinned, axis=1),
+                               atol=1e-12)
+    np.testing.assert_allclose(output[3], m_expected_cov, atol=1e-12)
+    assert recorder.summary()["acceptance_rate"].shape == (3,)
+    sample_path = str(tmp_path / "samples.npy")
+    output = mala(sample_path=sample_path, s_thin=3).optimize()
+    np.testing.assert_array_equal(np.load(sample_path), m_thinned)
+    np.testing.assert_allclose(output[3], m_expected_cov, atol=1e-12)
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from control.instrumentation.iteration_recorder import IterationRecorder
+from control.mcmc.metropolis import Metropolis
+
+S_NUM_ITR = 3000
+S_NUM_BURN_IN = 1000
+
+
+def metropolis(posterior, **options):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    return Metropolis(v_y, m_x, np.zeros(s_k), np.zeros(s_k), m_prior_sigma,
+                      2.38 ** 2 / s_k * m_cov, 1500, 500, n_chains=3, seed=5,
+                      **options)
+
+
+def test_lockstep_chains_sample_the_posterior(posterior):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    # Overdispersed starting states, one per chain
+    starting_mean = v_map + np.array([-1.0, 0.0, 1.0])[:, np.newaxis]
+    samples, valid_samples, mean, cov = Metropolis(
+        v_y, m_x, starting_mean, np.zeros(s_k), m_prior_sigma,
+        2.38 ** 2 / s_k * m_cov, S_NUM_ITR, S_NUM_BURN_IN, n_chains=3,
+        seed=0).optimize()
+    assert samples.shape == (3, S_NUM_ITR + 1, s_k)
+    assert valid_samples.shape == (3, S_NUM_ITR + 1 - S_NUM_BURN_IN, s_k)
+    np.testing.assert_array_equal(samples[:, 0], starting_mean)
+    v_sd = np.sqrt(np.diag(m_cov))
+    for c in range(3):
+        assert np.all(np.abs(mean[c] - v_map) < 0.5 * v_sd)
+        np.testing.assert_allclose(np.sqrt(np.diag(cov[c])), v_sd, rtol=0.3)
+
+
+def test_single_chain_drops_the_chain_axis(posterior):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    output = Metropolis(v_y, m_x, v_map, np.zeros(s_k), m_prior_sigma,
+                        m_cov, 100, 50, seed=0).optimize()
+    assert output[0].shape == (101, s_k)
+    assert output[1].shape == (51, s_k)
+    assert output[2].shape == (s_k,)
+    assert output[3].shape == (s_k, s_k)
+
+
+@pytest.mark.parametrize("b_adaptive", [False, True])
+def test_samples_do_not_depend_on_n_jobs(posterior, b_adaptive):
+    expected = metropolis(posterior, b_adaptive=b_adaptive).optimize()[0]
+    for n_jobs in [2, 3]:
+        samples = metropolis(posterior, b_adaptive=b_adaptive,
+                             n_jobs=n_jobs).optimize()[0]
+        np.testing.assert_array_equal(samples, expected)
+
+
+def test_chains_only_depend_on_their_seed_sequence(posterior):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    seed_sequences = np.random.SeedSequence(7).spawn(3)
+    samples = Metropolis(v_y, m_x, v_map, np.zeros(s_k), m_prior_sigma,
+                         m_cov, 200, 0, n_chains=3,
+                         seed=seed_sequences).optimize()[0]
+    expected = Metropolis(v_y, m_x, v_map, np.zeros(s_k), m_prior_sigma,
+                          m_cov, 200, 0, seed=seed_sequences[1:2]).optimize()
+    np.testing.assert_array_equal(samples[1], expected[0])
+
+
+def test_adaptive_proposal_is_tuned_during_burn_in(posterior):
+    v_y, m_x, m_prior_sigma, v_map, m_cov = posterior
+    s_k = m_x.shape[1]
+    recorder = IterationRecorder()
+    # A proposal far too small for the posterior
+    mean, cov = Metropolis(v_y, m_x, v_map, np.zeros(s_k), m_prior_sigma,
+                           1e-6 * np.eye(s_k), S_NUM_ITR, S_NUM_BURN_IN,
+                           n_chains=3, seed=0, b_adaptive=True,
+                           recorder=recorder).optimize()[2:]
+    v_after_burn_in = recorder.trace()["acceptance_rate"][S_NUM_BURN_IN:]
+    assert 0.1 < np.mean(v_after_burn_in) < 0.4
+    v_sd = np.sqrt(np.diag(m_cov))
+    for c in range(3):
+        assert np.all(np.abs(mean[c] - v_map) < 0.5 * v_sd)
+        np.testing.assert_allclose(np.sqrt(np.diag(cov[c])), v_sd, rtol=0.3)
+
+
+def test_online_summary_matches_in_memory_samples(posterior, tmp_path):
+    samples, valid_samples, mean, cov = metropolis(posterior).optimize()
+    m_thinned = valid_samples[:, ::3]
+    m_centered = m_thinned - np.mean(m_thinned, axis=1, keepdims=True)
+    m_expected_cov = np.einsum("cij,cik->cjk", m_centered, m_centered) / (
+        m_thinned.shape[1] - 1)
+    output = metropolis(posterior, b_keep_samples=False, s_thin=3).optimize()
+    assert output[0] is None and output[1] is None
+    np.testing.assert_allclose(output[2], np.mean(m_thinned, axis=1),
+                               atol=1e-12)
+    np.testing.assert_allclose(output[3], m_expected_cov, atol=1e-12)
+    sample_path = str(tmp_path / "samples.npy")
+    output = metropolis(posterior, sample_path=sample_path,
+                        s_thin=3).optimize()
+    np.testing.assert_array_equal(np.load(sample_path), m_thinned)
+    np.testing.assert_allclose(output[3], m_expected_cov, atol=1e-12)
+
+
+def test_parallel_summary_matches_in_process(posterior, tmp_path):
+    expected = metropolis(posterior, b_keep_samples=False).optimize()
+    sample_path = str(tmp_path / "samples.npy")
+    output = metropolis(posterior, n_jobs=2,
+                        sample_path=sample_path).optimize()
+    np.testing.assert_array_equal(output[2], expected[2])
+    np.testing.assert_array_equal(output[3], expected[3])
@@ -0,0 +1,53 @@
+import numpy as np
+from control.likelihood.mvn_log_likelihood import MVNLogLikelihood
+from control.likelihood.mvn_prior import MVNPrior
+
+
+def covariance(s_k, s_seed=0):
+    """
+    Returns:
+        tuple: Random mean vector and well-conditioned covariance matrix.
+    """
+    rng = np.random.default_rng(s_seed)
+    m_a = rng.standard_normal((s_k, s_k))
+    return rng.standard_normal(s_k), m_a @ m_a.T + s_k * np.eye(s_k)
+
+
+def test_prior_matches_determinant_and_inverse_formula():
+    v_mu, m_sigma = covariance(5)
+    prior = MVNPrior(v_mu, m_sigma)
+    m_inv = np.linalg.inv(m_sigma)
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        v_x = rng.standard_normal(5)
+        v_centered = v_x - v_mu
+        s_expected = (-2.5 * np.log(2 * np.pi)
+                      - 0.5 * np.log(np.linalg.det(m_sigma))
+                      - 0.5 * v_centered @ m_inv @ v_centered)
+        np.testing.assert_allclose(prior.evaluate(v_x), s_expected,
+                                   rtol=1e-12)
+        assert prior.calculate_log_likelihood() == prior.evaluate(v_x)
+        np.testing.assert_allclose(prior.gradient(v_x), -m_inv @ v_centered,
+                                   rtol=1e-10)
+    np.testing.assert_allclose(prior.precision(), m_inv, rtol=1e-10)
+
+
+def test_batch_evaluation_matches_single_evaluations():
+    v_mu, m_sigma = covariance(4)
+    prior = MVNPrior(v_mu, m_sigma)
+    m_x = np.random.default_rng(2).standard_normal((6, 4))
+    np.testing.assert_allclose(prior.evaluate_batch(m_x),
+                               [prior.evaluate(v_x) for v_x in m_x],
+                               rtol=1e-12)
+
+
+def test_mvn_log_likelihood_matches_determinant_and_inverse_formula():
+    v_mu, m_sigma = covariance(3, s_seed=4)
+    v_x = np.array([0.3, -1.2, 2.0])
+    v_centered = v_x - v_mu
+    s_expected = (-1.5 * np.log(2 * np.pi)
+                  - 0.5 * np.log(np.linalg.det(m_sigma))
+                  - 0.5 * v_centered @ np.linalg.inv(m_sigma) @ v_centered)
+    np.testing.assert_allclose(
+        MVNLogLikelihood(v_x, v_mu, m_sigma).calculate_log_likelihood(),
+        s_expected, rtol=1e-12)
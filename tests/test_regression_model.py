@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from control.estimation.logistic_newton import LogisticNewton
+from model.regressionModel.logistic_regression_model import \
+    LogisticRegression
+
+
+def test_design_matrix_from_dataframe(simulate):
+    v_y, m_x = simulate(100, 3)
+    df = pd.DataFrame({"y": v_y, "a": m_x[:, 1], "b": m_x[:, 2],
+                       "c": m_x[:, 3]})
+    model = LogisticRegression("y", ["a", "b", "c"], df)
+    np.testing.assert_array_equal(model.m_x, m_x)
+    np.testing.assert_array_equal(model.v_y, v_y)
+    assert model.m_x.flags.c_contiguous
+    model = LogisticRegression("y", ["c", "a"], df, order="F")
+    np.testing.assert_array_equal(model.m_x, m_x[:, [0, 3, 1]])
+    assert model.m_x.flags.f_contiguous
+
+
+def test_memmap_without_intercept_is_not_copied(simulate, tmp_path):
+    v_y, m_x = simulate(100, 3)
+    m_memmap = np.lib.format.open_memmap(str(tmp_path / "x.npy"), mode="w+",
+                                         dtype=np.float64, shape=m_x.shape)
+    m_memmap[:] = m_x
+    model = LogisticRegression(v_y, m_memmap, b_intercept=False)
+    assert np.shares_memory(model.m_x, m_memmap)
+    model = LogisticRegression(v_y, m_memmap[:, 1:])
+    np.testing.assert_array_equal(model.m_x, m_x)
+
+
+def test_float32_fit_matches_float64_fit(simulate):
+    v_y, m_x = simulate(2000, 3)
+    model = LogisticRegression(v_y, m_x[:, 1:], dtype=np.float32)
+    assert model.m_x.dtype == np.float32
+    model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-6))
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    np.testing.assert_allclose(model.v_beta, expected[0], atol=1e-4)
+    np.testing.assert_allclose(model.s_log_likelihood, expected[2],
+                               rtol=1e-6)
+
+
+def test_float32_fit_converges_for_large_n(simulate):
+    # float32 linear predictors made the log-likelihood too noisy for the
+    # 1e-6 tolerance at this size, so Newton never converged
+    v_y, m_x = simulate(2000000, 3)
+    model = LogisticRegression(v_y, m_x[:, 1:], dtype=np.float32)
+    model.fit(LogisticNewton(model.v_y, model.m_x, 50, 1e-6))
+    assert model.v_beta is not None
+    expected = LogisticNewton(v_y, m_x, 50, 1e-10).estimate()
+    np.testing.assert_allclose(model.v_beta, expected[0], atol=1e-4)
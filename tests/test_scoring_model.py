@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+from control.estimation.logistic_mle import LogisticMLE
+from control.estimation.logistic_newton import LogisticNewton
+from model.regressionModel.logistic_regression_model import \
+    LogisticRegression
+from model.regressionModel.scoring_model import ScoringModel
+
+
+@pytest.fixture
+def dataframe(simulate):
+    v_y, m_x = simulate(500, 3)
+    return pd.DataFrame({"y": v_y, "a": m_x[:, 1], "b": m_x[:, 2],
+                         "c": m_x[:, 3]})
+
+
+def test_saved_model_round_trips(dataframe, tmp_path):
+    model = LogisticRegression("y", ["a", "b", "c"], dataframe)
+    model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-10))
+    path = str(tmp_path / "model")
+    model.save(path, metadata={"owner": "risk", "v_scale": np.ones(2)})
+    loaded = ScoringModel.load(path)
+    assert isinstance(loaded.v_beta, np.memmap)
+    np.testing.assert_array_equal(loaded.v_beta, model.v_beta)
+    np.testing.assert_array_equal(loaded.m_hessian, model.m_hessian)
+    np.testing.assert_allclose(loaded.m_covariance,
+                               np.linalg.inv(-model.m_hessian))
+    np.testing.assert_allclose(loaded.standard_errors(), model.v_se,
+                               rtol=1e-8)
+    assert loaded.b_intercept and loaded.feature_names == ["a", "b", "c"]
+    assert loaded.metadata["owner"] == "risk"
+    assert loaded.metadata["v_scale"] == [1.0, 1.0]
+    assert loaded.metadata["estimation_strategy"] == "LogisticNewton"
+    assert loaded.metadata["num_observations"] == 500
+    np.testing.assert_allclose(
+        loaded.predict_proba(dataframe[["a", "b", "c"]].to_numpy()),
+        model.v_p, rtol=1e-12)
+    # Tables are scored by feature name, regardless of the column order
+    np.testing.assert_allclose(loaded.predict_proba(dataframe[["c", "a",
+                                                               "b"]]),
+                               model.v_p, rtol=1e-12)
+    in_memory = ScoringModel.load(path, mmap_mode=None)
+    assert not isinstance(in_memory.v_beta, np.memmap)
+
+
+def test_saving_without_hessian_removes_stale_arrays(dataframe, tmp_path):
+    model = LogisticRegression("y", ["a", "b", "c"], dataframe)
+    model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-10))
+    path = str(tmp_path / "model")
+    model.save(path)
+    model = LogisticRegression("y", ["a", "b", "c"], dataframe)
+    model.fit(LogisticMLE(model.v_y, model.m_x, 20000, 1e-8, 1e-3))
+    model.save(path)
+    loaded = ScoringModel.load(path)
+    assert loaded.m_hessian is None and loaded.m_covariance is None
+    assert loaded.standard_errors() is None
+    assert loaded.metadata["estimation_strategy"] == "LogisticMLE"
+
+
+def test_load_rejects_unknown_format_version(tmp_path):
+    path = str(tmp_path / "model")
+    ScoringModel(np.zeros(2)).save(path)
+    metadata_path = tmp_path / "model" / "metadata.json"
+    metadata_path.write_text(metadata_path.read_text().replace(
+        '"format_version": 1', '"format_version": 99'))
+    with pytest.raises(ValueError):
+        ScoringModel.load(path)
+
+
+def test_rank_deficient_fit_has_nan_covariance(simulate, tmp_path):
+    v_y, m_x = simulate(300, 1)
+    # The second feature duplicates the first one
+    model = LogisticRegression(v_y, np.column_stack([m_x[:, 1], m_x[:, 1]]))
+    model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-10))
+    scoring_model = model.scoring_model()
+    assert np.all(np.isnan(scoring_model.m_covariance))
+    assert np.all(np.isnan(scoring_model.standard_errors()))
+    np.testing.assert_array_equal(scoring_model.m_hessian, model.m_hessian)
+    path = str(tmp_path / "model")
+    model.save(path)
+    assert np.all(np.isnan(ScoringModel.load(path).m_covariance))
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from control.estimation.logistic_map import LogisticMAP
+from control.estimation.logistic_newton import LogisticNewton
+from control.likelihood.logistic_objective import LogisticObjective
+from control.mcmc.metropolis import Metropolis
+from model.regressionModel.logistic_regression_model import \
+    LogisticRegression
+
+
+@pytest.fixture(scope="module")
+def data(simulate):
+    """
+    Returns:
+        tuple: Dependent variable vector and dense design matrix with about
+               80% zeros among the independent variables.
+    """
+    v_y, m_x = simulate(1000, 5)
+    m_x[:, 1:][np.random.default_rng(1).uniform(size=(1000, 5)) < 0.8] = 0
+    return v_y, m_x
+
+
+def test_sparse_objective_matches_dense(data):
+    v_y, m_x = data
+    v_beta = np.linspace(-0.5, 0.5, m_x.shape[1])
+    objective = LogisticObjective(v_y, m_x)
+    sparse_objective = LogisticObjective(v_y, sparse.csr_matrix(m_x))
+    np.testing.assert_allclose(sparse_objective.evaluate(v_beta),
+                               objective.evaluate(v_beta), rtol=1e-12)
+    np.testing.assert_allclose(sparse_objective.gradient(),
+                               objective.gradient(), rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(sparse_objective.negative_hessian(),
+                               objective.negative_hessian(), rtol=1e-10)
+    v_vector = np.ones(m_x.shape[1])
+    np.testing.assert_allclose(
+        sparse_objective.negative_hessian_product(v_vector),
+        objective.negative_hessian() @ v_vector, rtol=1e-10)
+
+
+def test_sparse_regression_fit_matches_dense(data):
+    v_y, m_x = data
+    model = LogisticRegression(v_y, sparse.csc_matrix(m_x[:, 1:]))
+    assert sparse.issparse(model.m_x)
+    np.testing.assert_array_equal(model.m_x.toarray(), m_x)
+    expected = LogisticNewton(v_y, m_x, 100, 1e-10).estimate()
+    for b_conjugate_gradient in [False, True]:
+        model.fit(LogisticNewton(model.v_y, model.m_x, 100, 1e-10,
+                                 b_conjugate_gradient=b_conjugate_gradient))
+        np.testing.assert_allclose(model.v_beta, expected[0], atol=1e-8)
+    np.testing.assert_allclose(
+        LogisticNewton(v_y, model.m_x, 100, 1e-10).estimate()[5],
+        expected[5], rtol=1e-6)
+    v_mu = np.zeros(m_x.shape[1])
+    m_sigma = np.eye(m_x.shape[1])
+    expected = LogisticMAP(v_y, m_x, v_mu, m_sigma, 5000, 1e-10,
+                           1e-3).estimate()
+    output = LogisticMAP(v_y, sparse.csr_matrix(m_x), v_mu, m_sigma, 5000,
+                         1e-10, 1e-3).estimate()
+    assert output[3] == expected[3]
+    np.testing.assert_allclose(output[0], expected[0], rtol=1e-10)
+
+
+def test_sparse_metropolis_matches_dense(data):
+    v_y, m_x = data
+    s_k = m_x.shape[1]
+    v_zero = np.zeros(s_k)
+    options = dict(n_chains=2, seed=0)
+    m_proposal_sigma = 0.01 ** 2 * np.eye(s_k)
+    expected = Metropolis(v_y, m_x, v_zero, v_zero, np.eye(s_k),
+                          m_proposal_sigma, 300, 100, **options).optimize()
+    for n_jobs in [None, 2]:
+        output = Metropolis(v_y, sparse.csr_matrix(m_x), v_zero, v_zero,
+                            np.eye(s_k), m_proposal_sigma, 300, 100,
+                            n_jobs=n_jobs, **options).optimize()
+        np.testing.assert_allclose(output[0], expected[0], rtol=1e-10,
+                                   atol=1e-12)